@@ -0,0 +1,93 @@
+"""
+Serving UDP port by multiple processes
+++++++++++++++++++++++++++++++++++++++
+
+Receive SNMP TRAP/INFORM messages with the following options:
+
+* SNMPv1/SNMPv2c
+* with SNMP community "public"
+* over IPv4/UDP, listening at 127.0.0.1:162
+* by four worker processes sharing the same UDP port (Linux 3.9+ or BSD)
+* print per-worker statistics on stdout every few seconds
+
+Either of the following Net-SNMP commands will send notifications to this
+receiver:
+
+| $ snmptrap -v2c -c public 127.0.0.1:162 123 1.3.6.1.6.3.1.1.5.1 1.3.6.1.2.1.1.5.0 s test
+| $ snmpinform -v2c -c public 127.0.0.1:162 123 1.3.6.1.6.3.1.1.5.1
+
+"""#
+import time
+
+from pysnmp.entity import engine, config, supervisor
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.entity.rfc3413 import ntfrcv
+
+
+# Each worker process runs this function
+def workerFun(worker):
+    # Create SNMP engine with autogenernated engineID and pre-bound
+    # to socket transport dispatcher
+    snmpEngine = engine.SnmpEngine()
+
+    # Transport setup
+
+    # UDP over IPv4, the port is shared by all workers
+    config.addTransport(
+        snmpEngine,
+        udp.DOMAIN_NAME,
+        udp.UdpTransport().enableReusePort().openServerMode(('127.0.0.1', 162))
+    )
+
+    # SNMPv1/2c setup
+
+    # SecurityName <-> CommunityName mapping
+    config.addV1System(snmpEngine, 'my-area', 'public')
+
+    notificationsCount = [0]
+
+    # Callback function for receiving notifications
+    # noinspection PyUnusedLocal,PyUnusedLocal,PyUnusedLocal
+    def cbFun(snmpEngine, stateReference, contextEngineId, contextName,
+              varBinds, cbCtx):
+        notificationsCount[0] += 1
+
+    # Register SNMP Application at the SNMP engine
+    ntfrcv.NotificationReceiver(snmpEngine, cbFun)
+
+    # Report SNMP engine and our own counters to the supervisor
+    worker.registerSnmpEngine(
+        snmpEngine, lambda: {'notifications': notificationsCount[0]})
+
+    snmpEngine.transportDispatcher.jobStarted(1)  # this job would never finish
+
+    # Run I/O dispatcher which would receive notifications
+    try:
+        snmpEngine.transportDispatcher.runDispatcher()
+
+    finally:
+        snmpEngine.transportDispatcher.closeDispatcher()
+
+
+workers = supervisor.Supervisor(workerFun, workers=4)
+
+workers.start()
+
+try:
+    while True:
+        time.sleep(5)
+
+        workers.respawn()
+
+        for workerId, stats in sorted(workers.getStats().items()):
+            print('Worker #%s (PID %s): %s SNMP messages, %s notifications, '
+                  '%s dropped by OS' % (
+                      workerId, stats['pid'], stats['snmpInPkts'],
+                      stats['notifications'],
+                      stats['transport'].get('rxQueueOverflows', 'n/a')))
+
+except KeyboardInterrupt:
+    pass
+
+finally:
+    workers.stop()
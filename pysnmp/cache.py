@@ -6,45 +6,112 @@
 #
 # Limited-size dictionary-like class to use for caches
 #
+from time import time
+
+# cache entry layout
+PREV, NEXT, KEY, VALUE, EXPIRES = 0, 1, 2, 3, 4
 
 
 class Cache(object):
-    def __init__(self, maxSize=256):
+    """Least recently used (LRU) cache.
+
+    Entries are kept in a circular doubly-linked list ordered by
+    access time, so lookups, insertions and evictions are O(1).
+
+    Parameters
+    ----------
+    maxSize: :py:class:`int`
+        Maximum number of entries. When exceeded, the least recently
+        used entry gets evicted. Zero disables caching.
+
+    ttl: :py:class:`float`
+        If given, entries older than `ttl` seconds are treated as missing.
+    """
+    def __init__(self, maxSize=256, ttl=None):
         self._maxSize = maxSize
-        self._size = 0
-        self._chopSize = maxSize // 10
-        self._chopSize = self._chopSize or 1
+        self._ttl = ttl
         self._cache = {}
-        self._usage = {}
+        self._root = root = []
+        root[:] = [root, root, None, None, None]
+        self._hits = self._misses = self._evictions = 0
+
+    def _unlink(self, link):
+        link[PREV][NEXT] = link[NEXT]
+        link[NEXT][PREV] = link[PREV]
+
+    def _append(self, link):
+        root = self._root
+        last = root[PREV]
+        link[PREV] = last
+        link[NEXT] = root
+        last[NEXT] = root[PREV] = link
+
+    def _expired(self, link):
+        if link[EXPIRES] is not None and link[EXPIRES] <= time():
+            self._unlink(link)
+            del self._cache[link[KEY]]
+            return True
 
     def __contains__(self, k):
-        return k in self._cache
+        link = self._cache.get(k)
+        return link is not None and not self._expired(link)
 
     def __getitem__(self, k):
-        self._usage[k] += 1
-        return self._cache[k]
+        link = self._cache.get(k)
+        if link is None or self._expired(link):
+            self._misses += 1
+            raise KeyError(k)
+
+        self._hits += 1
+
+        self._unlink(link)
+        self._append(link)
+
+        return link[VALUE]
 
     def __len__(self):
-        return self._size
+        return len(self._cache)
 
     def __setitem__(self, k, v):
-        if self._size >= self._maxSize:
-            usageKeys = sorted(
-                self._usage, key=lambda x, d=self._usage: d[x])
+        if self._maxSize < 1:
+            return
+
+        expires = self._ttl is not None and time() + self._ttl or None
 
-            for _k in usageKeys[:self._chopSize]:
-                del self._cache[_k]
-                del self._usage[_k]
+        link = self._cache.get(k)
 
-            self._size -= self._chopSize
+        if link is None:
+            if len(self._cache) >= self._maxSize:
+                oldest = self._root[NEXT]
+                self._unlink(oldest)
+                del self._cache[oldest[KEY]]
+                self._evictions += 1
 
-        if k not in self._cache:
-            self._size += 1
-            self._usage[k] = 0
+            link = [None, None, k, v, expires]
+            self._cache[k] = link
 
-        self._cache[k] = v
+        else:
+            self._unlink(link)
+            link[VALUE] = v
+            link[EXPIRES] = expires
+
+        self._append(link)
 
     def __delitem__(self, k):
-        del self._cache[k]
-        del self._usage[k]
-        self._size -= 1
+        link = self._cache.pop(k)
+        self._unlink(link)
+
+    def clear(self):
+        self._cache.clear()
+        root = self._root
+        root[:] = [root, root, None, None, None]
+
+    def getStats(self):
+        """Return cache effectiveness counters"""
+        return {
+            'size': len(self._cache),
+            'maxSize': self._maxSize,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions
+        }
@@ -31,6 +31,7 @@
 # THE POSSIBILITY OF SUCH DAMAGE.
 #
 import platform
+import socket
 import sys
 import traceback
 
@@ -42,6 +43,8 @@ except ImportError:
 
 from pysnmp import debug
 from pysnmp.carrier import error
+from pysnmp.carrier import sockmmsg
+from pysnmp.carrier import sockstat
 from pysnmp.carrier.asyncio.base import AbstractAsyncioTransport
 
 IS_PYTHON_344_PLUS = platform.python_version_tuple() >= ('3', '4', '4')
@@ -50,13 +53,27 @@ IS_PYTHON_344_PLUS = platform.python_version_tuple() >= ('3', '4', '4')
 class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
     """Base Asyncio datagram Transport, to be used with AsyncioDispatcher"""
     SOCK_FAMILY = None
+    BATCH_SIZE = 32
     ADDRESS_TYPE = lambda x: x
 
+    DISPATCH_DEFERRED = 'deferred'
+    DISPATCH_INLINE = 'inline'
+    DISPATCH_BATCH = 'batch'
+
     transport = None
 
     def __init__(self, sock=None, sockMap=None, loop=None):
         self._writeQ = []
         self._lport = None
+        self._recvmmsg = self._sendmmsg = None
+        self._sendQ = []
+        self._reusePort = False
+        self._bufferSizes = {}
+        self._recvQ = []
+        self._dispatch = self.__dispatchDeferred
+        self._received = self._receivedOctets = 0
+        self._sent = self._sentOctets = 0
+        self._errors = {}
 
         if loop is None:
             loop = asyncio.get_event_loop()
@@ -68,13 +85,113 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
             raise error.CarrierError('Unable to call cbFun')
 
         else:
-            self.loop.call_soon(self._cbFun, self, transportAddress, datagram)
+            self._received += 1
+            self._receivedOctets += len(datagram)
+
+            self._dispatch(datagram, transportAddress)
+
+            if self._recvmmsg is not None:
+                self.__readBatch()
+
+    def error_received(self, exc):
+        errno = getattr(exc, 'errno', None)
+
+        self._errors[errno] = self._errors.get(errno, 0) + 1
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'error_received: %s' % exc)
+
+    def __dispatchDeferred(self, datagram, transportAddress):
+        self.loop.call_soon(self._cbFun, self, transportAddress, datagram)
+
+    def __dispatchInline(self, datagram, transportAddress):
+        self._cbFun(self, transportAddress, datagram)
+
+    def __dispatchBatched(self, datagram, transportAddress):
+        if not self._recvQ:
+            self.loop.call_soon(self.__dispatchBatch)
+
+        self._recvQ.append((datagram, transportAddress))
+
+    def __dispatchBatch(self):
+        incomingMessages = self._recvQ
+        self._recvQ = []
+
+        cbFun = self._cbFun
+
+        if cbFun is None:
+            return
+
+        for datagram, transportAddress in incomingMessages:
+            # one failing message should not take others down
+            try:
+                cbFun(self, transportAddress, datagram)
+
+            except Exception as exc:
+                self.loop.call_exception_handler({
+                    'message': 'Exception in datagram call back',
+                    'exception': exc,
+                    'protocol': self
+                })
+
+    def __readBatch(self):
+        try:
+            incomingMessages = self._recvmmsg(
+                self.transport.get_extra_info('socket'))
+
+        except socket.error:
+            return  # whatever it is, asyncio will hit it on next read
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'datagram_received: drained %d more messages' % len(incomingMessages))
+
+        for datagram, transportAddress in incomingMessages:
+            self._received += 1
+            self._receivedOctets += len(datagram)
+
+            self._dispatch(datagram, transportAddress)
+
+    def __writeBatch(self):
+        outgoingMessages = self._sendQ
+        self._sendQ = []
+
+        sock = self.transport.get_extra_info('socket')
+
+        # asyncio's own buffer must go first to keep messages in order
+        while outgoingMessages and not self.transport.get_write_buffer_size():
+            try:
+                sent = self._sendmmsg(sock, outgoingMessages)
+
+            except socket.error:
+                break
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'sendMessage: sent %d queued messages' % sent)
+
+            self._sent += sent
+            self._sentOctets += sum(
+                [len(outgoingMessage) for outgoingMessage, _ in outgoingMessages[:sent]])
+
+            del outgoingMessages[:sent]
+
+        for outgoingMessage, transportAddress in outgoingMessages:
+            try:
+                self.transport.sendto(outgoingMessage, transportAddress)
+
+            except Exception:
+                raise error.CarrierError(
+                    ';'.join(traceback.format_exception(*sys.exc_info())))
+
+            self._sent += 1
+            self._sentOctets += len(outgoingMessage)
 
     def connection_made(self, transport):
         self.transport = transport
 
         debug.logger & debug.FLAG_IO and debug.logger('connection_made: invoked')
 
+        self.__applyBufferSizes()
+
         while self._writeQ:
             outgoingMessage, transportAddress = self._writeQ.pop(0)
 
@@ -90,6 +207,9 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
                 raise error.CarrierError(
                     ';'.join(traceback.format_exception(*sys.exc_info())))
 
+            self._sent += 1
+            self._sentOctets += len(outgoingMessage)
+
     def connection_lost(self, exc):
         debug.logger & debug.FLAG_IO and debug.logger('connection_lost: invoked')
 
@@ -115,9 +235,16 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
 
     def openServerMode(self, iface):
         try:
-            c = self.loop.create_datagram_endpoint(
-                lambda: self, local_addr=iface, family=self.SOCK_FAMILY
-            )
+            if self._reusePort:
+                c = self.loop.create_datagram_endpoint(
+                    lambda: self, local_addr=iface, family=self.SOCK_FAMILY,
+                    reuse_port=True
+                )
+
+            else:
+                c = self.loop.create_datagram_endpoint(
+                    lambda: self, local_addr=iface, family=self.SOCK_FAMILY
+                )
 
             # Avoid deprecation warning for asyncio.async()
             if IS_PYTHON_344_PLUS:
@@ -140,6 +267,113 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
 
         AbstractAsyncioTransport.closeTransport(self)
 
+    def setDispatchMode(self, mode):
+        """Choose how received datagrams are passed to the dispatcher.
+
+        With :py:attr:`DISPATCH_DEFERRED` mode (the default), every
+        datagram is scheduled for processing on its own via
+        `loop.call_soon()`. :py:attr:`DISPATCH_INLINE` mode processes
+        datagram right from the `datagram_received()` call back, while
+        :py:attr:`DISPATCH_BATCH` mode collects datagrams arriving
+        within one event loop iteration and processes them at once.
+        """
+        dispatchers = {
+            self.DISPATCH_DEFERRED: self.__dispatchDeferred,
+            self.DISPATCH_INLINE: self.__dispatchInline,
+            self.DISPATCH_BATCH: self.__dispatchBatched
+        }
+
+        if mode not in dispatchers:
+            raise error.CarrierError('Unknown dispatch mode %s' % (mode,))
+
+        self._dispatch = dispatchers[mode]
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'setDispatchMode: %s dispatch mode' % mode)
+
+        return self
+
+    def enableReusePort(self, flag=1):
+        """Let multiple sockets bind to the same local address and port.
+
+        Must be called before :py:meth:`openServerMode`. The OS kernel
+        then spreads incoming datagrams over all sockets sharing the port,
+        possibly owned by different processes.
+        """
+        if self._lport is not None:
+            raise error.CarrierError(
+                'SO_REUSEPORT must be enabled before opening transport')
+
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise error.CarrierError(
+                'SO_REUSEPORT socket option is not supported by this OS '
+                'and/or Python version')
+
+        self._reusePort = bool(flag)
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableReusePort: %s option SO_REUSEPORT' % (
+                flag and "enabled" or "disabled"))
+
+        return self
+
+    def setSocketBufferSize(self, recvSize=None, sendSize=None):
+        """Set socket receive and/or send buffer size in octets.
+
+        The sizes are applied once the socket is created. OS kernel
+        may cap the effective size (see `net.core.rmem_max` and
+        `net.core.wmem_max` on Linux).
+        """
+        for b, bsize in (socket.SO_RCVBUF, recvSize), (socket.SO_SNDBUF, sendSize):
+            if bsize is not None:
+                self._bufferSizes[b] = bsize
+
+        if self.transport is not None:
+            self.__applyBufferSizes()
+
+        return self
+
+    def __applyBufferSizes(self):
+        sock = self.transport.get_extra_info('socket')
+
+        for b, bsize in self._bufferSizes.items():
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, b, bsize)
+
+            except socket.error as exc:
+                raise error.CarrierError(
+                    'setsockopt() for buffer %d failed: %s' % (b, exc))
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'setSocketBufferSize: socket %d buffer %d size set to %d, '
+                'effective %d' % (sock.fileno(), b, bsize,
+                                  sock.getsockopt(socket.SOL_SOCKET, b)))
+
+    def enableBatching(self, flag=1, batchSize=None):
+        """Receive and send up to `batchSize` datagrams per I/O event.
+
+        Relies on Linux `recvmmsg()`/`sendmmsg()` calls, otherwise
+        asyncio's one datagram per event processing remains in effect.
+        """
+        self._recvmmsg = self._sendmmsg = None
+
+        if flag:
+            batchSize = batchSize or self.BATCH_SIZE
+
+            try:
+                self._recvmmsg = sockmmsg.getRecvMmsg(batchSize)
+                self._sendmmsg = sockmmsg.getSendMmsg(batchSize)
+
+            except error.CarrierError as exc:
+                debug.logger & debug.FLAG_IO and debug.logger(
+                    'enableBatching: %s' % exc)
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableBatching: %s batched I/O' % (
+                self._recvmmsg and "enabled" or "disabled"))
+
+        return self
+
     def sendMessage(self, outgoingMessage, transportAddress):
         debug.logger & debug.FLAG_IO and debug.logger(
             'sendMessage: %s transportAddress %r outgoingMessage '
@@ -149,6 +383,13 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
         if self.transport is None:
             self._writeQ.append((outgoingMessage, transportAddress))
 
+        elif self._sendmmsg is not None:
+            if not self._sendQ:
+                self.loop.call_soon(self.__writeBatch)
+
+            self._sendQ.append(
+                (outgoingMessage, self.normalizeAddress(transportAddress)))
+
         else:
             try:
                 self.transport.sendto(
@@ -158,6 +399,33 @@ class DgramAsyncioProtocol(asyncio.DatagramProtocol, AbstractAsyncioTransport):
                 raise error.CarrierError(
                     ';'.join(traceback.format_exception(*sys.exc_info())))
 
+            self._sent += 1
+            self._sentOctets += len(outgoingMessage)
+
+    def getStats(self):
+        """Return transport statistics.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            `received` and `sent` messages and `receivedOctets`,
+            `sentOctets` counters, `errors` counters keyed by socket
+            error number. Where supported, socket buffers usage and
+            `rxQueueOverflows` counter of messages dropped by OS
+            kernel (see :py:mod:`pysnmp.carrier.sockstat`).
+        """
+        stats = dict(received=self._received, sent=self._sent,
+                     receivedOctets=self._receivedOctets,
+                     sentOctets=self._sentOctets,
+                     pending=len(self._writeQ) + len(self._sendQ),
+                     errors=dict(self._errors))
+
+        if self.transport is not None:
+            stats.update(
+                sockstat.getSocketStats(self.transport.get_extra_info('socket')))
+
+        return stats
+
     def normalizeAddress(self, transportAddress):
         if not isinstance(transportAddress, self.ADDRESS_TYPE):
             transportAddress = self.ADDRESS_TYPE(transportAddress)
@@ -60,6 +60,12 @@ class AsyncioDispatcher(AbstractTransportDispatcher):
         self.loopingcall = None
         self.loop = kwargs.pop('loop', asyncio.get_event_loop())
 
+        self.__timerHandle = None
+        self.__timerDeadline = None
+
+        if kwargs.get('tickless'):
+            self.setTickless()
+
     @asyncio.coroutine
     def handle_timeout(self):
         while True:
@@ -78,8 +84,51 @@ class AsyncioDispatcher(AbstractTransportDispatcher):
                 raise PySnmpError(
                     ';'.join(traceback.format_exception(*sys.exc_info())))
 
-    def registerTransport(self, tDomain, transport):
-        if self.loopingcall is None and self.getTimerResolution() > 0:
+    def callSoon(self, cbFun, *args):
+        self.loop.call_soon(cbFun, *args)
+
+    def getTime(self):
+        return self.loop.time()
+
+    def setTickless(self, tickless=True):
+        running = self.__transportCount and self.isTickless() != tickless
+
+        if running:
+            self.__stopTimer()
+
+        AbstractTransportDispatcher.setTickless(self, tickless)
+
+        if running:
+            self.__startTimer()
+
+    def rearmTimer(self):
+        if not self.isTickless() or not self.__transportCount:
+            return
+
+        deadline = self.getTimerDeadline(self.loop.time())
+
+        if deadline is None:
+            return
+
+        if self.__timerHandle is not None:
+            if self.__timerDeadline <= deadline:
+                return
+
+            self.__timerHandle.cancel()
+
+        self.__timerDeadline = deadline
+        self.__timerHandle = self.loop.call_at(deadline, self.__handleDeadline)
+
+    def __handleDeadline(self):
+        self.__timerHandle = None
+        self.handleTimerTick(self.loop.time())
+        self.rearmTimer()
+
+    def __startTimer(self):
+        if self.isTickless():
+            self.rearmTimer()
+
+        elif self.loopingcall is None and self.getTimerResolution() > 0:
             # Avoid deprecation warning for asyncio.async()
             if IS_PYTHON_344_PLUS:
                 self.loopingcall = asyncio.ensure_future(self.handle_timeout())
@@ -87,12 +136,27 @@ class AsyncioDispatcher(AbstractTransportDispatcher):
             else:
                 self.loopingcall = getattr(asyncio, 'async')(self.handle_timeout())
 
+    def __stopTimer(self):
+        if self.__timerHandle is not None:
+            self.__timerHandle.cancel()
+            self.__timerHandle = None
+
+        if self.loopingcall is not None:
+            if not self.loopingcall.done():
+                self.loopingcall.cancel()
+
+            self.loopingcall = None
+
+    def registerTransport(self, tDomain, transport):
         AbstractTransportDispatcher.registerTransport(
             self, tDomain, transport
         )
 
         self.__transportCount += 1
 
+        if self.__transportCount == 1:
+            self.__startTimer()
+
     def unregisterTransport(self, tDomain):
         t = AbstractTransportDispatcher.getTransport(self, tDomain)
 
@@ -101,9 +165,8 @@ class AsyncioDispatcher(AbstractTransportDispatcher):
             self.__transportCount -= 1
 
         # The last transport has been removed, stop the timeout
-        if self.__transportCount == 0 and not self.loopingcall.done():
-            self.loopingcall.cancel()
-            self.loopingcall = None
+        if self.__transportCount == 0:
+            self.__stopTimer()
 
 
 # Trollius or Tulip?
@@ -0,0 +1,6 @@
+# This file is necessary to make this directory a package.
+
+# TCP transport domain (transportDomainTcpIpv4) lives here rather than in
+# the `tcp` module so that LCD code can refer to it without importing
+# asyncio.
+SNMP_TCP_DOMAIN = (1, 3, 6, 1, 2, 1, 100, 1, 5)
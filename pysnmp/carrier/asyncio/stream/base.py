@@ -0,0 +1,571 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Stream-oriented asyncio transport, SNMP messages go over persistent
+# connections back to back with no extra framing (RFC 3430).
+#
+import errno
+import platform
+import socket
+import sys
+import traceback
+from collections import deque
+
+try:
+    import asyncio
+
+except ImportError:
+    import trollius as asyncio
+
+from pysnmp import debug
+from pysnmp.carrier import error
+from pysnmp.carrier import sockstat
+from pysnmp.carrier.asyncio.base import AbstractAsyncioTransport
+
+IS_PYTHON_344_PLUS = platform.python_version_tuple() >= ('3', '4', '4')
+
+
+def getMessageSize(data):
+    """Return the size of BER-encoded SNMP message at the head of `data`.
+
+    Returns `None` if `data` does not hold the whole tag and length yet.
+    Raises :py:class:`CarrierError` if `data` does not look like SNMP
+    message.
+    """
+    if len(data) < 2:
+        return
+
+    if data[0] != 0x30:
+        raise error.CarrierError(
+            'Unexpected SNMP message tag %#x in stream' % data[0])
+
+    length = data[1]
+
+    if length < 0x80:
+        return 2 + length
+
+    octets = length & 0x7f
+
+    # indefinite length form is not allowed in SNMP
+    if not octets or octets > 4:
+        raise error.CarrierError(
+            'Unsupported SNMP message length form %#x in stream' % length)
+
+    if len(data) < 2 + octets:
+        return
+
+    length = 0
+
+    for octet in data[2:2 + octets]:
+        length = length << 8 | octet
+
+    return 2 + octets + length
+
+
+class StreamAsyncioConnection(asyncio.Protocol):
+    """Single connection of :py:class:`StreamAsyncioTransport`"""
+    transport = None
+
+    def __init__(self, owner, remoteAddress=None):
+        self.owner = owner
+        self.remoteAddress = remoteAddress
+        self.outgoing = remoteAddress is not None
+        self.localAddress = None
+        self.connector = None
+        self.paused = False
+        self._sentAt = deque()
+        self._buffer = bytearray()
+        self._writeQ = []
+
+    def __repr__(self):
+        return '%s(%r, localAddress=%r, inFlight=%s)' % (
+            self.__class__.__name__, self.remoteAddress,
+            self.localAddress, self.inFlight)
+
+    @property
+    def inFlight(self):
+        """Number of requests awaiting response over this connection.
+
+        Requests left unanswered for longer than
+        :py:attr:`~StreamAsyncioTransport.IN_FLIGHT_TIMEOUT` seconds are
+        considered timed out and no longer counted.
+        """
+        sentAt = self._sentAt
+
+        if sentAt:
+            deadline = self.owner.loop.time() - self.owner.IN_FLIGHT_TIMEOUT
+
+            while sentAt and sentAt[0] < deadline:
+                sentAt.popleft()
+
+        return len(sentAt)
+
+    def requestSent(self):
+        self._sentAt.append(self.owner.loop.time())
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+        self.remoteAddress = transport.get_extra_info('peername')[:2]
+        self.localAddress = transport.get_extra_info('sockname')[:2]
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'connection_made: %r' % (self,))
+
+        self.owner._connectionMade(self)
+
+        writeQ = self._writeQ
+        self._writeQ = []
+
+        for outgoingMessage in writeQ:
+            self.write(outgoingMessage)
+
+    def connection_lost(self, exc):
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'connection_lost: %r: %s' % (self, exc or 'closed'))
+
+        self.owner._connectionLost(self, exc)
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+
+    def data_received(self, data):
+        self._buffer.extend(data)
+
+        while True:
+            try:
+                size = getMessageSize(self._buffer)
+
+            except error.CarrierError as exc:
+                debug.logger & debug.FLAG_IO and debug.logger(
+                    'data_received: %r: %s, closing' % (self, exc))
+
+                self._buffer = bytearray()
+                self.transport.abort()
+                return
+
+            if size is None or size > len(self._buffer):
+                return
+
+            incomingMessage = bytes(self._buffer[:size])
+
+            del self._buffer[:size]
+
+            if self._sentAt:
+                self._sentAt.popleft()
+
+            self.owner._messageReceived(self, incomingMessage)
+
+    def write(self, outgoingMessage):
+        if self.transport is None:
+            self._writeQ.append(outgoingMessage)
+
+        else:
+            self.transport.write(outgoingMessage)
+            self.owner._messageSent(self, outgoingMessage)
+
+    def getPending(self):
+        return len(self._writeQ)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+        elif self.connector is not None:
+            self.connector.cancel()
+
+
+class StreamAsyncioTransport(AbstractAsyncioTransport):
+    """Base Asyncio stream Transport, to be used with AsyncioDispatcher.
+
+    In server mode, SNMP responses go back over the connection their
+    request came from. In client mode, up to :py:attr:`POOL_SIZE`
+    persistent connections are opened to each remote address on
+    demand. Requests are pipelined i.e. written out without waiting
+    for responses to earlier requests, each request goes to the least
+    loaded connection in the pool. Requests not answered within
+    :py:attr:`IN_FLIGHT_TIMEOUT` seconds no longer count towards
+    connection load.
+
+    Notes
+    -----
+    SNMP engine message size limit (`maxMessageSize` parameter of
+    :py:class:`SnmpEngine`) still applies, it can be raised well
+    above datagram size limit for stream transports.
+    """
+    SOCK_FAMILY = None
+    ADDRESS_TYPE = lambda x: x
+    CONNECTION_TYPE = StreamAsyncioConnection
+    POOL_SIZE = 1
+    IN_FLIGHT_TIMEOUT = 10
+
+    def __init__(self, sock=None, sockMap=None, loop=None):
+        self._lport = None
+        self._server = None
+        self._iface = None
+        self._clientMode = False
+        self._reusePort = False
+        self._bufferSizes = {}
+        self._poolSize = self.POOL_SIZE
+        self._pools = {}
+        self._connections = {}
+        self._received = self._receivedOctets = 0
+        self._sent = self._sentOctets = 0
+        self._errors = {}
+
+        if loop is None:
+            loop = asyncio.get_event_loop()
+
+        self.loop = loop
+
+    # Connections management
+
+    def _connectionMade(self, connection):
+        for b, bsize in self._bufferSizes.items():
+            self.__applyBufferSize(connection, b, bsize)
+
+        sock = connection.transport.get_extra_info('socket')
+
+        # requests should not wait for more data to coalesce with
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            except socket.error:
+                pass
+
+        if not connection.outgoing:
+            self._connections[connection.remoteAddress] = connection
+
+    def _connectionLost(self, connection, exc):
+        if exc is not None:
+            errNo = getattr(exc, 'errno', None)
+            self._errors[errNo] = self._errors.get(errNo, 0) + 1
+
+        if not connection.outgoing:
+            if self._connections.get(connection.remoteAddress) is connection:
+                del self._connections[connection.remoteAddress]
+
+            return
+
+        for remoteAddress, pool in list(self._pools.items()):
+            if connection in pool:
+                pool.remove(connection)
+
+                if not pool:
+                    del self._pools[remoteAddress]
+
+    def __getConnections(self):
+        connections = list(self._connections.values())
+
+        for pool in self._pools.values():
+            connections.extend(
+                [connection for connection in pool
+                 if connection.transport is not None])
+
+        return connections
+
+    def _messageReceived(self, connection, incomingMessage):
+        if self._cbFun is None:
+            raise error.CarrierError('Unable to call cbFun')
+
+        self._received += 1
+        self._receivedOctets += len(incomingMessage)
+
+        transportAddress = self.ADDRESS_TYPE(
+            connection.remoteAddress).setLocalAddress(connection.localAddress)
+
+        # one failing message should not take others down
+        try:
+            self._cbFun(self, transportAddress, incomingMessage)
+
+        except Exception as exc:
+            self.loop.call_exception_handler({
+                'message': 'Exception in stream call back',
+                'exception': exc,
+                'protocol': connection
+            })
+
+    def _messageSent(self, connection, outgoingMessage):
+        self._sent += 1
+        self._sentOctets += len(outgoingMessage)
+
+    def __openConnection(self, remoteAddress):
+        connection = self.CONNECTION_TYPE(self, remoteAddress)
+
+        c = self.loop.create_connection(
+            lambda: connection, remoteAddress[0], remoteAddress[1],
+            family=self.SOCK_FAMILY, local_addr=self._iface
+        )
+
+        # Avoid deprecation warning for asyncio.async()
+        if IS_PYTHON_344_PLUS:
+            future = asyncio.ensure_future(c)
+
+        else: # pragma: no cover
+            future = getattr(asyncio, 'async')(c)
+
+        future.add_done_callback(
+            lambda f: self.__connectionDone(connection, f))
+
+        connection.connector = future
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'sendMessage: opening connection to %s' % (remoteAddress,))
+
+        return connection
+
+    def __connectionDone(self, connection, future):
+        if future.cancelled():
+            exc = None
+
+        else:
+            exc = future.exception()
+
+        if connection.transport is None:
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'sendMessage: connection to %s failed: %s, dropping %d '
+                'queued messages' % (connection.remoteAddress, exc,
+                                     connection.getPending()))
+
+            self._connectionLost(connection, exc)
+
+    def __getConnection(self, remoteAddress):
+        # server side, respond over the same connection
+        if remoteAddress in self._connections:
+            return self._connections[remoteAddress]
+
+        if not self._clientMode:
+            return
+
+        pool = self._pools.setdefault(remoteAddress, [])
+
+        connection = None
+
+        for candidate in pool:
+            if candidate.paused:
+                continue
+
+            if connection is None or candidate.inFlight < connection.inFlight:
+                connection = candidate
+
+        if connection is None or connection.inFlight and len(pool) < self._poolSize:
+            if len(pool) >= self._poolSize:
+                raise error.TransportBusyError(
+                    'All %d connections to %s are busy' % (
+                        len(pool), remoteAddress))
+
+            connection = self.__openConnection(remoteAddress)
+
+            pool.append(connection)
+
+        return connection
+
+    # AbstractAsyncioTransport API
+
+    def openClientMode(self, iface=None):
+        self._iface = iface
+        self._clientMode = True
+        return self
+
+    def openServerMode(self, iface):
+        try:
+            if self._reusePort:
+                c = self.loop.create_server(
+                    lambda: self.CONNECTION_TYPE(self), iface[0], iface[1],
+                    family=self.SOCK_FAMILY, reuse_port=True
+                )
+
+            else:
+                c = self.loop.create_server(
+                    lambda: self.CONNECTION_TYPE(self), iface[0], iface[1],
+                    family=self.SOCK_FAMILY
+                )
+
+            # Avoid deprecation warning for asyncio.async()
+            if IS_PYTHON_344_PLUS:
+                self._lport = asyncio.ensure_future(c)
+
+            else: # pragma: no cover
+                self._lport = getattr(asyncio, 'async')(c)
+
+            self._lport.add_done_callback(self.__serverDone)
+
+        except Exception:
+            raise error.CarrierError(';'.join(traceback.format_exception(*sys.exc_info())))
+
+        return self
+
+    def __serverDone(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self._server = future.result()
+
+    def closeTransport(self):
+        if self._lport is not None:
+            self._lport.cancel()
+
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+        for connection in list(self._connections.values()):
+            connection.close()
+
+        for pool in list(self._pools.values()):
+            for connection in pool:
+                connection.close()
+
+        self._connections.clear()
+        self._pools.clear()
+
+        AbstractAsyncioTransport.closeTransport(self)
+
+    def setPoolSize(self, size):
+        """Set the maximum number of connections to each remote address.
+
+        Connections are opened on demand, a new one only when all
+        pooled connections have requests awaiting response. Timed out
+        requests are not considered awaiting response.
+        """
+        if size < 1:
+            raise error.CarrierError('Bad connection pool size %s' % size)
+
+        self._poolSize = size
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'setPoolSize: up to %d connections per remote address' % size)
+
+        return self
+
+    def enableReusePort(self, flag=1):
+        """Let multiple sockets bind to the same local address and port.
+
+        Must be called before :py:meth:`openServerMode`. The OS kernel
+        then spreads incoming connections over all listening sockets
+        sharing the port, possibly owned by different processes.
+        """
+        if self._lport is not None:
+            raise error.CarrierError(
+                'SO_REUSEPORT must be enabled before opening transport')
+
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise error.CarrierError(
+                'SO_REUSEPORT socket option is not supported by this OS '
+                'and/or Python version')
+
+        self._reusePort = bool(flag)
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableReusePort: %s option SO_REUSEPORT' % (
+                flag and "enabled" or "disabled"))
+
+        return self
+
+    def setSocketBufferSize(self, recvSize=None, sendSize=None):
+        """Set connections socket receive and/or send buffer size in octets.
+
+        The sizes are applied to connections as they get established.
+        OS kernel may cap the effective size (see `net.core.rmem_max`
+        and `net.core.wmem_max` on Linux).
+        """
+        for b, bsize in (socket.SO_RCVBUF, recvSize), (socket.SO_SNDBUF, sendSize):
+            if bsize is not None:
+                self._bufferSizes[b] = bsize
+
+                for connection in self.__getConnections():
+                    self.__applyBufferSize(connection, b, bsize)
+
+        return self
+
+    def __applyBufferSize(self, connection, b, bsize):
+        sock = connection.transport.get_extra_info('socket')
+
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, b, bsize)
+
+        except socket.error as exc:
+            raise error.CarrierError(
+                'setsockopt() for buffer %d failed: %s' % (b, exc))
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'setSocketBufferSize: socket %d buffer %d size set to %d, '
+            'effective %d' % (sock.fileno(), b, bsize,
+                              sock.getsockopt(socket.SOL_SOCKET, b)))
+
+    def sendMessage(self, outgoingMessage, transportAddress):
+        remoteAddress = tuple(transportAddress)[:2]
+
+        connection = self.__getConnection(remoteAddress)
+
+        if connection is None:
+            # SNMP manager has gone, nowhere to send the response
+            self._errors[errno.ENOTCONN] = self._errors.get(errno.ENOTCONN, 0) + 1
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'sendMessage: no connection to %s, dropping '
+                'outgoingMessage %s' % (remoteAddress, debug.hexdump(outgoingMessage)))
+
+            return
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'sendMessage: %s connection %r outgoingMessage %s' % (
+                connection.transport is None and "queuing on" or "sending over",
+                connection, debug.hexdump(outgoingMessage)))
+
+        try:
+            connection.write(outgoingMessage)
+
+        except Exception:
+            raise error.CarrierError(
+                ';'.join(traceback.format_exception(*sys.exc_info())))
+
+        if connection.outgoing:
+            connection.requestSent()
+
+    def isBusy(self):
+        connections = self.__getConnections()
+
+        return bool(connections) and all(
+            [connection.paused for connection in connections])
+
+    def getStats(self):
+        """Return transport statistics.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            `received` and `sent` messages and `receivedOctets`,
+            `sentOctets` counters, `connections` currently established,
+            `pending` messages waiting for connection to establish,
+            `errors` counters keyed by socket error number. Where
+            supported, listening socket buffers usage (see
+            :py:mod:`pysnmp.carrier.sockstat`).
+        """
+        pending = 0
+
+        for pool in self._pools.values():
+            for connection in pool:
+                pending += connection.getPending()
+
+        stats = dict(received=self._received, sent=self._sent,
+                     receivedOctets=self._receivedOctets,
+                     sentOctets=self._sentOctets,
+                     connections=len(self.__getConnections()),
+                     pending=pending, errors=dict(self._errors))
+
+        if self._server is not None and self._server.sockets:
+            stats.update(sockstat.getSocketStats(self._server.sockets[0]))
+
+        return stats
+
+    def normalizeAddress(self, transportAddress):
+        if not isinstance(transportAddress, self.ADDRESS_TYPE):
+            transportAddress = self.ADDRESS_TYPE(transportAddress)
+
+        return transportAddress
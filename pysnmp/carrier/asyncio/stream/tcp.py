@@ -0,0 +1,25 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import socket
+
+from pysnmp.carrier.asyncio.stream import SNMP_TCP_DOMAIN
+from pysnmp.carrier.asyncio.stream.base import StreamAsyncioTransport
+from pysnmp.carrier.base import AbstractTransportAddress
+
+domainName = SNMP_TCP_DOMAIN
+
+
+class TcpTransportAddress(tuple, AbstractTransportAddress):
+    pass
+
+
+class TcpAsyncioTransport(StreamAsyncioTransport):
+    SOCK_FAMILY = socket.AF_INET
+    ADDRESS_TYPE = TcpTransportAddress
+
+
+TcpTransport = TcpAsyncioTransport
@@ -71,6 +71,30 @@ class AbstractSocketTransport(asyncore.dispatcher, AbstractTransport):
     def __hash__(self):
         return hash(self.socket)
 
+    def setSocketBufferSize(self, recvSize=None, sendSize=None):
+        """Set socket receive and/or send buffer size in octets.
+
+        OS kernel may cap the effective size (see `net.core.rmem_max`
+        and `net.core.wmem_max` on Linux).
+        """
+        for b, bsize in (socket.SO_RCVBUF, recvSize), (socket.SO_SNDBUF, sendSize):
+            if bsize is None:
+                continue
+
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, b, bsize)
+
+            except socket.error as exc:
+                raise error.CarrierError(
+                    'setsockopt() for buffer %d failed: %s' % (b, exc))
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'setSocketBufferSize: socket %d buffer %d size set to %d, '
+                'effective %d' % (self.socket.fileno(), b, bsize,
+                                  self.socket.getsockopt(socket.SOL_SOCKET, b)))
+
+        return self
+
     # The following two methods are part of base class so here we overwrite
     # them to separate socket management from dispatcher registration tasks.
 
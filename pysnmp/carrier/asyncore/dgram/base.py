@@ -6,9 +6,10 @@
 #
 import errno
 import socket
+from collections import deque
 
 from pysnmp import debug
-from pysnmp.carrier import sockmsg, error
+from pysnmp.carrier import sockmsg, sockmmsg, sockstat, error
 from pysnmp.carrier.asyncore.base import AbstractSocketTransport
 
 # Ignore these socket errors
@@ -30,18 +31,50 @@ class DgramSocketTransport(AbstractSocketTransport):
     SOCK_TYPE = socket.SOCK_DGRAM
     RETRY_COUNT = 3
     RETRY_INTERVAL = 1
+    BATCH_SIZE = 32
+    OUT_QUEUE_SIZE = None
     ADDRESS_TYPE = lambda x: x
 
     def __init__(self, sock=None, sockMap=None):
-        self.__outQueue = []
+        self.__outQueue = deque()
+        self.__outQueueSize = self.OUT_QUEUE_SIZE
+        self.__queued = self.__sent = self.__dropped = 0
+        self.__received = self.__receivedOctets = self.__sentOctets = 0
+        self.__errors = {}
+        self.__rxQueueOverflows = None
+        self.__pktInfo = False
+        self._batchSize = 1
+        self._recvmmsg = self._sendmmsg = None
         self._sendto = lambda s, b, a: s.sendto(b, a)
+        self._recvfrom = self.__getRecvFrom()
+        AbstractSocketTransport.__init__(self, sock, sockMap)
+
+    def __getRecvFrom(self):
+        # kernel reports its drop counter along with each datagram
+        ancSize = self.__rxQueueOverflows is not None and socket.CMSG_SPACE(4)
+
+        if ancSize:
+            def __recvfrom(s, sz):
+                d, ancdata, flags, a = s.recvmsg(sz, ancSize)
+                self.__updateRxQueueOverflows(ancdata)
+                return d, self.ADDRESS_TYPE(a)
+
+            return __recvfrom
 
         def __recvfrom(s, sz):
             d, a = s.recvfrom(sz)
             return d, self.ADDRESS_TYPE(a)
 
-        self._recvfrom = __recvfrom
-        AbstractSocketTransport.__init__(self, sock, sockMap)
+        return __recvfrom
+
+    def __updateRxQueueOverflows(self, ancdata):
+        rxQueueOverflows = sockstat.getRxQueueOverflows(ancdata)
+
+        if rxQueueOverflows is not None:
+            self.__rxQueueOverflows = rxQueueOverflows
+
+    def __countError(self, exc):
+        self.__errors[exc.args[0]] = self.__errors.get(exc.args[0], 0) + 1
 
     def openClientMode(self, iface=None):
         if iface is not None:
@@ -80,6 +113,10 @@ class DgramSocketTransport(AbstractSocketTransport):
         return self
 
     def enablePktInfo(self, flag=1):
+        if flag and self.__rxQueueOverflows is not None:
+            raise error.CarrierError(
+                'SO_RXQ_OVFL can not be used along with IP_PKTINFO')
+
         if (not hasattr(self.socket, 'sendmsg') or
                 not hasattr(self.socket, 'recvmsg')):
             raise error.CarrierError(
@@ -103,6 +140,11 @@ class DgramSocketTransport(AbstractSocketTransport):
         self._sendto = sockmsg.getSendTo(self.ADDRESS_TYPE)
         self._recvfrom = sockmsg.getRecvFrom(self.ADDRESS_TYPE)
 
+        # batched system calls do not carry local address
+        self.__pktInfo = flag
+        if flag:
+            self._recvmmsg = self._sendmmsg = None
+
         debug.logger & debug.FLAG_IO and debug.logger(
             'enablePktInfo: %s option %s on socket '
             '%s' % (self.socket.family == socket.AF_INET6 and "IPV6_RECVPKTINFO"
@@ -137,11 +179,172 @@ class DgramSocketTransport(AbstractSocketTransport):
 
         return self
 
+    def enableReusePort(self, flag=1):
+        """Let multiple sockets bind to the same local address and port.
+
+        Must be called before :py:meth:`openServerMode`. The OS kernel
+        then spreads incoming datagrams over all sockets sharing the port,
+        possibly owned by different processes.
+        """
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise error.CarrierError(
+                'SO_REUSEPORT socket option is not supported by this OS '
+                'and/or Python version')
+
+        try:
+            self.socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT, flag
+            )
+
+        except socket.error as exc:
+            raise error.CarrierError('setsockopt() for SO_REUSEPORT '
+                                     'failed: %s' % exc)
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableReusePort: %s option SO_REUSEPORT on '
+            'socket %s' % (flag and "enabled" or "disabled", self.socket.fileno()))
+
+        return self
+
+    def enableBatching(self, flag=1, batchSize=None, mmsg=False):
+        """Receive and send up to `batchSize` datagrams per I/O event.
+
+        By default the transport loops over `recvfrom()`/`sendto()` till
+        the socket runs dry or the batch is full. With `mmsg` set, Linux
+        `recvmmsg()`/`sendmmsg()` calls are used instead, where available.
+        """
+        self._recvmmsg = self._sendmmsg = None
+
+        if flag:
+            self._batchSize = batchSize or self.BATCH_SIZE
+
+            if mmsg and self.__pktInfo:
+                raise error.CarrierError(
+                    'recvmmsg()/sendmmsg() calls do not support IP_PKTINFO')
+
+            if mmsg and self.__rxQueueOverflows is not None:
+                raise error.CarrierError(
+                    'recvmmsg()/sendmmsg() calls do not support SO_RXQ_OVFL')
+
+            if mmsg:
+                self._recvmmsg = sockmmsg.getRecvMmsg(self._batchSize)
+                self._sendmmsg = sockmmsg.getSendMmsg(self._batchSize)
+
+        else:
+            self._batchSize = 1
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableBatching: batch size %d, %s I/O on socket '
+            '%s' % (self._batchSize, self._recvmmsg and "recvmmsg()/sendmmsg()"
+                    or "recvfrom()/sendto()", self.socket.fileno()))
+
+        return self
+
+    def enableRxQueueOverflow(self, flag=1):
+        """Count datagrams dropped by OS kernel on this socket.
+
+        Once enabled, Linux reports the number of datagrams dropped due
+        to receive buffer overflow (`SO_RXQ_OVFL` socket option) along
+        with every received datagram. The latest count is available as
+        `rxQueueOverflows` in :py:meth:`getStats` output.
+
+        Linux 4.13+ reports the counter by other means, this option is
+        only needed with older kernels.
+        """
+        if not sockstat.IS_LINUX or not hasattr(self.socket, 'recvmsg'):
+            raise error.CarrierError(
+                'SO_RXQ_OVFL socket option is not supported by this OS '
+                'and/or Python version')
+
+        if flag and (self.__pktInfo or self._recvmmsg is not None):
+            raise error.CarrierError(
+                'SO_RXQ_OVFL can not be used along with IP_PKTINFO or '
+                'recvmmsg() call')
+
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, sockstat.SO_RXQ_OVFL, flag)
+
+        except socket.error as exc:
+            raise error.CarrierError('setsockopt() for SO_RXQ_OVFL '
+                                     'failed: %s' % exc)
+
+        if not flag:
+            self.__rxQueueOverflows = None
+
+        elif self.__rxQueueOverflows is None:
+            self.__rxQueueOverflows = 0
+
+        self._recvfrom = self.__getRecvFrom()
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'enableRxQueueOverflow: %s option SO_RXQ_OVFL on '
+            'socket %s' % (flag and "enabled" or "disabled", self.socket.fileno()))
+
+        return self
+
+    def setOutQueueSize(self, size=None):
+        """Limit the number of outgoing messages waiting to be sent.
+
+        Once `size` messages are queued, :py:meth:`sendMessage` drops
+        further messages raising :py:class:`TransportBusyError`.
+        `None` makes the queue unbounded.
+        """
+        self.__outQueueSize = size
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'setOutQueueSize: outbound queue size %s on socket '
+            '%s' % (size is None and "unlimited" or size, self.socket.fileno()))
+
+        return self
+
+    def isBusy(self):
+        return (self.__outQueueSize is not None and
+                len(self.__outQueue) >= self.__outQueueSize)
+
+    def getStats(self):
+        """Return transport statistics.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            `received` and `sent` messages and `receivedOctets`,
+            `sentOctets` counters, outbound queue statistics: `queued`
+            and `dropped` messages counters along with `pending` messages
+            currently sitting in the queue, `errors` counters keyed by
+            socket error number. Where supported, socket buffers usage
+            and `rxQueueOverflows` counter of messages dropped by OS
+            kernel (see :py:mod:`pysnmp.carrier.sockstat`).
+        """
+        stats = dict(received=self.__received, sent=self.__sent,
+                     receivedOctets=self.__receivedOctets,
+                     sentOctets=self.__sentOctets,
+                     queued=self.__queued, dropped=self.__dropped,
+                     pending=len(self.__outQueue), errors=dict(self.__errors))
+
+        if self.__rxQueueOverflows is not None:
+            stats['rxQueueOverflows'] = self.__rxQueueOverflows
+
+        stats.update(sockstat.getSocketStats(self.socket))
+
+        return stats
+
     def sendMessage(self, outgoingMessage, transportAddress):
+        if self.isBusy():
+            self.__dropped += 1
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'sendMessage: outbound queue full, dropping outgoingMessage '
+                '(%d octets)' % len(outgoingMessage))
+
+            raise error.TransportBusyError(
+                'Outbound queue full (%d messages)' % len(self.__outQueue))
+
         self.__outQueue.append(
             (outgoingMessage, self.normalizeAddress(transportAddress))
         )
 
+        self.__queued += 1
+
         debug.logger & debug.FLAG_IO and debug.logger(
             'sendMessage: outgoingMessage queued (%d octets) %s' % (
                 len(outgoingMessage), debug.hexdump(outgoingMessage)))
@@ -172,7 +375,41 @@ class DgramSocketTransport(AbstractSocketTransport):
         return self.__outQueue
 
     def handle_write(self):
-        outgoingMessage, transportAddress = self.__outQueue.pop(0)
+        if self._sendmmsg is not None and len(self.__outQueue) > 1:
+            self.__writeBatch()
+            return
+
+        for _ in range(min(self._batchSize, len(self.__outQueue))):
+            self.__writeMessage()
+
+    def __writeBatch(self):
+        outQueue = self.__outQueue
+
+        outgoingMessages = [
+            outQueue.popleft()
+            for _ in range(min(self._batchSize, len(outQueue)))]
+
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'handle_write: sending %d queued messages' % len(outgoingMessages))
+
+        try:
+            sent = self._sendmmsg(self.socket, outgoingMessages)
+
+        except (socket.error, error.CarrierError):
+            # let the first message go the usual way, the rest wait
+            outQueue.extendleft(reversed(outgoingMessages))
+            self.__writeMessage()
+            return
+
+        self.__sent += sent
+        self.__sentOctets += sum(
+            [len(outgoingMessage) for outgoingMessage, _ in outgoingMessages[:sent]])
+
+        if sent < len(outgoingMessages):
+            outQueue.extendleft(reversed(outgoingMessages[sent:]))
+
+    def __writeMessage(self):
+        outgoingMessage, transportAddress = self.__outQueue.popleft()
 
         debug.logger & debug.FLAG_IO and debug.logger(
             'handle_write: transportAddress %r -> %r outgoingMessage (%d '
@@ -182,12 +419,17 @@ class DgramSocketTransport(AbstractSocketTransport):
         if not transportAddress:
             debug.logger & debug.FLAG_IO and debug.logger(
                 'handle_write: missing dst address, loosing outgoing msg')
+            self.__dropped += 1
             return
 
         try:
             self._sendto(self.socket, outgoingMessage, transportAddress)
 
         except socket.error as exc:
+            self.__dropped += 1
+
+            self.__countError(exc)
+
             if exc.args[0] in SOCK_ERRORS:
                 debug.logger & debug.FLAG_IO and debug.logger(
                     'handle_write: ignoring socket error %s' % exc)
@@ -196,10 +438,18 @@ class DgramSocketTransport(AbstractSocketTransport):
                 raise error.CarrierError(
                     'sendto() failed for %s: %s' % (transportAddress, exc))
 
+        else:
+            self.__sent += 1
+            self.__sentOctets += len(outgoingMessage)
+
     def readable(self):
         return True
 
     def handle_read(self):
+        if self._batchSize > 1:
+            self.__readBatch()
+            return
+
         try:
             incomingMessage, transportAddress = self._recvfrom(self.socket, 65535)
 
@@ -215,10 +465,48 @@ class DgramSocketTransport(AbstractSocketTransport):
                 return
 
             else:
+                self.__received += 1
+                self.__receivedOctets += len(incomingMessage)
+
                 self._cbFun(self, transportAddress, incomingMessage)
                 return
 
         except socket.error as exc:
+            if exc.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                self.__countError(exc)
+
+            if exc.args[0] in SOCK_ERRORS:
+                debug.logger & debug.FLAG_IO and debug.logger(
+                    'handle_read: known socket error %s' % exc)
+                SOCK_ERRORS[exc.args[0]] and self.handle_close()
+                return
+
+            else:
+                raise error.CarrierError('recvfrom() failed: %s' % exc)
+
+    def __readBatch(self):
+        try:
+            if self._recvmmsg is None:
+                incomingMessages = [self._recvfrom(self.socket, 65535)]
+
+                while len(incomingMessages) < self._batchSize:
+                    try:
+                        incomingMessages.append(
+                            self._recvfrom(self.socket, 65535))
+
+                    except socket.error:
+                        break  # whatever it is, it will show up again
+
+            else:
+                incomingMessages = [
+                    (incomingMessage, self.ADDRESS_TYPE(transportAddress))
+                    for incomingMessage, transportAddress
+                    in self._recvmmsg(self.socket)]
+
+        except socket.error as exc:
+            if exc.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                self.__countError(exc)
+
             if exc.args[0] in SOCK_ERRORS:
                 debug.logger & debug.FLAG_IO and debug.logger(
                     'handle_read: known socket error %s' % exc)
@@ -228,5 +516,22 @@ class DgramSocketTransport(AbstractSocketTransport):
             else:
                 raise error.CarrierError('recvfrom() failed: %s' % exc)
 
+        debug.logger & debug.FLAG_IO and debug.logger(
+            'handle_read: received %d messages' % len(incomingMessages))
+
+        for incomingMessage, transportAddress in incomingMessages:
+            transportAddress = self.normalizeAddress(transportAddress)
+
+            debug.logger & debug.FLAG_IO and debug.logger(
+                'handle_read: transportAddress %r -> %r incomingMessage (%d '
+                'octets) %s' % (transportAddress, transportAddress.getLocalAddress(),
+                                len(incomingMessage), debug.hexdump(incomingMessage)))
+
+            if incomingMessage:
+                self.__received += 1
+                self.__receivedOctets += len(incomingMessage)
+
+                self._cbFun(self, transportAddress, incomingMessage)
+
     def handle_close(self):
         pass  # no datagram connection
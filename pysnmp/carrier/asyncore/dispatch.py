@@ -41,10 +41,30 @@ class AsyncoreDispatcher(AbstractTransportDispatcher):
                 return True
 
     def runDispatcher(self, timeout=0.0):
-        while self.jobsArePending() or self.transportsAreWorking():
+        while (self.jobsArePending() or self.transportsAreWorking() or
+               self.soonCallablesArePending()):
             try:
-                loop(timeout or self.getTimerResolution(),
-                     use_poll=True, map=self.__sockMap, count=1)
+                # do not block in I/O polling while call backs are due
+                if self.soonCallablesArePending():
+                    pollTimeout = 0
+
+                elif self.isTickless():
+                    # sleep till the next timer deadline, if any
+                    timeNow = time()
+
+                    pollTimeout = self.getTimerDeadline(timeNow)
+
+                    if pollTimeout is not None:
+                        pollTimeout = max(0, pollTimeout - timeNow)
+
+                    if timeout and (pollTimeout is None or
+                                    pollTimeout > timeout):
+                        pollTimeout = timeout
+
+                else:
+                    pollTimeout = timeout or self.getTimerResolution()
+
+                loop(pollTimeout, use_poll=True, map=self.__sockMap, count=1)
 
             except KeyboardInterrupt:
                 raise
@@ -53,4 +73,5 @@ class AsyncoreDispatcher(AbstractTransportDispatcher):
                 raise PySnmpError(
                     'poll error: %s' % ';'.join(format_exception(*exc_info())))
 
+            self.handleSoonCallables()
             self.handleTimerTick(time())
@@ -4,13 +4,18 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+from collections import deque
+from math import ceil
+from time import time
+
 from pysnmp.carrier import error
 
 
 class TimerCallable(object):
-    def __init__(self, cbFun, callInterval):
+    def __init__(self, cbFun, callInterval, deadlineFun=None):
         self.__cbFun = cbFun
         self.__callInterval = callInterval
+        self.__deadlineFun = deadlineFun
         self.__nextCall = 0
 
     def __call__(self, timeNow):
@@ -18,6 +23,25 @@ class TimerCallable(object):
             self.__cbFun(timeNow)
             self.__nextCall = timeNow + self.__callInterval
 
+    def callIfDue(self, timeNow, ticksNow, timeSlack=0):
+        if self.__deadlineFun is None:
+            if self.__nextCall <= timeNow + timeSlack:
+                self.__cbFun(timeNow)
+                self.__nextCall = timeNow + self.__callInterval
+
+        else:
+            deadline = self.__deadlineFun()
+            if deadline is not None and deadline <= ticksNow:
+                self.__cbFun(timeNow)
+
+    def getNextCall(self, timeBase, timerResolution):
+        if self.__deadlineFun is None:
+            return self.__nextCall
+
+        deadline = self.__deadlineFun()
+        if deadline is not None:
+            return timeBase + ceil(deadline) * timerResolution
+
     def __eq__(self, cbFun):
         return self.__cbFun == cbFun
 
@@ -44,11 +68,15 @@ class AbstractTransportDispatcher(object):
         self.__jobs = {}
         self.__recvCallables = {}
         self.__timerCallables = []
+        self.__soonCallables = deque()
         self.__ticks = 0
         self.__timerResolution = 0.1
         self.__timerDelta = self.__timerResolution * 0.05
         self.__nextTime = 0
+        self.__tickless = False
+        self.__timeBase = None
         self.__routingCbFun = None
+        self.__busyCbFun = None
 
     def _cbFun(self, incomingTransport, transportAddress, incomingMessage):
         if incomingTransport in self.__transportDomainMap:
@@ -77,6 +105,9 @@ class AbstractTransportDispatcher(object):
                 'No callback for "%r" found - loosing incoming event' % (recvId,)
             )
 
+        if self.__tickless:
+            self.rearmTimer()
+
     # Dispatcher API
 
     def registerRoutingCbFun(self, routingCbFun):
@@ -91,6 +122,25 @@ class AbstractTransportDispatcher(object):
         if self.__routingCbFun:
             self.__routingCbFun = None
 
+    def registerBusyCbFun(self, busyCbFun):
+        """Register transport busy call back.
+
+        Once outbound queue of a transport fills up, the
+        `busyCbFun(transportDispatcher, transportDomain, transportAddress,
+        outgoingMessage)` call back is called for every message that could
+        not be queued. Otherwise :py:class:`TransportBusyError` is raised
+        to the :py:meth:`sendMessage` caller.
+        """
+        if self.__busyCbFun:
+            raise error.CarrierError(
+                'Transport busy callback already registered'
+            )
+
+        self.__busyCbFun = busyCbFun
+
+    def unregisterBusyCbFun(self):
+        self.__busyCbFun = None
+
     def registerRecvCbFun(self, recvCb, recvId=None):
         if recvId in self.__recvCallables:
             raise error.CarrierError(
@@ -103,11 +153,26 @@ class AbstractTransportDispatcher(object):
         if recvId in self.__recvCallables:
             del self.__recvCallables[recvId]
 
-    def registerTimerCbFun(self, timerCbFun, tickInterval=None):
+    def registerTimerCbFun(self, timerCbFun, tickInterval=None,
+                           deadlineFun=None):
+        """Register timer call back.
+
+        The `timerCbFun(timeNow)` call back is called every `tickInterval`
+        seconds.
+
+        In tickless mode, if `deadlineFun` is given, `timerCbFun` is only
+        called once the timer tick returned by `deadlineFun()` has come.
+        If `deadlineFun()` returns `None`, `timerCbFun` is not called
+        at all.
+        """
         if not tickInterval:
             tickInterval = self.__timerResolution
 
-        self.__timerCallables.append(TimerCallable(timerCbFun, tickInterval))
+        self.__timerCallables.append(
+            TimerCallable(timerCbFun, tickInterval, deadlineFun))
+
+        if self.__tickless:
+            self.rearmTimer()
 
     def unregisterTimerCbFun(self, timerCbFun=None):
         if timerCbFun:
@@ -116,6 +181,28 @@ class AbstractTransportDispatcher(object):
         else:
             self.__timerCallables = []
 
+    def callSoon(self, cbFun, *args):
+        """Schedule `cbFun(*args)` call on the next event loop iteration.
+
+        Unlike timer call backs, soon call backs do not wait for the
+        next timer tick. The purpose is to let the caller unwind its
+        stack and continue right away.
+
+        This default implementation runs scheduled call backs on the
+        next timer tick. Concrete dispatchers are expected to override
+        it with their event loop's native primitive.
+        """
+        self.__soonCallables.append((cbFun, args))
+
+    def soonCallablesArePending(self):
+        return bool(self.__soonCallables)
+
+    def handleSoonCallables(self):
+        # call backs scheduled while we are at it go to the next round
+        for _ in range(len(self.__soonCallables)):
+            cbFun, args = self.__soonCallables.popleft()
+            cbFun(*args)
+
     def registerTransport(self, transportDomain, transport):
         if transportDomain in self.__transports:
             raise error.CarrierError(
@@ -145,12 +232,58 @@ class AbstractTransportDispatcher(object):
         raise error.CarrierError(
             'Transport %s not registered' % (transportDomain,))
 
+    def getTransportStats(self, transportDomain=None):
+        """Return statistics of registered transports.
+
+        Other Parameters
+        ----------------
+        transportDomain: :py:class:`tuple`
+            If given, statistics of just this transport is returned.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            Transport statistics (see transport's `getStats()` method),
+            numeric counters are summed up over all registered transports
+            unless `transportDomain` is given. Per-errno `errors`
+            counters are merged.
+        """
+        if transportDomain is not None:
+            return self.getTransport(transportDomain).getStats()
+
+        stats = {}
+
+        for transport in self.__transports.values():
+            for key, value in transport.getStats().items():
+                if isinstance(value, dict):
+                    counters = stats.setdefault(key, {})
+
+                    for subKey, subValue in value.items():
+                        counters[subKey] = counters.get(subKey, 0) + subValue
+
+                else:
+                    stats[key] = stats.get(key, 0) + value
+
+        return stats
+
     def sendMessage(self, outgoingMessage, transportDomain,
                     transportAddress):
         if transportDomain in self.__transports:
-            self.__transports[transportDomain].sendMessage(
-                outgoingMessage, transportAddress
-            )
+            try:
+                self.__transports[transportDomain].sendMessage(
+                    outgoingMessage, transportAddress
+                )
+
+            except error.TransportBusyError:
+                if not self.__busyCbFun:
+                    raise
+
+                self.__busyCbFun(
+                    self, transportDomain, transportAddress, outgoingMessage
+                )
+
+            if self.__tickless:
+                self.rearmTimer()
 
         else:
             raise error.CarrierError('No suitable transport domain for '
@@ -165,11 +298,84 @@ class AbstractTransportDispatcher(object):
 
         self.__timerResolution = timerResolution
         self.__timerDelta = timerResolution * 0.05
+        self.__timeBase = None
 
     def getTimerTicks(self):
+        if self.__tickless:
+            self.__updateTicks(self.getTime())
+
         return self.__ticks
 
+    def getTime(self):
+        """Return current time as seen by the event loop"""
+        return time()
+
+    def setTickless(self, tickless=True):
+        """Turn tickless mode on or off.
+
+        In tickless mode the dispatcher does not wake up every timer
+        tick. Instead it sleeps until the earliest timer call back
+        deadline (see :py:meth:`registerTimerCbFun`). Timer ticks are
+        then counted from the elapsed time.
+        """
+        if tickless and not self.__tickless:
+            self.__timeBase = None
+
+        self.__tickless = tickless
+
+    def isTickless(self):
+        return self.__tickless
+
+    def rearmTimer(self):
+        """Re-evaluate timer deadlines in tickless mode.
+
+        Should be called whenever a timer call back may have got
+        an earlier deadline. Dispatcher calls it on every message
+        sent or received.
+        """
+
+    def getTimerDeadline(self, timeNow):
+        """Return the time when timer call backs are next due.
+
+        Returns `None` if no timer call back is pending.
+        """
+        self.__updateTicks(timeNow)
+
+        nextTime = None
+
+        for timerCallable in self.__timerCallables:
+            nextCall = timerCallable.getNextCall(
+                self.__timeBase, self.__timerResolution)
+
+            if nextCall is not None and (nextTime is None or
+                                         nextCall < nextTime):
+                nextTime = nextCall
+
+        return nextTime
+
+    def __updateTicks(self, timeNow):
+        if self.__timeBase is None:
+            self.__timeBase = timeNow - self.__ticks * self.__timerResolution
+
+        ticks = int((timeNow - self.__timeBase + self.__timerDelta) /
+                    self.__timerResolution)
+
+        if ticks > self.__ticks:
+            self.__ticks = ticks
+
     def handleTimerTick(self, timeNow):
+        if self.__soonCallables:
+            self.handleSoonCallables()
+
+        if self.__tickless:
+            self.__updateTicks(timeNow)
+
+            for timerCallable in self.__timerCallables:
+                timerCallable.callIfDue(
+                    timeNow, self.__ticks, self.__timerDelta)
+
+            return
+
         if self.__nextTime == 0:  # initial initialization
             self.__nextTime = timeNow + self.__timerResolution - self.__timerDelta
 
@@ -208,6 +414,7 @@ class AbstractTransportDispatcher(object):
         self.__transports.clear()
         self.unregisterRecvCbFun()
         self.unregisterTimerCbFun()
+        self.__soonCallables.clear()
 
 
 class AbstractTransportAddress(object):
@@ -256,3 +463,11 @@ class AbstractTransport(object):
 
     def sendMessage(self, outgoingMessage, transportAddress):
         raise error.CarrierError('Method not implemented')
+
+    def isBusy(self):
+        """Tell if transport would not take any more outgoing messages"""
+        return False
+
+    def getStats(self):
+        """Return transport statistics as a :py:class:`dict`"""
+        return {}
@@ -9,3 +9,7 @@ from pysnmp import error
 
 class CarrierError(error.PySnmpError):
     pass
+
+
+class TransportBusyError(CarrierError):
+    pass
@@ -0,0 +1,287 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# The following routines receive or send a batch of datagrams in a single
+# system call by means of Linux recvmmsg()/sendmmsg() calls.
+#
+# These calls are not exposed by the Python socket module, so we reach
+# them through ctypes. On other platforms the routines are unavailable
+# and callers are expected to fall back to recvfrom()/sendto() loops.
+#
+import errno
+import os
+import socket
+import struct
+import sys
+
+from pysnmp.carrier import error
+
+MSG_DONTWAIT = 0x40
+
+SOCKADDR_STORAGE_SIZE = 128
+
+ADDRESS_CACHE_SIZE = 1024
+
+AF_UNIX = getattr(socket, 'AF_UNIX', None)
+
+try:
+    if not sys.platform.startswith('linux'):
+        raise ImportError()
+
+    import ctypes
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                       use_errno=True)
+
+    class iovec(ctypes.Structure):
+        _fields_ = [
+            ('iov_base', ctypes.c_void_p),
+            ('iov_len', ctypes.c_size_t),
+        ]
+
+    class msghdr(ctypes.Structure):
+        _fields_ = [
+            ('msg_name', ctypes.c_void_p),
+            ('msg_namelen', ctypes.c_uint32),
+            ('msg_iov', ctypes.POINTER(iovec)),
+            ('msg_iovlen', ctypes.c_size_t),
+            ('msg_control', ctypes.c_void_p),
+            ('msg_controllen', ctypes.c_size_t),
+            ('msg_flags', ctypes.c_int),
+        ]
+
+    class mmsghdr(ctypes.Structure):
+        _fields_ = [
+            ('msg_hdr', msghdr),
+            ('msg_len', ctypes.c_uint),
+        ]
+
+    _recvmmsg = libc.recvmmsg
+    _recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr),
+                          ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    _recvmmsg.restype = ctypes.c_int
+
+    _sendmmsg = libc.sendmmsg
+    _sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr),
+                          ctypes.c_uint, ctypes.c_int]
+    _sendmmsg.restype = ctypes.c_int
+
+except (ImportError, OSError, AttributeError):
+    libc = None
+
+
+def _raiseSocketError():
+    err = ctypes.get_errno()
+    raise socket.error(err, os.strerror(err))
+
+
+def _parseSockAddr(name, nameLen):
+    family, = struct.unpack('=H', name[:2])
+
+    if family == socket.AF_INET:
+        port, = struct.unpack('!H', name[2:4])
+        return socket.inet_ntop(socket.AF_INET, name[4:8]), port
+
+    elif family == socket.AF_INET6:
+        port, flowInfo = struct.unpack('!HI', name[2:8])
+        scopeId, = struct.unpack('=I', name[24:28])
+        return (socket.inet_ntop(socket.AF_INET6, name[8:24]),
+                port, flowInfo, scopeId)
+
+    elif family == AF_UNIX:
+        path = name[2:nameLen].split(b'\x00')[0]
+
+        if str is bytes:
+            return path
+
+        return path.decode(sys.getfilesystemencoding())
+
+    raise error.CarrierError('Unsupported address family %s' % family)
+
+
+def _makeSockAddr(family, address):
+    if family == socket.AF_INET:
+        return (struct.pack('=H', family) +
+                struct.pack('!H', address[1]) +
+                socket.inet_pton(family, address[0]) + b'\x00' * 8)
+
+    elif family == socket.AF_INET6:
+        return (struct.pack('=H', family) +
+                struct.pack('!HI', address[1],
+                            len(address) > 2 and address[2] or 0) +
+                socket.inet_pton(family, address[0].split('%')[0]) +
+                struct.pack('=I', len(address) > 3 and address[3] or 0))
+
+    elif family == AF_UNIX:
+        if not isinstance(address, bytes):
+            address = address.encode(sys.getfilesystemencoding())
+
+        return struct.pack('=H', family) + address + b'\x00'
+
+    raise error.CarrierError('Unsupported address family %s' % family)
+
+
+def getRecvMmsg(batchSize, bufferSize=65535):
+    """Return a function receiving up to `batchSize` datagrams at once.
+
+    The returned `recvmmsg(s)` function returns a list of
+    `(data, address)` tuples and raises :py:class:`socket.error` if
+    nothing could be read.
+    """
+    if libc is None:
+        raise error.CarrierError('recvmmsg() interface is not supported '
+                                 'by this OS and/or Python version')
+
+    msgSize = ctypes.sizeof(mmsghdr)
+    msgLenOffset = mmsghdr.msg_len.offset
+    nameLenOffset = mmsghdr.msg_hdr.offset + msghdr.msg_namelen.offset
+
+    # one contiguous chunk per kind of buffer, sliced per message
+    buffers = ctypes.create_string_buffer(bufferSize * batchSize)
+    names = ctypes.create_string_buffer(SOCKADDR_STORAGE_SIZE * batchSize)
+
+    iovecs = (iovec * batchSize)()
+    msgvec = (mmsghdr * batchSize)()
+
+    for idx in range(batchSize):
+        iovecs[idx].iov_base = ctypes.addressof(buffers) + idx * bufferSize
+        iovecs[idx].iov_len = bufferSize
+
+        hdr = msgvec[idx].msg_hdr
+        hdr.msg_name = ctypes.addressof(names) + idx * SOCKADDR_STORAGE_SIZE
+        hdr.msg_namelen = SOCKADDR_STORAGE_SIZE
+        hdr.msg_iov = ctypes.pointer(iovecs[idx])
+        hdr.msg_iovlen = 1
+
+    msgBuffer = (ctypes.c_char * (msgSize * batchSize)).from_buffer(msgvec)
+    dataView = memoryview(buffers)
+    namesView = memoryview(names)
+
+    # peers tend to repeat, parsing their addresses is costly
+    addressCache = {}
+
+    def recvmmsg(s):
+        count = _recvmmsg(s.fileno(), msgvec, batchSize, MSG_DONTWAIT, None)
+
+        if count < 0:
+            _raiseSocketError()
+
+        messages = []
+
+        for idx in range(count):
+            offset = idx * msgSize
+
+            msgLen, = struct.unpack_from('I', msgBuffer, offset + msgLenOffset)
+            nameLen, = struct.unpack_from('I', msgBuffer, offset + nameLenOffset)
+
+            struct.pack_into('I', msgBuffer, offset + nameLenOffset,
+                             SOCKADDR_STORAGE_SIZE)
+
+            offset = idx * SOCKADDR_STORAGE_SIZE
+            name = namesView[offset:offset + nameLen].tobytes()
+
+            try:
+                address = addressCache[name]
+
+            except KeyError:
+                if len(addressCache) > ADDRESS_CACHE_SIZE:
+                    addressCache.clear()
+
+                address = addressCache[name] = _parseSockAddr(name, nameLen)
+
+            offset = idx * bufferSize
+
+            messages.append(
+                (dataView[offset:offset + msgLen].tobytes(), address))
+
+        return messages
+
+    return recvmmsg
+
+
+def getSendMmsg(batchSize, bufferSize=65535):
+    """Return a function sending up to `batchSize` datagrams at once.
+
+    The returned `sendmmsg(s, messages)` function takes a sequence of
+    `(data, address)` tuples and returns the number of datagrams
+    actually sent. It raises :py:class:`socket.error` if nothing could
+    be sent.
+    """
+    if libc is None:
+        raise error.CarrierError('sendmmsg() interface is not supported '
+                                 'by this OS and/or Python version')
+
+    msgSize = ctypes.sizeof(mmsghdr)
+    iovSize = ctypes.sizeof(iovec)
+    nameOffset = mmsghdr.msg_hdr.offset + msghdr.msg_name.offset
+    iovLenOffset = iovec.iov_len.offset
+
+    buffers = ctypes.create_string_buffer(bufferSize * batchSize)
+
+    iovecs = (iovec * batchSize)()
+    msgvec = (mmsghdr * batchSize)()
+
+    for idx in range(batchSize):
+        iovecs[idx].iov_base = ctypes.addressof(buffers) + idx * bufferSize
+
+        hdr = msgvec[idx].msg_hdr
+        hdr.msg_iov = ctypes.pointer(iovecs[idx])
+        hdr.msg_iovlen = 1
+
+    msgBuffer = (ctypes.c_char * (msgSize * batchSize)).from_buffer(msgvec)
+    iovBuffer = (ctypes.c_char * (iovSize * batchSize)).from_buffer(iovecs)
+
+    # packed peer addresses are referred to by pointer
+    addressCache = {}
+
+    def sendmmsg(s, messages):
+        family = s.family
+
+        buffersAddress = ctypes.addressof(buffers)
+
+        # cached addresses must outlive the call
+        if len(addressCache) > ADDRESS_CACHE_SIZE:
+            addressCache.clear()
+
+        count = min(len(messages), batchSize)
+
+        for idx in range(count):
+            data, address = messages[idx]
+
+            if len(data) > bufferSize:
+                if not idx:
+                    raise socket.error(
+                        errno.EMSGSIZE, os.strerror(errno.EMSGSIZE))
+
+                count = idx
+                break
+
+            try:
+                name = addressCache[(family, address)]
+
+            except KeyError:
+                name = ctypes.create_string_buffer(
+                    _makeSockAddr(family, address))
+
+                addressCache[(family, address)] = name
+
+            ctypes.memmove(buffersAddress + idx * bufferSize, data, len(data))
+
+            struct.pack_into('PI', msgBuffer, idx * msgSize + nameOffset,
+                             ctypes.addressof(name), len(name) - 1)
+            struct.pack_into('N', iovBuffer, idx * iovSize + iovLenOffset,
+                             len(data))
+
+        sent = _sendmmsg(s.fileno(), msgvec, count, MSG_DONTWAIT)
+
+        if sent < 0:
+            _raiseSocketError()
+
+        return sent
+
+    return sendmmsg
+
@@ -0,0 +1,70 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# The following routines report socket buffer usage and the number of
+# datagrams dropped by OS kernel on the socket.
+#
+# Linux exposes these through SO_MEMINFO socket option (kernel 4.6+,
+# drops counter since 4.13). Older kernels can still report drops by way
+# of SO_RXQ_OVFL option attaching the counter to each received datagram.
+#
+import socket
+import struct
+import sys
+
+# Linux-specific, not exposed by the socket module
+SO_RXQ_OVFL = 40
+SO_MEMINFO = 55
+
+SK_MEMINFO_RMEM_ALLOC = 0
+SK_MEMINFO_RCVBUF = 1
+SK_MEMINFO_WMEM_ALLOC = 2
+SK_MEMINFO_SNDBUF = 3
+SK_MEMINFO_DROPS = 8
+
+IS_LINUX = sys.platform.startswith('linux')
+
+
+def getRxQueueOverflows(ancdata):
+    """Return kernel drops counter from `recvmsg()` ancillary data.
+
+    Returns `None` unless SO_RXQ_OVFL message is present.
+    """
+    for cmsgLevel, cmsgType, cmsgData in ancdata:
+        if cmsgLevel == socket.SOL_SOCKET and cmsgType == SO_RXQ_OVFL:
+            return struct.unpack('I', cmsgData[:4])[0]
+
+
+def getSocketStats(sock):
+    """Return socket buffers usage and kernel drops counter.
+
+    Returns
+    -------
+    : :py:class:`dict`
+        `rxQueueOctets`, `rxBufferSize`, `txQueueOctets`, `txBufferSize`
+        and, if the OS kernel reports it, `rxQueueOverflows`. Empty
+        if the platform does not support SO_MEMINFO option.
+    """
+    if not IS_LINUX:
+        return {}
+
+    try:
+        meminfo = sock.getsockopt(socket.SOL_SOCKET, SO_MEMINFO, 64)
+
+    except socket.error:
+        return {}
+
+    meminfo = struct.unpack('%dI' % (len(meminfo) // 4), meminfo)
+
+    stats = dict(rxQueueOctets=meminfo[SK_MEMINFO_RMEM_ALLOC],
+                 rxBufferSize=meminfo[SK_MEMINFO_RCVBUF],
+                 txQueueOctets=meminfo[SK_MEMINFO_WMEM_ALLOC],
+                 txBufferSize=meminfo[SK_MEMINFO_SNDBUF])
+
+    if len(meminfo) > SK_MEMINFO_DROPS:
+        stats['rxQueueOverflows'] = meminfo[SK_MEMINFO_DROPS]
+
+    return stats
@@ -38,6 +38,12 @@ class TwistedDispatcher(AbstractTransportDispatcher):
             lambda self=self: self.handleTimerTick(time.time())
         )
 
+        self.__timerCall = None
+        self.__timerDeadline = None
+
+        if kwargs.get('tickless'):
+            self.setTickless()
+
     def runDispatcher(self, timeout=0.0):
         if not reactor.running:
             try:
@@ -50,18 +56,73 @@ class TwistedDispatcher(AbstractTransportDispatcher):
                 raise PySnmpError('reactor error: %s' % ';'.join(
                     traceback.format_exception(*sys.exc_info())))
 
-    # jobstarted/jobfinished might be okay as-is
+    def callSoon(self, cbFun, *args):
+        reactor.callLater(0, cbFun, *args)
 
-    def registerTransport(self, transportDomain, transport):
-        if not self.loopingcall.running and self.getTimerResolution() > 0:
+    def setTickless(self, tickless=True):
+        running = self.__transportCount and self.isTickless() != tickless
+
+        if running:
+            self.__stopTimer()
+
+        AbstractTransportDispatcher.setTickless(self, tickless)
+
+        if running:
+            self.__startTimer()
+
+    def rearmTimer(self):
+        if not self.isTickless() or not self.__transportCount:
+            return
+
+        timeNow = time.time()
+
+        deadline = self.getTimerDeadline(timeNow)
+
+        if deadline is None:
+            return
+
+        if self.__timerCall is not None:
+            if self.__timerDeadline <= deadline:
+                return
+
+            self.__timerCall.cancel()
+
+        self.__timerDeadline = deadline
+        self.__timerCall = reactor.callLater(
+            max(0, deadline - timeNow), self.__handleDeadline)
+
+    def __handleDeadline(self):
+        self.__timerCall = None
+        self.handleTimerTick(time.time())
+        self.rearmTimer()
+
+    def __startTimer(self):
+        if self.isTickless():
+            self.rearmTimer()
+
+        elif not self.loopingcall.running and self.getTimerResolution() > 0:
             self.loopingcall.start(self.getTimerResolution(), now=False)
 
+    def __stopTimer(self):
+        if self.__timerCall is not None:
+            self.__timerCall.cancel()
+            self.__timerCall = None
+
+        if self.loopingcall.running:
+            self.loopingcall.stop()
+
+    # jobstarted/jobfinished might be okay as-is
+
+    def registerTransport(self, transportDomain, transport):
         AbstractTransportDispatcher.registerTransport(
             self, transportDomain, transport
         )
 
         self.__transportCount += 1
 
+        if self.__transportCount == 1:
+            self.__startTimer()
+
     def unregisterTransport(self, transportDomain):
         transport = AbstractTransportDispatcher.getTransport(
             self, transportDomain)
@@ -71,5 +132,5 @@ class TwistedDispatcher(AbstractTransportDispatcher):
             self.__transportCount -= 1
 
         # The last transport has been removed, stop the timeout
-        if self.__transportCount == 0 and self.loopingcall.running:
-            self.loopingcall.stop()
+        if self.__transportCount == 0:
+            self.__stopTimer()
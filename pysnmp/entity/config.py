@@ -7,8 +7,10 @@
 from pyasn1.compat.octets import null
 
 from pysnmp import error
+from pysnmp.carrier.asyncio import stream
 from pysnmp.carrier.asyncore.dgram import udp
 from pysnmp.carrier.asyncore.dgram import udp6
+from pysnmp.carrier.asyncore.dgram import unix
 from pysnmp.proto.secmod.rfc3414.auth import hmacmd5
 from pysnmp.proto.secmod.rfc3414.auth import hmacsha
 from pysnmp.proto.secmod.rfc3414.auth import noauth
@@ -29,6 +31,9 @@ from pysnmp import debug
 # Transports
 SNMP_UDP_DOMAIN = udp.SNMP_UDP_DOMAIN
 SNMP_UDP6_DOMAIN = udp6.SNMP_UDP6_DOMAIN
+SNMP_LOCAL_DOMAIN = unix.SNMP_LOCAL_DOMAIN
+# RFC 3430, implemented by asyncio carrier only
+SNMP_TCP_DOMAIN = stream.SNMP_TCP_DOMAIN
 
 # Auth protocol
 USM_AUTH_HMAC96_MD5 = hmacmd5.HmacMd5.SERVICE_ID
@@ -472,6 +477,21 @@ def addTargetAddr(snmpEngine, addrName, transportDomain, transportAddress,
 
         sourceAddress = TransportAddressIPv6(sourceAddress)
 
+    elif transportDomain[:len(SNMP_TCP_DOMAIN)] == SNMP_TCP_DOMAIN:
+        TransportAddressIPv4, = mibBuilder.importSymbols('TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+        transportAddress = TransportAddressIPv4(transportAddress)
+
+        if sourceAddress is None:
+            sourceAddress = ('0.0.0.0', 0)
+
+        sourceAddress = TransportAddressIPv4(sourceAddress)
+
+    elif transportDomain[:len(SNMP_LOCAL_DOMAIN)] == SNMP_LOCAL_DOMAIN:
+        # local address is chosen by the transport, but the column
+        # can not be empty
+        if sourceAddress is None:
+            sourceAddress = transportAddress
+
     snmpEngine.msgAndPduDsp.mibInstrumController.writeMibObjects(
         (snmpTargetAddrEntry.name + (9,) + tblIdx, 'destroy'),
         snmpEngine=snmpEngine
@@ -7,24 +7,58 @@
 import os
 import shutil
 import tempfile
+import time
 
 from pyasn1.compat.octets import str2octs
 
 from pysnmp import debug
 from pysnmp import error
+from pysnmp import scheduler
 from pysnmp.entity import observer
 from pysnmp.proto.acmod import rfc3415
 from pysnmp.proto.acmod import void
+from pysnmp.proto.mpmod.base import AbstractMessageProcessingModel
 from pysnmp.proto.mpmod.rfc2576 import SnmpV1MessageProcessingModel
 from pysnmp.proto.mpmod.rfc2576 import SnmpV2cMessageProcessingModel
 from pysnmp.proto.mpmod.rfc3412 import SnmpV3MessageProcessingModel
 from pysnmp.proto.rfc3412 import MsgAndPduDispatcher
+from pysnmp.proto.secmod.base import AbstractSecurityModel
 from pysnmp.proto.secmod.rfc2576 import SnmpV1SecurityModel
 from pysnmp.proto.secmod.rfc2576 import SnmpV2cSecurityModel
 from pysnmp.proto.secmod.rfc3414 import SnmpUSMSecurityModel
 
 __all__ = ['SnmpEngine']
 
+# Deprecated timer tick hooks, subsystems overriding them still get
+# called on every timer tick
+BASE_TIMER_TICK_HOOKS = [
+    getattr(hook, '__func__', hook) for hook in (
+        MsgAndPduDispatcher.receiveTimerTick,
+        AbstractMessageProcessingModel.receiveTimerTick,
+        AbstractSecurityModel.receiveTimerTick)
+]
+
+_timerTickHookOverrides = {}
+
+
+def _overridesTimerTick(handler):
+    handlerType = handler.__class__
+
+    try:
+        return _timerTickHookOverrides[handlerType]
+
+    except KeyError:
+        pass
+
+    hook = getattr(handlerType, 'receiveTimerTick', None)
+    hook = getattr(hook, '__func__', hook)
+
+    overrides = hook is not None and hook not in BASE_TIMER_TICK_HOOKS
+
+    _timerTickHookOverrides[handlerType] = overrides
+
+    return overrides
+
 
 class SnmpEngine(object):
     """Creates SNMP engine object.
@@ -63,6 +97,10 @@ class SnmpEngine(object):
 
         self.observer = observer.MetaObserver()
 
+        self.scheduler = scheduler.Scheduler(self.__getTimerTicks)
+
+        self.__timerTickHooksTimer = None
+
         if msgAndPduDsp is None:
             self.msgAndPduDsp = MsgAndPduDispatcher()
 
@@ -177,13 +215,40 @@ class SnmpEngine(object):
         )
 
     def __receiveTimerTickCbFun(self, timeNow):
-        self.msgAndPduDsp.receiveTimerTick(self, timeNow)
+        self.scheduler.runDue(self.transportDispatcher.getTimerTicks())
+
+        self.__scheduleTimerTickHooks()
+
+    def __getTimerTicks(self):
+        if self.transportDispatcher is not None:
+            return self.transportDispatcher.getTimerTicks()
+
+    def __getNextDeadline(self):
+        self.__scheduleTimerTickHooks()
+
+        return self.scheduler.getNextDeadline()
+
+    def __scheduleTimerTickHooks(self):
+        timer = self.__timerTickHooksTimer
 
-        for mpHandler in self.messageProcessingSubsystems.values():
-            mpHandler.receiveTimerTick(self, timeNow)
+        if ((timer is None or not timer.isActive()) and
+                self.__getTimerTickHandlers()):
+            self.__timerTickHooksTimer = self.scheduler.callLater(
+                1, self.__callTimerTickHooks)
 
-        for smHandler in self.securityModels.values():
-            smHandler.receiveTimerTick(self, timeNow)
+    def __getTimerTickHandlers(self):
+        handlers = [self.msgAndPduDsp]
+        handlers.extend(self.messageProcessingSubsystems.values())
+        handlers.extend(self.securityModels.values())
+
+        return [handler for handler in handlers
+                if _overridesTimerTick(handler)]
+
+    def __callTimerTickHooks(self):
+        timeNow = time.time()
+
+        for handler in self.__getTimerTickHandlers():
+            handler.receiveTimerTick(self, timeNow)
 
     def registerTransportDispatcher(self, transportDispatcher, recvId=None):
         if (self.transportDispatcher and
@@ -193,7 +258,9 @@ class SnmpEngine(object):
         transportDispatcher.registerRecvCbFun(self.__receiveMessageCbFun, recvId)
 
         if not self.transportDispatcher:
-            transportDispatcher.registerTimerCbFun(self.__receiveTimerTickCbFun)
+            transportDispatcher.registerTimerCbFun(
+                self.__receiveTimerTickCbFun,
+                deadlineFun=self.__getNextDeadline)
             self.transportDispatcher = transportDispatcher
 
     def unregisterTransportDispatcher(self, recvId=None):
@@ -207,6 +274,17 @@ class SnmpEngine(object):
     def getMibBuilder(self):
         return self.msgAndPduDsp.mibInstrumController.mibBuilder
 
+    def getStats(self):
+        """Return a snapshot of SNMP engine counters.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            SNMP engine counter name (e.g. `snmpInPkts`) to
+            :py:class:`int` value mapping
+        """
+        return self.msgAndPduDsp.stats.getStats()
+
     # User app may attach opaque objects to SNMP Engine
     def setUserContext(self, **kwargs):
         self.cache.update(dict([('__%s' % k, kwargs[k]) for k in kwargs]))
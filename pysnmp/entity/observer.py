@@ -21,6 +21,10 @@ class MetaObserver(object):
        It's important to realize that execution context is only guaranteed
        to exist to functions that are at the same or deeper level of invocation
        relative to execution point specified.
+
+       To save on building unused contexts, execution point may check
+       if anyone observes it, or store a callable returning the context.
+       The callable is then invoked once the context is first requested.
     """
 
     def __init__(self):
@@ -54,12 +58,23 @@ class MetaObserver(object):
                 if not self.__observers[execpoint]:
                     del self.__observers[execpoint]
 
+    def isObserved(self, execpoint):
+        return execpoint in self.__observers
+
     def storeExecutionContext(self, snmpEngine, execpoint, variables):
-        self.__execpoints[execpoint] = variables
         if execpoint in self.__observers:
+            if callable(variables):
+                variables = variables()
+
+            self.__execpoints[execpoint] = variables
+
             for cbFun in self.__observers[execpoint]:
                 cbFun(snmpEngine, execpoint, variables, self.__contexts[cbFun])
 
+        else:
+            # context may be built on demand
+            self.__execpoints[execpoint] = variables
+
     def clearExecutionContext(self, snmpEngine, *execpoints):
         if execpoints:
             for execpoint in execpoints:
@@ -69,4 +84,9 @@ class MetaObserver(object):
             self.__execpoints.clear()
 
     def getExecutionContext(self, execpoint):
-        return self.__execpoints[execpoint]
+        variables = self.__execpoints[execpoint]
+
+        if callable(variables):
+            variables = self.__execpoints[execpoint] = variables()
+
+        return variables
@@ -123,10 +123,7 @@ class CommandResponderBase(object):
                 'sendPdu: stateReference %s, statusInformation '
                 '%s' % (stateReference, exc))
 
-            snmpSilentDrops, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpSilentDrops')
-
-            snmpSilentDrops.syntax += 1
+            snmpEngine.msgAndPduDsp.stats.snmpSilentDrops += 1
 
     _getRequestType = rfc1905.GetRequestPDU.tagSet
     _getNextRequestType = rfc1905.GetNextRequestPDU.tagSet
@@ -226,14 +223,14 @@ class CommandResponderBase(object):
                 raise pysnmp.smi.error.GenError(name=name, idx=context.get('idx'))
 
             elif errorIndication == errind.noSuchContext:
-                snmpUnknownContexts, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
-                    '__SNMP-TARGET-MIB', 'snmpUnknownContexts')
-                snmpUnknownContexts.syntax += 1
+                engineStats = snmpEngine.msgAndPduDsp.stats
+                engineStats.snmpUnknownContexts += 1
+
+                oid, val = engineStats.getVarBind('snmpUnknownContexts')
 
                 # Request REPORT generation
                 raise pysnmp.smi.error.GenError(
-                    name=name, idx=context.get('idx'), oid=snmpUnknownContexts.name,
-                    val=snmpUnknownContexts.syntax)
+                    name=name, idx=context.get('idx'), oid=oid, val=val)
 
             elif errorIndication == errind.notInView:
                 return True
@@ -364,12 +361,11 @@ class NextCommandResponder(CommandResponderBase):
             snmpEngine = context['snmpEngine']
 
             # Need to unwind stack, can't recurse any more
-            def callLater(*args):
-                snmpEngine.transportDispatcher.unregisterTimerCbFun(callLater)
+            def callSoon():
                 mgmtFun = context['mgmtFun']
-                mgmtFun(*varBinds, **context)
+                mgmtFun(*rtrVarBinds, **context)
 
-            snmpEngine.transportDispatcher.registerTimerCbFun(callLater, 0.01)
+            snmpEngine.transportDispatcher.callSoon(callSoon)
 
         else:
             return rspVarBinds
@@ -402,60 +398,71 @@ class BulkCommandResponder(NextCommandResponder):
     SUPPORTED_PDU_TYPES = (rfc1905.GetBulkRequestPDU.tagSet,)
     MAX_VAR_BINDS = 64
 
-    def _completeNonRepeaters(self, varBinds, **context):
-        mgmtFun = context['mgmtFun']
+    def _repeatMgmtOperation(self, varBinds, **context):
+        """Run the next GETBULK repetition without growing the stack.
 
-        if not varBinds:
-            # No non-repeaters requested, proceed with repeaters
-            mgmtFun(*context['reqVarBinds'],
-                    **dict(context, cbFun=self.completeMgmtOperation,
-                           varBinds=context['reqVarBinds'][:]))
+        When MIB instrumentation calls back synchronously, the next
+        repetition is queued and picked up by the already running loop
+        rather than recursed into. That way the whole GETBULK response is
+        built in a single pass over the MIB tree. Asynchronous MIB
+        instrumentation simply re-enters the loop from its own call back.
+        """
+        repetitions = context['repetitions']
+
+        repetitions['pending'] = varBinds
+
+        if repetitions['running']:
             return
 
-        rspVarBinds = self._getManagedObjectsInstances(varBinds, **context)
-        if rspVarBinds:
-            context['allVarBinds'].extend(rspVarBinds)
+        repetitions['running'] = True
 
-            if context['counters']['M'] and context['counters']['R']:
+        try:
+            while repetitions['pending'] is not None:
+                reqVarBinds = repetitions['pending']
+                repetitions['pending'] = None
 
-                rspVarBinds = self._getManagedObjectsInstances(varBinds, **context)
-                if rspVarBinds:
-                    # Done with non-repeaters, proceed with repeaters
-                    mgmtFun(*context['reqVarBinds'],
-                            **dict(context,
-                                   cbFun=self.completeMgmtOperation,
-                                   varBindsMap={},
-                                   rspVarBinds=context['reqVarBinds'][:]))
-                    return
+                mgmtFun = context['mgmtFun']
+                mgmtFun(*reqVarBinds,
+                        **dict(context, cbFun=self.completeMgmtOperation,
+                               varBindsMap={}, rspVarBinds=reqVarBinds[:]))
 
-            else:
-                CommandResponderBase.completeMgmtOperation(self, context['allVarBinds'], **context)
+        finally:
+            repetitions['running'] = False
 
-    def completeMgmtOperation(self, varBinds, **context):
-        rspVarBinds = self._getManagedObjectsInstances(varBinds, **context)
-        if rspVarBinds:
-            context['counters']['M'] -= 1
+    def _completeNonRepeaters(self, varBinds, **context):
+        if varBinds:
+            rspVarBinds = self._getManagedObjectsInstances(varBinds, **context)
+            if not rspVarBinds:
+                return
 
             context['allVarBinds'].extend(rspVarBinds)
 
-            eom = all(exval.endOfMibView.isSameTypeWith(value) for name, value in rspVarBinds)
+        if context['counters']['M'] and context['counters']['R']:
+            # Done with non-repeaters, proceed with repeaters
+            self._repeatMgmtOperation(context['reqVarBinds'], **context)
+
+        else:
+            CommandResponderBase.completeMgmtOperation(
+                self, context['allVarBinds'], **context)
+
+    def completeMgmtOperation(self, varBinds, **context):
+        rspVarBinds = self._getManagedObjectsInstances(varBinds, **context)
+        if not rspVarBinds:
+            return
 
-            if not eom and context['counters']['M'] and context['counters']['R']:
-                snmpEngine = context['snmpEngine']
+        context['counters']['M'] -= 1
 
-                # Need to unwind stack, can't recurse any more
-                def callLater(*args):
-                    snmpEngine.transportDispatcher.unregisterTimerCbFun(callLater)
-                    mgmtFun = context['mgmtFun']
-                    reqVarBinds = varBinds[-context['counters']['R']:]
-                    mgmtFun(*reqVarBinds,
-                            **dict(context, cbFun=self.completeMgmtOperation,
-                                   varBindsMap={}, rspVarBinds=reqVarBinds[:]))
+        context['allVarBinds'].extend(rspVarBinds)
 
-                snmpEngine.transportDispatcher.registerTimerCbFun(callLater, 0.01)
+        eom = all(exval.endOfMibView.isSameTypeWith(value)
+                  for name, value in rspVarBinds)
 
-            else:
-                CommandResponderBase.completeMgmtOperation(self, context['allVarBinds'], **context)
+        if not eom and context['counters']['M'] and context['counters']['R']:
+            self._repeatMgmtOperation(rspVarBinds, **context)
+
+        else:
+            CommandResponderBase.completeMgmtOperation(
+                self, context['allVarBinds'], **context)
 
     # rfc1905: 4.2.3
     def initiateMgmtOperation(self, snmpEngine, stateReference, contextName, PDU):
@@ -489,7 +496,8 @@ class BulkCommandResponder(NextCommandResponder):
                        cbCtx=self.cbCtx,
                        reqVarBinds=varBinds[N:],
                        counters={'M': M, 'R': R},
-                       rspVarBinds=varBinds[N:],
+                       repetitions={'running': False, 'pending': None},
+                       rspVarBinds=varBinds[:N],
                        allVarBinds=[],
                        varBindsMap={},
                        mgmtFun=mgmtFun)
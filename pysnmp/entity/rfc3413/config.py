@@ -85,7 +85,14 @@ def getTargetAddr(snmpEngine, snmpTargetAddrName):
                 TransportAddressIPv6(snmpTargetAddrTAddress)
             ).setLocalAddress(TransportAddressIPv6(snmpSourceAddrTAddress))
 
-        elif snmpTargetAddrTDomain[:len(config.snmpLocalDomain)] == config.snmpLocalDomain:
+        elif snmpTargetAddrTDomain[:len(config.SNMP_TCP_DOMAIN)] == config.SNMP_TCP_DOMAIN:
+            TransportAddressIPv4, = mibBuilder.importSymbols('TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+
+            snmpTargetAddrTAddress = transport.ADDRESS_TYPE(
+                TransportAddressIPv4(snmpTargetAddrTAddress)
+            ).setLocalAddress(TransportAddressIPv4(snmpSourceAddrTAddress))
+
+        elif snmpTargetAddrTDomain[:len(config.SNMP_LOCAL_DOMAIN)] == config.SNMP_LOCAL_DOMAIN:
             snmpTargetAddrTAddress = transport.ADDRESS_TYPE(
                 snmpTargetAddrTAddress
             )
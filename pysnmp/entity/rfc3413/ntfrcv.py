@@ -19,11 +19,18 @@ class NotificationReceiver(object):
     SUPPORTED_PDU_TYPES = (v1.TrapPDU.tagSet, v2c.SNMPv2TrapPDU.tagSet,
                            v2c.InformRequestPDU.tagSet)
 
-    def __init__(self, snmpEngine, cbFun, cbCtx=None):
+    def __init__(self, snmpEngine, cbFun, cbCtx=None, lazyVarBinds=False):
         snmpEngine.msgAndPduDsp.registerContextEngineId(
             null, self.SUPPORTED_PDU_TYPES, self.processPdu  # '' is a wildcard
         )
 
+        # pass var-bindings to cbFun as they get decoded on access
+        if lazyVarBinds:
+            snmpEngine.msgAndPduDsp.registerLazyVarBinds(
+                self.SUPPORTED_PDU_TYPES)
+
+        self.__lazyVarBinds = lazyVarBinds
+
         self.__snmpTrapCommunity = ''
         self.__cbFun = cbFun
         self.__cbCtx = cbCtx
@@ -38,6 +45,11 @@ class NotificationReceiver(object):
         snmpEngine.msgAndPduDsp.unregisterContextEngineId(
             null, self.SUPPORTED_PDU_TYPES
         )
+
+        if self.__lazyVarBinds:
+            snmpEngine.msgAndPduDsp.unregisterLazyVarBinds(
+                self.SUPPORTED_PDU_TYPES)
+
         self.__cbFun = self.__cbCtx = None
 
     def processPdu(self, snmpEngine, messageProcessingModel,
@@ -92,12 +104,7 @@ class NotificationReceiver(object):
                 debug.logger & debug.FLAG_APP and debug.logger(
                     'processPdu: stateReference %s, statusInformation %s' % (stateReference, exc))
 
-                mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
-
-                snmpSilentDrops, = mibBuilder.importSymbols(
-                    '__SNMPv2-MIB', 'snmpSilentDrops')
-
-                snmpSilentDrops.syntax += 1
+                snmpEngine.msgAndPduDsp.stats.snmpSilentDrops += 1
 
         elif PDU.tagSet in rfc3411.UNCONFIRMED_CLASS_PDUS:
             pass
@@ -0,0 +1,336 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Run a pool of SNMP engines in worker processes
+#
+import errno
+import multiprocessing
+import os
+import pickle
+import socket
+import struct
+import time
+
+from pysnmp import debug
+from pysnmp import error
+
+__all__ = ['Supervisor']
+
+# worker reports go over a socket pair, each pickled report is
+# preceded by its size
+STATS_HEADER = struct.Struct('!I')
+
+
+class Worker(object):
+    """Worker process side of :py:class:`Supervisor`.
+
+    An instance of `Worker` is passed to the user worker function
+    running in its own process. The worker function is expected to
+    build and run its own :py:class:`SnmpEngine`.
+
+    Attributes
+    ----------
+    workerId: :py:class:`int`
+        Worker serial number in the pool, starting from zero
+    """
+    def __init__(self, workerId, statsSock, statsInterval):
+        self.workerId = workerId
+        self._supervisorPid = os.getpid()
+        self._statsSock = statsSock
+        self._statsInterval = statsInterval
+        self._snmpEngine = None
+        self._statsFun = None
+        self._unsentStats = b''
+
+    def __repr__(self):
+        return '%s(workerId=%s)' % (self.__class__.__name__, self.workerId)
+
+    def registerSnmpEngine(self, snmpEngine, statsFun=None):
+        """Periodically report SNMP engine counters to the supervisor.
+
+        Transport dispatcher must already be registered with the
+        SNMP engine.
+
+        Parameters
+        ----------
+        snmpEngine: :py:class:`SnmpEngine`
+            SNMP engine running in this worker
+
+        Other Parameters
+        ----------------
+        statsFun: callable
+            If given, `statsFun()` should return a :py:class:`dict` of
+            application-specific statistics to add to the report
+        """
+        if snmpEngine.transportDispatcher is None:
+            raise error.PySnmpError('Transport dispatcher not registered')
+
+        self._snmpEngine = snmpEngine
+        self._statsFun = statsFun
+
+        # slow supervisor must never stall SNMP engine
+        self._statsSock.setblocking(False)
+
+        snmpEngine.transportDispatcher.registerTimerCbFun(
+            self._publishStats, self._statsInterval)
+
+    def getStats(self):
+        stats = dict(workerId=self.workerId, pid=os.getpid(),
+                     time=time.time())
+
+        stats.update(self._snmpEngine.getStats())
+
+        stats['transport'] = (
+            self._snmpEngine.transportDispatcher.getTransportStats())
+
+        if self._statsFun:
+            stats.update(self._statsFun())
+
+        return stats
+
+    def _publishStats(self, timeNow):
+        # supervisor is gone, do not linger around
+        if os.getppid() != self._supervisorPid:
+            debug.logger & debug.FLAG_APP and debug.logger(
+                '_publishStats: worker %s lost its supervisor, '
+                'exiting' % self.workerId)
+
+            raise SystemExit(1)
+
+        try:
+            if self._unsentStats:
+                self._flushStats()
+
+                if self._unsentStats:
+                    debug.logger & debug.FLAG_APP and debug.logger(
+                        '_publishStats: worker %s stats socket is full, '
+                        'skipping report' % self.workerId)
+
+            else:
+                data = pickle.dumps(self.getStats(), pickle.HIGHEST_PROTOCOL)
+
+                self._unsentStats = STATS_HEADER.pack(len(data)) + data
+
+                self._flushStats()
+
+        except (IOError, OSError) as exc:
+            debug.logger & debug.FLAG_APP and debug.logger(
+                '_publishStats: worker %s failed to report stats: '
+                '%s' % (self.workerId, exc))
+
+    def _flushStats(self):
+        try:
+            sent = self._statsSock.send(self._unsentStats)
+
+        except (IOError, OSError) as exc:
+            if exc.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+
+            raise
+
+        self._unsentStats = self._unsentStats[sent:]
+
+
+def _runWorker(workerFun, worker):
+    workerFun(worker)
+
+
+class Supervisor(object):
+    """Creates SNMP engines pool.
+
+    `Supervisor` object runs the same worker function in a number of
+    child processes. Each worker builds its own
+    :py:class:`SnmpEngine` serving the same UDP port opened with
+    `SO_REUSEPORT` option (see `enableReusePort()` transport method)
+    so that OS kernel balances incoming SNMP messages between them.
+
+    Workers report their statistics to the supervisor by means of
+    :py:meth:`Worker.registerSnmpEngine`.
+
+    Parameters
+    ----------
+    workerFun: callable
+        Function to run in each worker process, it gets called as
+        `workerFun(worker)` where `worker` is a :py:class:`Worker`
+        instance.
+
+    Other Parameters
+    ----------------
+    workers: :py:class:`int`
+        Number of worker processes to run, defaults to the number of
+        CPUs
+    statsInterval: :py:class:`float`
+        How often workers report their statistics, in seconds
+
+    Examples
+    --------
+    >>> def workerFun(worker):
+    ...     snmpEngine = engine.SnmpEngine()
+    ...     config.addTransport(
+    ...         snmpEngine, udp.DOMAIN_NAME,
+    ...         udp.UdpTransport().enableReusePort().openServerMode(('0.0.0.0', 162)))
+    ...     config.addV1System(snmpEngine, 'my-area', 'public')
+    ...     ntfrcv.NotificationReceiver(snmpEngine, cbFun)
+    ...     worker.registerSnmpEngine(snmpEngine)
+    ...     snmpEngine.transportDispatcher.jobStarted(1)
+    ...     snmpEngine.transportDispatcher.runDispatcher()
+    ...
+    >>> supervisor = Supervisor(workerFun, workers=4)
+    >>> supervisor.run()
+    """
+    def __init__(self, workerFun, workers=None, statsInterval=1):
+        self._workerFun = workerFun
+        self._workers = workers or multiprocessing.cpu_count()
+        self._statsInterval = statsInterval
+        self._processes = {}
+        self._statsSocks = {}
+        self._statsBuffers = {}
+        self._stats = {}
+        self._running = False
+
+    def __repr__(self):
+        return '%s(workers=%s)' % (self.__class__.__name__, self._workers)
+
+    def _startWorker(self, workerId):
+        statsSock, workerSock = socket.socketpair()
+
+        worker = Worker(workerId, workerSock, self._statsInterval)
+
+        process = multiprocessing.Process(
+            target=_runWorker, args=(self._workerFun, worker))
+
+        process.daemon = True
+        process.start()
+
+        workerSock.close()
+
+        statsSock.setblocking(False)
+
+        self._processes[workerId] = process
+        self._statsSocks[workerId] = statsSock
+        self._statsBuffers[workerId] = b''
+
+        debug.logger & debug.FLAG_APP and debug.logger(
+            '_startWorker: started worker %s, pid %s' % (workerId, process.pid))
+
+    def start(self):
+        """Start worker processes"""
+        if self._running:
+            raise error.PySnmpError('Supervisor already started')
+
+        for workerId in range(self._workers):
+            self._startWorker(workerId)
+
+        self._running = True
+
+    def stop(self):
+        """Terminate worker processes and wait till they are gone"""
+        self._running = False
+
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        for workerId, process in self._processes.items():
+            process.join()
+
+            self._statsSocks[workerId].close()
+
+            debug.logger & debug.FLAG_APP and debug.logger(
+                'stop: worker %s exited with %s' % (workerId, process.exitcode))
+
+        self._processes.clear()
+        self._statsSocks.clear()
+        self._statsBuffers.clear()
+
+    def respawn(self):
+        """Restart worker processes that have exited.
+
+        Returns
+        -------
+        : :py:class:`list`
+            IDs of restarted workers
+        """
+        restarted = []
+
+        for workerId, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+
+            debug.logger & debug.FLAG_APP and debug.logger(
+                'respawn: worker %s exited with %s, '
+                'restarting' % (workerId, process.exitcode))
+
+            process.join()
+
+            self._statsSocks[workerId].close()
+
+            self._startWorker(workerId)
+
+            restarted.append(workerId)
+
+        return restarted
+
+    def run(self):
+        """Start workers and keep them running till interrupted"""
+        self.start()
+
+        try:
+            while self._running:
+                time.sleep(self._statsInterval)
+
+                # keep stats sockets drained
+                self.getStats()
+
+                self.respawn()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.stop()
+
+    def getStats(self):
+        """Return the latest statistics reported by each worker.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            Worker ID to :py:class:`dict` of worker statistics mapping.
+            Statistics include SNMP engine counters, transport statistics
+            summed over worker's transports (under `transport` key) and
+            whatever worker's `statsFun()` returns.
+        """
+        for workerId, statsSock in self._statsSocks.items():
+            data = self._statsBuffers[workerId]
+
+            while True:
+                try:
+                    chunk = statsSock.recv(65536)
+
+                except (IOError, OSError):
+                    break  # drained or worker gone
+
+                if not chunk:
+                    break  # worker gone, keep the last report
+
+                data += chunk
+
+            while len(data) >= STATS_HEADER.size:
+                size, = STATS_HEADER.unpack(data[:STATS_HEADER.size])
+
+                end = STATS_HEADER.size + size
+
+                if len(data) < end:
+                    break
+
+                self._stats[workerId] = pickle.loads(data[STATS_HEADER.size:end])
+
+                data = data[end:]
+
+            self._statsBuffers[workerId] = data
+
+        return dict(self._stats)
@@ -15,6 +15,9 @@ __all__ = []
 class AbstractTransportTarget(object):
     TRANSPORT_DOMAIN = None
     PROTO_TRANSPORT = AbstractTransport
+    # transport sub-domains under this arc are reserved for pooled
+    # transports, user transports are customarily numbered from 1 up
+    TRANSPORT_POOL_ARC = 0xffffffff
 
     def __init__(self, transportAddr, timeout=1, retries=5, tagList=null):
         self.transportAddr = self._resolveAddr(transportAddr)
@@ -22,6 +25,8 @@ class AbstractTransportTarget(object):
         self.retries = retries
         self.tagList = tagList
         self.iface = None
+        self.poolSize = 1
+        self.recvBufferSize = self.sendBufferSize = None
         self.transport = None
 
     def __repr__(self):
@@ -30,7 +35,23 @@ class AbstractTransportTarget(object):
             self.timeout, self.retries, self.tagList)
 
     def getTransportInfo(self):
-        return self.TRANSPORT_DOMAIN, self.transportAddr
+        return self.getTransportDomain(), self.transportAddr
+
+    def getTransportDomain(self):
+        """Return transport domain serving this target.
+
+        With transport pool in use, transport sub-domain is chosen by
+        remote address so that all requests to the same SNMP agent go
+        out of, and come back into, the same socket. Pooled transports
+        live under the reserved `TRANSPORT_POOL_ARC` sub-domain, apart
+        from transports registered by the application.
+        """
+        if self.poolSize > 1:
+            return self.TRANSPORT_DOMAIN + (
+                self.TRANSPORT_POOL_ARC,
+                hash(self.transportAddr) % self.poolSize + 1)
+
+        return self.TRANSPORT_DOMAIN
 
     def setLocalAddress(self, iface):
         """Set source address.
@@ -49,8 +70,72 @@ class AbstractTransportTarget(object):
         self.iface = iface
         return self
 
+    def setTransportPool(self, size):
+        """Spread SNMP requests over a pool of transports.
+
+        By default, SNMP engine sends requests to all SNMP agents
+        through a single socket. When polling many agents at once, the
+        responses may overflow socket receive buffer and get dropped.
+
+        With transport pool of `size` sockets (hence, source ports),
+        SNMP agents are evenly distributed among pooled sockets. All
+        targets having the same transport pool size share the pool.
+
+        Pooled transports are registered under
+        `TRANSPORT_DOMAIN + (TRANSPORT_POOL_ARC, n)` transport
+        sub-domains, so they never take over transports the
+        application registers under `TRANSPORT_DOMAIN + (n,)`.
+
+        Parameters
+        ----------
+        size : int
+            Number of transports in the pool.
+
+        Returns
+        -------
+            self
+
+        """
+        if size < 1:
+            raise error.PySnmpError('Bad transport pool size %s' % size)
+
+        self.poolSize = size
+        return self
+
+    def setSocketBufferSize(self, recvSize=None, sendSize=None):
+        """Set socket receive and/or send buffer size.
+
+        Applies to sockets created for this target. Transports already
+        serving other targets are not affected.
+
+        Parameters
+        ----------
+        recvSize : int
+            Socket receive buffer size in octets (`SO_RCVBUF`).
+        sendSize : int
+            Socket send buffer size in octets (`SO_SNDBUF`).
+
+        Returns
+        -------
+            self
+
+        """
+        self.recvBufferSize = recvSize
+        self.sendBufferSize = sendSize
+        return self
+
     def openClientMode(self):
         self.transport = self.PROTO_TRANSPORT().openClientMode(self.iface)
+
+        if self.recvBufferSize is not None or self.sendBufferSize is not None:
+            if not hasattr(self.transport, 'setSocketBufferSize'):
+                raise error.PySnmpError(
+                    'Transport %r does not support socket buffer '
+                    'size setting' % self.PROTO_TRANSPORT)
+
+            self.transport.setSocketBufferSize(
+                self.recvBufferSize, self.sendBufferSize)
+
         return self.transport
 
     def verifyDispatcherCompatibility(self, snmpEngine):
@@ -4,13 +4,15 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-from time import time
-
 from pyasn1.codec.ber import encoder, decoder
 
 from pysnmp import debug
+from pysnmp import scheduler
+from pysnmp.carrier.error import TransportBusyError
 from pysnmp.proto import api
 from pysnmp.proto import error
+from pysnmp.proto.api import msgdec
+from pysnmp.proto.api import msgenc
 from pysnmp.proto.api import verdec
 
 __all__ = []
@@ -35,6 +37,9 @@ class AbstractSnmpDispatcher(object):
 
     PROTO_DISPATCHER = None
 
+    # decode well-formed messages bypassing generic BER decoder
+    FAST_DECODING = True
+
     def __init__(self, transportDispatcher=None):
         if transportDispatcher:
             self.transportDispatcher = transportDispatcher
@@ -47,8 +52,12 @@ class AbstractSnmpDispatcher(object):
 
         self._pendingReqs = {}
 
+        self.scheduler = scheduler.Scheduler(
+            self.transportDispatcher.getTimerTicks)
+
         self.transportDispatcher.registerRecvCbFun(self._recvCb)
-        self.transportDispatcher.registerTimerCbFun(self._timerCb)
+        self.transportDispatcher.registerTimerCbFun(
+            self._timerCb, deadlineFun=self.scheduler.getNextDeadline)
 
         self.cache = {}
 
@@ -61,6 +70,8 @@ class AbstractSnmpDispatcher(object):
         if self._automaticDispatcher:
             self.transportDispatcher.close()
 
+        self.scheduler.clear()
+
         for requestId, stateInfo in self._pendingReqs.items():
             cbFun = stateInfo['cbFun']
             cbCtx = stateInfo['cbCtx']
@@ -71,34 +82,53 @@ class AbstractSnmpDispatcher(object):
         self._pendingReqs.clear()
 
     def sendPdu(self, authData, transportTarget, reqPdu, cbFun=None, cbCtx=None):
+        transportDomain = transportTarget.getTransportDomain()
+
         if (self._automaticDispatcher and
-                transportTarget.TRANSPORT_DOMAIN not in self._configuredTransports):
+                transportDomain not in self._configuredTransports):
             self.transportDispatcher.registerTransport(
-                transportTarget.TRANSPORT_DOMAIN, transportTarget.PROTO_TRANSPORT().openClientMode()
+                transportDomain, transportTarget.openClientMode()
             )
-            self._configuredTransports.add(transportTarget.TRANSPORT_DOMAIN)
+            self._configuredTransports.add(transportDomain)
 
         pMod = api.PROTOCOL_MODULES[authData.mpModel]
 
-        reqMsg = pMod.Message()
-        pMod.apiMessage.setDefaults(reqMsg)
-        pMod.apiMessage.setCommunity(reqMsg, authData.communityName)
-        pMod.apiMessage.setPDU(reqMsg, reqPdu)
+        if isinstance(reqPdu, msgenc.RequestTemplate):
+            requestId = pMod.getNextRequestID()
+
+            outgoingMsg = reqPdu.encodeMessage(
+                requestId, authData.mpModel, authData.communityName)
 
-        outgoingMsg = encoder.encode(reqMsg)
+            reqPdu = reqPdu.pdu
 
-        requestId = pMod.apiPDU.getRequestID(reqPdu)
+        else:
+            reqMsg = pMod.Message()
+            pMod.apiMessage.setDefaults(reqMsg)
+            pMod.apiMessage.setCommunity(reqMsg, authData.communityName)
+            pMod.apiMessage.setPDU(reqMsg, reqPdu)
+
+            outgoingMsg = encoder.encode(reqMsg)
+
+            requestId = pMod.apiPDU.getRequestID(reqPdu)
 
         self._pendingReqs[requestId] = dict(
             outgoingMsg=outgoingMsg,
             transportTarget=transportTarget,
             cbFun=cbFun, cbCtx=cbCtx,
-            timestamp=time() + transportTarget.timeout, retries=0
+            timer=self.scheduler.callLater(
+                transportTarget.timeout / self.transportDispatcher.getTimerResolution(),
+                self._expireRequest, requestId),
+            retries=0
         )
 
-        self.transportDispatcher.sendMessage(
-            outgoingMsg, transportTarget.TRANSPORT_DOMAIN, transportTarget.transportAddr
-        )
+        try:
+            self.transportDispatcher.sendMessage(
+                outgoingMsg, transportDomain, transportTarget.transportAddr
+            )
+
+        except Exception:
+            self._pendingReqs.pop(requestId)['timer'].cancel()
+            raise
 
         if (reqPdu.__class__ is getattr(pMod, 'SNMPv2TrapPDU', None) or
                 reqPdu.__class__ is getattr(pMod, 'TrapPDU', None)):
@@ -120,7 +150,12 @@ class AbstractSnmpDispatcher(object):
         pMod = api.PROTOCOL_MODULES[mpModel]
 
         while wholeMsg:
-            rspMsg, wholeMsg = decoder.decode(wholeMsg, asn1Spec=pMod.Message())
+            if self.FAST_DECODING:
+                rspMsg, wholeMsg = msgdec.decodeMessage(wholeMsg, pMod.Message())
+
+            else:
+                rspMsg, wholeMsg = decoder.decode(wholeMsg, asn1Spec=pMod.Message())
+
             rspPdu = pMod.apiMessage.getPDU(rspMsg)
 
             requestId = pMod.apiPDU.getRequestID(rspPdu)
@@ -131,6 +166,8 @@ class AbstractSnmpDispatcher(object):
             except KeyError:
                 continue
 
+            stateInfo['timer'].cancel()
+
             self.transportDispatcher.jobFinished(id(self))
 
             cbFun = stateInfo['cbFun']
@@ -142,28 +179,36 @@ class AbstractSnmpDispatcher(object):
         return wholeMsg
 
     def _timerCb(self, timeNow):
-        for requestId, stateInfo in tuple(self._pendingReqs.items()):
-            if stateInfo['timestamp'] > timeNow:
-                continue
+        self.scheduler.runDue(self.transportDispatcher.getTimerTicks())
 
-            retries = stateInfo['retries']
-            transportTarget = stateInfo['transportTarget']
+    def _expireRequest(self, requestId):
+        stateInfo = self._pendingReqs[requestId]
 
-            if retries == transportTarget.retries:
-                cbFun = stateInfo['cbFun']
-                cbCtx = stateInfo['cbCtx']
+        retries = stateInfo['retries']
+        transportTarget = stateInfo['transportTarget']
 
-                if cbFun:
-                    del self._pendingReqs[requestId]
-                    cbFun(self, requestId, 'Request #%d timed out' % requestId, None, cbCtx)
-                    self.transportDispatcher.jobFinished(id(self))
-                    continue
+        if retries == transportTarget.retries:
+            cbFun = stateInfo['cbFun']
+            cbCtx = stateInfo['cbCtx']
+
+            if cbFun:
+                del self._pendingReqs[requestId]
+                cbFun(self, requestId, 'Request #%d timed out' % requestId, None, cbCtx)
+                self.transportDispatcher.jobFinished(id(self))
+                return
 
-            stateInfo['retries'] += 1
-            stateInfo['timestamp'] = timeNow + transportTarget.timeout
+        stateInfo['retries'] += 1
+        stateInfo['timer'] = self.scheduler.callLater(
+            transportTarget.timeout / self.transportDispatcher.getTimerResolution(),
+            self._expireRequest, requestId)
 
-            outgoingMsg = stateInfo['outgoingMsg']
+        outgoingMsg = stateInfo['outgoingMsg']
 
+        try:
             self.transportDispatcher.sendMessage(
-                outgoingMsg, transportTarget.TRANSPORT_DOMAIN, transportTarget.transportAddr
+                outgoingMsg, transportTarget.getTransportDomain(), transportTarget.transportAddr
             )
+
+        except TransportBusyError:
+            debug.logger & debug.FLAG_DSP and debug.logger(
+                '_expireRequest: transport busy, request #%d retry skipped' % requestId)
@@ -9,10 +9,13 @@ import sys
 
 from pysnmp.carrier.asyncio.dgram import udp
 from pysnmp.carrier.asyncio.dgram import udp6
+from pysnmp.carrier.asyncio.dgram import unix
+from pysnmp.carrier.asyncio.stream import tcp
 from pysnmp.error import PySnmpError
 from pysnmp.hlapi.transport import AbstractTransportTarget
 
-__all__ = ['Udp6TransportTarget', 'UdpTransportTarget']
+__all__ = ['Udp6TransportTarget', 'UdpTransportTarget', 'UnixTransportTarget',
+           'TcpTransportTarget']
 
 
 class UdpTransportTarget(AbstractTransportTarget):
@@ -124,3 +127,151 @@ class Udp6TransportTarget(AbstractTransportTarget):
         except socket.gaierror as exc:
             raise PySnmpError('Bad IPv6/UDP transport address %s: %s' % (
                 '@'.join([str(x) for x in transportAddr]), exc))
+
+
+class UnixTransportTarget(AbstractTransportTarget):
+    """Represent UNIX domain datagram socket transport endpoint.
+
+    This object can be used for passing local (UNIX domain socket)
+    configuration information to the
+    :py:class:`~pysnmp.hlapi.v3arch.asyncio.AsyncCommandGenerator` and
+    :py:class:`~pysnmp.hlapi.v3arch.asyncio.AsyncNotificationOriginator`
+    Datastore (LCD) managed by :py:class:`~pysnmp.hlapi.v3arch.SnmpEngine`
+    class instance.
+
+    Talking to SNMP agent running on the same host over UNIX domain
+    socket spares IP stack processing. When agent's receive buffer
+    is full, the kernel does not drop datagrams but refuses to send
+    more. The asyncio transport never blocks though - it keeps
+    unsent datagrams in its write buffer, which is not size-limited.
+
+    See :RFC:`3419#section-3` for more information on local transport
+    address format.
+
+    Parameters
+    ----------
+    transportAddr: str
+        Filesystem path to SNMP agent's UNIX domain socket.
+    timeout: int
+        Response timeout in seconds.
+    retries: int
+        Maximum number of request retries, 0 retries means just a single
+        request.
+    tagList: str
+        Arbitrary string that contains a list of tag values which are used
+        to select target addresses for a particular operation
+        (:RFC:`3413#section-4.1.4`).
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncio import UnixTransportTarget
+    >>> UnixTransportTarget('/var/run/snmpd.sock')
+    UnixTransportTarget('/var/run/snmpd.sock', timeout=1, retries=5, tagList='')
+    >>>
+    """
+    TRANSPORT_DOMAIN = unix.domainName
+    PROTO_TRANSPORT = unix.UnixAsyncioTransport
+
+    def _resolveAddr(self, transportAddr):
+        if unix.AF_UNIX is None:
+            raise PySnmpError(
+                'UNIX domain sockets not supported on this platform')
+
+        if not transportAddr:
+            raise PySnmpError(
+                'Bad UNIX domain transport address %r' % (transportAddr,))
+
+        return transportAddr
+
+
+class TcpTransportTarget(AbstractTransportTarget):
+    """Represent TCP/IPv4 transport endpoint.
+
+    This object can be used for passing TCP/IPv4 configuration
+    information to the
+    :py:class:`~pysnmp.hlapi.v3arch.asyncio.AsyncCommandGenerator` and
+    :py:class:`~pysnmp.hlapi.v3arch.asyncio.AsyncNotificationOriginator`
+    Datastore (LCD) managed by :py:class:`~pysnmp.hlapi.v3arch.SnmpEngine`
+    class instance.
+
+    SNMP messages go over persistent TCP connections, requests are
+    pipelined. Unlike UDP, TCP transport is not limited by datagram
+    size, so large responses do not get IP-fragmented. To actually
+    receive such responses, both sides should raise SNMP engine
+    message size limit (`maxMessageSize` parameter of
+    :py:class:`~pysnmp.hlapi.v3arch.SnmpEngine`).
+
+    See :RFC:`3430` for more information on the TCP transport mapping.
+
+    Parameters
+    ----------
+    transportAddr: tuple
+        Indicates remote address in Python :py:mod:`socket` module format
+        which is a tuple of FQDN, port where FQDN is a string representing
+        either hostname or IPv4 address in quad-dotted form, port is an
+        integer.
+    timeout: int
+        Response timeout in seconds.
+    retries: int
+        Maximum number of request retries, 0 retries means just a single
+        request.
+    tagList: str
+        Arbitrary string that contains a list of tag values which are used
+        to select target addresses for a particular operation
+        (:RFC:`3413#section-4.1.4`).
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncio import TcpTransportTarget
+    >>> TcpTransportTarget(('demo.snmplabs.com', 161))
+    TcpTransportTarget(('195.218.195.228', 161), timeout=1, retries=5, tagList='')
+    >>>
+    """
+    TRANSPORT_DOMAIN = tcp.domainName
+    PROTO_TRANSPORT = tcp.TcpAsyncioTransport
+
+    def __init__(self, *args, **kwargs):
+        AbstractTransportTarget.__init__(self, *args, **kwargs)
+        self.connectionPoolSize = None
+
+    def setConnectionPoolSize(self, size):
+        """Set the maximum number of connections to each SNMP agent.
+
+        Requests are pipelined over each connection, a new connection
+        is opened only when all existing ones await responses. Applies
+        to transports created for this target.
+
+        Parameters
+        ----------
+        size : int
+            Number of connections in the pool.
+
+        Returns
+        -------
+            self
+
+        """
+        if size < 1:
+            raise PySnmpError('Bad connection pool size %s' % size)
+
+        self.connectionPoolSize = size
+        return self
+
+    def openClientMode(self):
+        transport = AbstractTransportTarget.openClientMode(self)
+
+        if self.connectionPoolSize is not None:
+            transport.setPoolSize(self.connectionPoolSize)
+
+        return transport
+
+    def _resolveAddr(self, transportAddr):
+        try:
+            return socket.getaddrinfo(
+                transportAddr[0], transportAddr[1],
+                socket.AF_INET, socket.SOCK_STREAM,
+                socket.IPPROTO_TCP)[0][4][:2]
+
+        except socket.gaierror as exc:
+            raise PySnmpError('Bad IPv4/TCP transport address %s: %s' % (
+                '@'.join([str(x) for x in transportAddr]), exc))
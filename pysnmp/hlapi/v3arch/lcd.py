@@ -96,13 +96,15 @@ class CommandGeneratorLcdConfigurator(AbstractLcdConfigurator):
 
             cache['parm'][paramsKey] = paramsName, 1
 
-        if transportTarget.TRANSPORT_DOMAIN in cache['tran']:
-            transport, useCount = cache['tran'][transportTarget.TRANSPORT_DOMAIN]
+        transportDomain = transportTarget.getTransportDomain()
+
+        if transportDomain in cache['tran']:
+            transport, useCount = cache['tran'][transportDomain]
             transportTarget.verifyDispatcherCompatibility(snmpEngine)
 
-            cache['tran'][transportTarget.TRANSPORT_DOMAIN] = transport, useCount + 1
+            cache['tran'][transportDomain] = transport, useCount + 1
 
-        elif config.getTransport(snmpEngine, transportTarget.TRANSPORT_DOMAIN):
+        elif config.getTransport(snmpEngine, transportDomain):
             transportTarget.verifyDispatcherCompatibility(snmpEngine)
 
         else:
@@ -110,13 +112,13 @@ class CommandGeneratorLcdConfigurator(AbstractLcdConfigurator):
 
             config.addTransport(
                 snmpEngine,
-                transportTarget.TRANSPORT_DOMAIN,
+                transportDomain,
                 transport
             )
 
-            cache['tran'][transportTarget.TRANSPORT_DOMAIN] = transport, 1
+            cache['tran'][transportDomain] = transport, 1
 
-        transportKey = (paramsName, transportTarget.TRANSPORT_DOMAIN,
+        transportKey = (paramsName, transportDomain,
                         transportTarget.transportAddr,
                         transportTarget.timeout,
                         transportTarget.retries,
@@ -132,7 +134,7 @@ class CommandGeneratorLcdConfigurator(AbstractLcdConfigurator):
 
             config.addTargetAddr(
                 snmpEngine, addrName,
-                transportTarget.TRANSPORT_DOMAIN,
+                transportDomain,
                 transportTarget.transportAddr,
                 paramsName,
                 transportTarget.timeout * 100,
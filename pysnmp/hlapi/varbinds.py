@@ -4,6 +4,7 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+from pysnmp.proto.api import LazyVarBinds
 from pysnmp.smi import builder
 from pysnmp.smi import view
 from pysnmp.smi.rfc1902 import *
@@ -53,10 +54,16 @@ class CommandGeneratorVarBinds(MibViewControllerManager):
     def unmakeVarBinds(self, userCache, varBinds, lookupMib=True):
         if lookupMib:
             mibViewController = self.getMibViewController(userCache)
-            varBinds = [
-                ObjectType(ObjectIdentity(x[0]),
-                           x[1]).resolveWithMib(mibViewController)
-                for x in varBinds]
+
+            def unmakeVarBind(x):
+                return ObjectType(ObjectIdentity(x[0]),
+                                  x[1]).resolveWithMib(mibViewController)
+
+            # keep lazy var-bindings undecoded till accessed
+            if isinstance(varBinds, LazyVarBinds):
+                return varBinds.transform(unmakeVarBind)
+
+            varBinds = [unmakeVarBind(x) for x in varBinds]
 
         return varBinds
 
@@ -94,9 +101,15 @@ class NotificationOriginatorVarBinds(MibViewControllerManager):
     def unmakeVarBinds(self, userCache, varBinds, lookupMib=False):
         if lookupMib:
             mibViewController = self.getMibViewController(userCache)
-            varBinds = [
-                ObjectType(ObjectIdentity(x[0]),
-                           x[1]).resolveWithMib(mibViewController)
-                for x in varBinds]
+
+            def unmakeVarBind(x):
+                return ObjectType(ObjectIdentity(x[0]),
+                                  x[1]).resolveWithMib(mibViewController)
+
+            # keep lazy var-bindings undecoded till accessed
+            if isinstance(varBinds, LazyVarBinds):
+                return varBinds.transform(unmakeVarBind)
+
+            varBinds = [unmakeVarBind(x) for x in varBinds]
 
         return varBinds
@@ -0,0 +1,553 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Fast path BER decoder for SNMPv1/v2c messages.
+#
+# The generic pyasn1 decoder figures out what to do at every TLV of
+# the message. SNMPv1/v2c grammar is small and fixed, so here the
+# message spec is compiled once into a tree of closures keyed by the
+# one-octet BER tags they accept. Decoding then boils down to reading
+# tags and lengths and building the very same pyasn1 objects pyasn1
+# decoder would.
+#
+# Anything the compiled decoder does not expect (long-form tags,
+# indefinite lengths, constructed strings, trailing garbage, value
+# constraint violations etc.) hands the message over to pyasn1 decoder
+# which then either decodes it or raises the usual error.
+#
+# For chosen PDU types, var-bindings can be left BER-encoded in the
+# decoded PDU. They are then decoded one by one as the application
+# accesses them.
+#
+import copy
+
+from pyasn1.codec.ber import decoder
+from pyasn1.compat.integer import from_bytes
+from pyasn1.error import PyAsn1Error
+from pyasn1.type import univ
+
+from pysnmp import debug
+
+__all__ = ['decodeMessage', 'EncodedVarBindList', 'LazyVarBinds']
+
+_FLAGS = dict(verifyConstraints=False, matchTags=False, matchConstraints=False)
+
+_compiledSpecs = {}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class EncodedVarBindList(univ.Any):
+    """BER-encoded var-bindings kept in PDU in place of `VarBindList`.
+
+    Serializes back into the very same var-bindings. Use
+    :py:class:`LazyVarBinds` to access individual var-bindings.
+    """
+    tagSet = univ.SequenceOf.tagSet
+
+
+def _getTagOctet(tagSet):
+    if len(tagSet) != 1:
+        raise _Unsupported('explicitly tagged %r' % (tagSet,))
+
+    tag = tagSet[0]
+
+    if tag.tagId > 30:
+        raise _Unsupported('long tag form at %r' % (tagSet,))
+
+    return tag.tagClass | tag.tagFormat | tag.tagId
+
+
+def _getFactory(asn1Spec):
+    # calling spec class is cheaper than `clone()` as long as the
+    # spec carries nothing but class defaults
+    specType = asn1Spec.__class__
+
+    try:
+        if specType().readOnly == asn1Spec.readOnly:
+            return specType
+
+    except Exception:
+        pass
+
+    return asn1Spec.clone
+
+
+def _readLength(data, pos, end):
+    length = data[pos]
+    pos += 1
+
+    if length & 0x80:
+        octets = length & 0x7f
+
+        # indefinite length form is not allowed in SNMP
+        if not octets or octets > 4:
+            raise _Unsupported('length form %#x' % length)
+
+        length = 0
+
+        for octet in data[pos:pos + octets]:
+            length = length << 8 | octet
+
+        pos += octets
+
+    if pos + length > end:
+        raise _Unsupported('short substrate')
+
+    return pos, pos + length
+
+
+def _compileInteger(asn1Spec, lazyTags):
+    clone = _getFactory(asn1Spec)
+
+    def decodeInteger(data, wholeMsg, start, end):
+        return clone(from_bytes(wholeMsg[start:end], signed=True))
+
+    return decodeInteger
+
+
+def _compileOctetString(asn1Spec, lazyTags):
+    clone = _getFactory(asn1Spec)
+
+    def decodeOctetString(data, wholeMsg, start, end):
+        return clone(wholeMsg[start:end])
+
+    return decodeOctetString
+
+
+def _compileNull(asn1Spec, lazyTags):
+    clone = _getFactory(asn1Spec)
+
+    def decodeNull(data, wholeMsg, start, end):
+        if start != end:
+            raise _Unsupported('non-empty Null')
+
+        return clone('')
+
+    return decodeNull
+
+
+def _compileObjectIdentifier(asn1Spec, lazyTags):
+    clone = _getFactory(asn1Spec)
+
+    def decodeObjectIdentifier(data, wholeMsg, start, end):
+        if start == end:
+            raise _Unsupported('empty OID')
+
+        octets = data[start:end]
+
+        # most sub-OIDs fit one octet
+        if max(octets) < 0x80:
+            oid = list(octets)
+
+        else:
+            oid = []
+            subId = 0
+
+            for octet in octets:
+                if octet & 0x80:
+                    # leading 0x80 octet is prohibited
+                    if not subId and octet == 0x80:
+                        raise _Unsupported('0x80 in OID')
+
+                    subId = subId << 7 | octet & 0x7f
+
+                else:
+                    oid.append(subId << 7 | octet)
+                    subId = 0
+
+            if subId:
+                raise _Unsupported('short sub-OID')
+
+        first = oid[0]
+
+        if first < 40:
+            oid[0:1] = 0, first
+
+        elif first < 80:
+            oid[0:1] = 1, first - 40
+
+        else:
+            oid[0:1] = 2, first - 80
+
+        return clone(tuple(oid))
+
+    return decodeObjectIdentifier
+
+
+def _scanVarBinds(data, start, end):
+    offsets = []
+
+    pos = start
+
+    while pos < end:
+        if data[pos] != 0x30:
+            raise _Unsupported('var-binding tag %#x' % data[pos])
+
+        varBindStart = pos
+
+        pos = _readLength(data, pos + 1, end)[1]
+
+        offsets.append((varBindStart - start, pos - start))
+
+    return offsets
+
+
+def _compileEncodedVarBindList(asn1Spec):
+    def decodeEncodedVarBindList(data, wholeMsg, start, end):
+        # just make sure var-bindings are properly framed
+        _scanVarBinds(data, start, end)
+
+        return EncodedVarBindList(wholeMsg[start:end])
+
+    return {_getTagOctet(asn1Spec.tagSet): decodeEncodedVarBindList}
+
+
+def _compileSequence(asn1Spec, lazyTags):
+    namedTypes = asn1Spec.componentType
+
+    if namedTypes.hasOptionalOrDefault or namedTypes.hasOpenTypes:
+        raise _Unsupported('non-deterministic %r' % asn1Spec)
+
+    clone = _getFactory(asn1Spec)
+
+    lazyVarBinds = _getTagOctet(asn1Spec.tagSet) in lazyTags
+
+    componentDecoders = []
+
+    for namedType in namedTypes.namedTypes:
+        if lazyVarBinds and namedType.name == 'variable-bindings':
+            componentDecoders.append(
+                _compileEncodedVarBindList(namedType.asn1Object))
+
+        else:
+            componentDecoders.append(_compile(namedType.asn1Object, lazyTags))
+
+    componentDecoders = tuple(componentDecoders)
+
+    def decodeSequence(data, wholeMsg, start, end):
+        asn1Object = clone()
+
+        setComponentByPosition = asn1Object.setComponentByPosition
+
+        pos = start
+
+        for idx, tagMap in enumerate(componentDecoders):
+            if pos >= end:
+                raise _Unsupported('missing components')
+
+            decodeFun = tagMap[data[pos]]
+
+            pos, componentEnd = _readLength(data, pos + 1, end)
+
+            setComponentByPosition(
+                idx, decodeFun(data, wholeMsg, pos, componentEnd), **_FLAGS)
+
+            pos = componentEnd
+
+        if pos != end:
+            raise _Unsupported('excessive components')
+
+        return asn1Object
+
+    return decodeSequence
+
+
+def _compileSequenceOf(asn1Spec, lazyTags):
+    clone = _getFactory(asn1Spec)
+
+    tagMap = _compile(asn1Spec.componentType, lazyTags)
+
+    def decodeSequenceOf(data, wholeMsg, start, end):
+        asn1Object = clone()
+
+        setComponentByPosition = asn1Object.setComponentByPosition
+
+        pos = start
+        idx = 0
+
+        while pos < end:
+            decodeFun = tagMap[data[pos]]
+
+            pos, componentEnd = _readLength(data, pos + 1, end)
+
+            setComponentByPosition(
+                idx, decodeFun(data, wholeMsg, pos, componentEnd), **_FLAGS)
+
+            pos = componentEnd
+            idx += 1
+
+        if not idx:
+            # empty, yet a value
+            asn1Object.clear()
+
+        return asn1Object
+
+    return decodeSequenceOf
+
+
+def _wrapChoice(clone, idx, decodeFun):
+    def decodeChoice(data, wholeMsg, start, end):
+        asn1Object = clone()
+        asn1Object.setComponentByPosition(
+            idx, decodeFun(data, wholeMsg, start, end), **_FLAGS)
+        return asn1Object
+
+    return decodeChoice
+
+
+def _compileChoice(asn1Spec, lazyTags):
+    if asn1Spec.tagSet:
+        raise _Unsupported('tagged CHOICE %r' % asn1Spec)
+
+    tagMap = {}
+
+    for idx, namedType in enumerate(asn1Spec.componentType.namedTypes):
+        for tagOctet, decodeFun in _compile(
+                namedType.asn1Object, lazyTags).items():
+            if tagOctet in tagMap:
+                raise _Unsupported('ambiguous CHOICE %r' % asn1Spec)
+
+            tagMap[tagOctet] = _wrapChoice(_getFactory(asn1Spec), idx, decodeFun)
+
+    return tagMap
+
+
+_COMPILERS = (
+    (univ.Sequence.typeId, _compileSequence),
+    (univ.SequenceOf.typeId, _compileSequenceOf),
+    (univ.Integer.typeId, _compileInteger),
+    (univ.OctetString.typeId, _compileOctetString),
+    (univ.Null.typeId, _compileNull),
+    (univ.ObjectIdentifier.typeId, _compileObjectIdentifier),
+)
+
+
+def _compile(asn1Spec, lazyTags):
+    """Return BER tag octet to content decoder mapping for `asn1Spec`"""
+    if asn1Spec.typeId == univ.Choice.typeId:
+        return _compileChoice(asn1Spec, lazyTags)
+
+    for typeId, compileFun in _COMPILERS:
+        if asn1Spec.typeId == typeId:
+            return {_getTagOctet(asn1Spec.tagSet): compileFun(asn1Spec, lazyTags)}
+
+    raise _Unsupported('type %r' % asn1Spec)
+
+
+def _getDecoder(asn1Spec, lazyPduTypes):
+    specType = asn1Spec.__class__
+
+    try:
+        return _compiledSpecs[(specType, lazyPduTypes)]
+
+    except KeyError:
+        pass
+
+    try:
+        lazyTags = frozenset(
+            [_getTagOctet(pduType) for pduType in lazyPduTypes])
+
+        tagMap = _compile(asn1Spec, lazyTags)
+
+    except _Unsupported as exc:
+        debug.logger & debug.FLAG_MP and debug.logger(
+            '_getDecoder: no fast path for %s: %s' % (specType.__name__, exc))
+
+        tagMap = None
+
+    _compiledSpecs[(specType, lazyPduTypes)] = tagMap
+
+    return tagMap
+
+
+def decodeMessage(wholeMsg, asn1Spec, lazyPduTypes=frozenset()):
+    """Decode BER-encoded SNMPv1/v2c message.
+
+    Same as `decoder.decode(wholeMsg, asn1Spec=asn1Spec)`, only faster
+    for well-formed messages. Unusual encodings are left to pyasn1
+    decoder.
+
+    Var-bindings of PDUs listed in `lazyPduTypes` are not decoded,
+    but kept as :py:class:`EncodedVarBindList` instead. Messages
+    decoded by pyasn1 always carry decoded var-bindings.
+
+    Parameters
+    ----------
+    wholeMsg: :py:class:`bytes`
+        Serialized SNMP message, possibly followed by more messages
+    asn1Spec:
+        SNMP message pyasn1 spec e.g.
+        :py:class:`~pysnmp.proto.api.v2c.Message` instance
+    lazyPduTypes: :py:class:`frozenset`
+        Tag sets of PDUs to leave var-bindings encoded in e.g.
+        `frozenset([v2c.SNMPv2TrapPDU.tagSet])`
+
+    Returns
+    -------
+    : :py:class:`tuple`
+        Decoded SNMP message object and the rest of `wholeMsg`
+    """
+    tagMap = _getDecoder(asn1Spec, lazyPduTypes)
+
+    if tagMap is not None:
+        # bytes index to str on Python 2
+        data = isinstance(wholeMsg, bytes) and bytes is not str and wholeMsg or bytearray(wholeMsg)
+
+        try:
+            decodeFun = tagMap[data[0]]
+
+            start, end = _readLength(data, 1, len(data))
+
+            return decodeFun(data, wholeMsg, start, end), wholeMsg[end:]
+
+        except Exception as exc:
+            debug.logger & debug.FLAG_MP and debug.logger(
+                'decodeMessage: fast path failed (%s), falling back to '
+                'pyasn1' % (exc.__class__.__name__,))
+
+    return decoder.decode(wholeMsg, asn1Spec=asn1Spec)
+
+
+class LazyVarBinds(object):
+    """Sequence of var-bindings decoded on first access.
+
+    Mimics the list of `(oid, value)` tuples returned by the
+    `getVarBinds` PDU API call. Only var-binding offsets are recorded
+    upfront, each var-binding gets BER-decoded the first time it is
+    accessed. Var-bindings can be replaced, though not added or removed.
+    Comparing or concatenating with a list decodes all var-bindings,
+    concatenation yields a list.
+
+    Parameters
+    ----------
+    varBindList: :py:class:`EncodedVarBindList`
+        BER-encoded var-bindings
+    varBindSpec:
+        Var-binding pyasn1 spec e.g.
+        :py:class:`~pysnmp.proto.api.v2c.VarBind` instance
+
+    Attributes
+    ----------
+    varBindList: :py:class:`EncodedVarBindList`
+        BER-encoded var-bindings this sequence has been built from or
+        `None` once any var-binding has been replaced
+
+    Raises
+    ------
+    PyAsn1Error
+        On var-binding access, if var-binding can not be decoded
+    """
+    def __init__(self, varBindList, varBindSpec):
+        self.varBindList = varBindList
+        self._varBindSpec = varBindSpec
+        self._substrate = varBindList.asOctets()
+
+        # bytes index to str on Python 2
+        data = bytes is not str and self._substrate or bytearray(self._substrate)
+
+        try:
+            self._offsets = _scanVarBinds(data, 0, len(data))
+
+        except (_Unsupported, IndexError):
+            raise PyAsn1Error('Malformed var-bindings')
+
+        self._varBinds = [None] * len(self._offsets)
+        self._getVarBind = self._decodeVarBind
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[x] for x in range(*idx.indices(len(self)))]
+
+        varBind = self._varBinds[idx]
+
+        if varBind is None:
+            varBind = self._varBinds[idx] = self._getVarBind(idx)
+
+        return varBind
+
+    def __setitem__(self, idx, varBind):
+        if isinstance(idx, slice):
+            indices = range(*idx.indices(len(self)))
+            varBinds = list(varBind)
+
+            if len(indices) != len(varBinds):
+                raise ValueError('Var-bindings can not be added or removed')
+
+            for x, varBind in zip(indices, varBinds):
+                self._varBinds[x] = varBind
+
+        else:
+            self._varBinds[idx] = varBind
+
+        # encoded var-bindings are stale now
+        self.varBindList = None
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, LazyVarBinds)):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        if not isinstance(other, (list, LazyVarBinds)):
+            return NotImplemented
+
+        return list(self) != list(other)
+
+    __hash__ = None
+
+    def __add__(self, other):
+        if not isinstance(other, (list, LazyVarBinds)):
+            return NotImplemented
+
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, (list, LazyVarBinds)):
+            return NotImplemented
+
+        return list(other) + list(self)
+
+    def _decodeVarBind(self, idx):
+        start, end = self._offsets[idx]
+
+        varBind = decodeMessage(self._substrate[start:end], self._varBindSpec)[0]
+
+        return varBind[0], varBind[1].getComponent(1)
+
+    def transform(self, transformFun):
+        """Return lazy var-bindings passed through `transformFun`.
+
+        Parameters
+        ----------
+        transformFun: :py:class:`callable`
+            Callable taking `(oid, value)` tuple, its return value
+            replaces var-binding on first access
+
+        Returns
+        -------
+        : :py:class:`LazyVarBinds`
+            New lazy sequence sharing var-bindings with this one
+        """
+        lazyVarBinds = copy.copy(self)
+
+        lazyVarBinds._varBinds = [None] * len(self)
+        lazyVarBinds._getVarBind = lambda idx: transformFun(self[idx])
+
+        return lazyVarBinds
@@ -0,0 +1,153 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Pre-encoded SNMP requests.
+#
+# Periodic pollers keep sending the same PDU over and over with only
+# request-id changing. Here the PDU gets BER-encoded just once, then
+# every new message is assembled from the pre-encoded pieces, freshly
+# encoded request-id and message/PDU headers.
+#
+from pyasn1.codec.ber import encoder
+from pyasn1.type import univ
+
+from pysnmp.proto import error
+from pysnmp.proto import rfc1157
+
+__all__ = ['RequestTemplate']
+
+
+def _encodeLength(length):
+    if length < 0x80:
+        return bytearray((length,))
+
+    octets = bytearray()
+
+    while length:
+        octets.insert(0, length & 0xff)
+        length >>= 8
+
+    octets.insert(0, 0x80 | len(octets))
+
+    return octets
+
+
+def _encodeInteger(value):
+    octets = bytearray()
+
+    while True:
+        octets.insert(0, value & 0xff)
+
+        if -0x80 <= value <= 0x7f:
+            break
+
+        value >>= 8
+
+    return bytearray((0x02, len(octets))) + octets
+
+
+class RequestTemplate(object):
+    """Pre-encoded SNMP request PDU.
+
+    Once created, `RequestTemplate` can be passed in place of the PDU
+    to `sendPdu` method of `hlapi.v1arch` dispatcher or SNMP engine
+    message and PDU dispatcher. For every new SNMPv1/v2c message only
+    request-id is encoded, the rest of the PDU is copied from the
+    template. SNMPv3 messages are built from the PDU as usual.
+
+    Changing `pdu` after template creation has no effect on outgoing
+    messages.
+
+    Parameters
+    ----------
+    pdu:
+        SNMP PDU having request-id at its first position e.g.
+        :py:class:`~pysnmp.proto.api.v2c.GetRequestPDU` instance
+
+    Attributes
+    ----------
+    pdu:
+        The PDU this template has been built from
+
+    Examples
+    --------
+    >>> reqPdu = v2c.GetRequestPDU()
+    >>> v2c.apiPDU.setDefaults(reqPdu)
+    >>> v2c.apiPDU.setVarBinds(reqPdu, [('1.3.6.1.2.1.1.3.0', v2c.null)])
+    >>> template = RequestTemplate(reqPdu)
+    >>> template.encodeMessage(123, 1, 'public')
+    b'0&\\x02\\x01\\x01\\x04\\x06public\\xa0\\x19\\x02\\x01{\\x02\\x01\\x00...'
+    """
+    def __init__(self, pdu):
+        # SNMPv1 trap PDU begins with enterprise OID
+        if pdu.tagSet == rfc1157.TrapPDU.tagSet or len(pdu.tagSet) != 1:
+            raise error.ProtocolError(
+                'Request-id not found in %s' % pdu.__class__.__name__)
+
+        tag = pdu.tagSet[0]
+
+        self.pdu = pdu
+
+        self._pduTag = bytearray((tag.tagClass | tag.tagFormat | tag.tagId,))
+
+        self._pduTail = bytearray()
+
+        for idx in range(1, len(pdu)):
+            self._pduTail += encoder.encode(pdu.getComponentByPosition(idx))
+
+        self._headers = {}
+
+    def __repr__(self):
+        return '%s(pdu=%r)' % (self.__class__.__name__, self.pdu)
+
+    def encodePdu(self, requestId):
+        """Serialize PDU with given request-id.
+
+        Parameters
+        ----------
+        requestId: :py:class:`int`
+            Request-id to put into PDU
+
+        Returns
+        -------
+        : :py:class:`bytearray`
+            BER-encoded PDU
+        """
+        requestId = _encodeInteger(int(requestId))
+
+        return (self._pduTag +
+                _encodeLength(len(requestId) + len(self._pduTail)) +
+                requestId + self._pduTail)
+
+    def encodeMessage(self, requestId, version, communityName):
+        """Serialize SNMPv1/v2c message carrying PDU with given request-id.
+
+        Parameters
+        ----------
+        requestId: :py:class:`int`
+            Request-id to put into PDU
+        version: :py:class:`int`
+            SNMP message version, 0 for SNMPv1, 1 for SNMPv2c
+        communityName: :py:class:`bytes`
+            SNMP community name
+
+        Returns
+        -------
+        : :py:class:`bytes`
+            BER-encoded SNMP message
+        """
+        try:
+            header = self._headers[(version, communityName)]
+
+        except KeyError:
+            header = self._headers[(version, communityName)] = (
+                encoder.encode(univ.Integer(version)) +
+                encoder.encode(univ.OctetString(communityName)))
+
+        pdu = self.encodePdu(requestId)
+
+        return bytes(bytearray((0x30,)) +
+                     _encodeLength(len(header) + len(pdu)) + header + pdu)
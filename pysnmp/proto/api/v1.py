@@ -10,6 +10,7 @@ from pysnmp import nextid
 from pysnmp.proto import error
 from pysnmp.proto import rfc1155
 from pysnmp.proto import rfc1157
+from pysnmp.proto.api import msgdec
 
 # Shortcuts to SNMP types
 Integer = univ.Integer
@@ -104,12 +105,20 @@ class PDUAPI(object):
     def getErrorIndex(pdu, muteErrors=False):
         errorIndex = pdu.getComponentByPosition(2)
 
-        if errorIndex > len(pdu[3]):
+        varBindList = pdu.getComponentByPosition(3)
+
+        if isinstance(varBindList, msgdec.EncodedVarBindList):
+            varBindsCount = len(PDUAPI.getVarBinds(pdu))
+
+        else:
+            varBindsCount = len(varBindList)
+
+        if errorIndex > varBindsCount:
             if muteErrors:
-                return errorIndex.clone(len(pdu[3]))
+                return errorIndex.clone(varBindsCount)
 
             raise error.ProtocolError(
-                'Error index out of range: %s > %s' % (errorIndex, len(pdu[3])))
+                'Error index out of range: %s > %s' % (errorIndex, varBindsCount))
 
         return errorIndex
 
@@ -126,7 +135,15 @@ class PDUAPI(object):
 
     @staticmethod
     def getVarBindList(pdu):
-        return pdu.getComponentByPosition(3)
+        varBindList = pdu.getComponentByPosition(3)
+
+        if isinstance(varBindList, msgdec.EncodedVarBindList):
+            # var-bindings left BER-encoded get decoded for good
+            PDUAPI.setVarBinds(pdu, list(PDUAPI.getVarBinds(pdu)))
+
+            varBindList = pdu.getComponentByPosition(3)
+
+        return varBindList
 
     @staticmethod
     def setVarBindList(pdu, varBindList):
@@ -134,11 +151,23 @@ class PDUAPI(object):
 
     @staticmethod
     def getVarBinds(pdu):
-        return [apiVarBind.getOIDVal(varBind)
-                for varBind in pdu.getComponentByPosition(3)]
+        varBindList = pdu.getComponentByPosition(3)
+
+        if isinstance(varBindList, msgdec.EncodedVarBindList):
+            return msgdec.LazyVarBinds(
+                varBindList, pdu.componentType[3].asn1Object.componentType)
+
+        return [apiVarBind.getOIDVal(varBind) for varBind in varBindList]
 
     @staticmethod
     def setVarBinds(pdu, varBinds):
+        if (isinstance(varBinds, msgdec.LazyVarBinds) and
+                varBinds.varBindList is not None):
+            pdu.setComponentByPosition(
+                3, varBinds.varBindList, verifyConstraints=False,
+                matchTags=False, matchConstraints=False)
+            return
+
         varBindList = pdu.setComponentByPosition(3).getComponentByPosition(3)
 
         varBindList.clear()
@@ -266,7 +295,15 @@ class TrapPDUAPI(object):
 
     @staticmethod
     def getVarBindList(pdu):
-        return pdu.getComponentByPosition(5)
+        varBindList = pdu.getComponentByPosition(5)
+
+        if isinstance(varBindList, msgdec.EncodedVarBindList):
+            # var-bindings left BER-encoded get decoded for good
+            TrapPDUAPI.setVarBinds(pdu, list(TrapPDUAPI.getVarBinds(pdu)))
+
+            varBindList = pdu.getComponentByPosition(5)
+
+        return varBindList
 
     @staticmethod
     def setVarBindList(pdu, varBindList):
@@ -274,11 +311,23 @@ class TrapPDUAPI(object):
 
     @staticmethod
     def getVarBinds(pdu):
-        return [apiVarBind.getOIDVal(varBind)
-                for varBind in pdu.getComponentByPosition(5)]
+        varBindList = pdu.getComponentByPosition(5)
+
+        if isinstance(varBindList, msgdec.EncodedVarBindList):
+            return msgdec.LazyVarBinds(
+                varBindList, pdu.componentType[5].asn1Object.componentType)
+
+        return [apiVarBind.getOIDVal(varBind) for varBind in varBindList]
 
     @staticmethod
     def setVarBinds(pdu, varBinds):
+        if (isinstance(varBinds, msgdec.LazyVarBinds) and
+                varBinds.varBindList is not None):
+            pdu.setComponentByPosition(
+                5, varBinds.varBindList, verifyConstraints=False,
+                matchTags=False, matchConstraints=False)
+            return
+
         varBindList = pdu.setComponentByPosition(5).getComponentByPosition(5)
 
         varBindList.clear()
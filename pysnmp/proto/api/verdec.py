@@ -6,13 +6,157 @@
 #
 from pyasn1.codec.ber import decoder
 from pyasn1.codec.ber import eoo
+from pyasn1.compat.integer import from_bytes
 from pyasn1.error import PyAsn1Error
 from pyasn1.type import univ
 
 from pysnmp.proto.error import ProtocolError
 
+_MAX_INTEGER = 2147483647
+
+
+def _readTlv(data, pos, end, tagOctet):
+    """Return contents boundaries of the BER TLV at `pos`"""
+    if pos + 2 > end:
+        raise ProtocolError('Short substrate at %d' % pos)
+
+    if data[pos] != tagOctet:
+        raise ProtocolError(
+            'Unexpected tag %#x at %d, expected %#x' % (data[pos], pos, tagOctet))
+
+    length = data[pos + 1]
+    pos += 2
+
+    if length & 0x80:
+        octets = length & 0x7f
+
+        # indefinite length form is not allowed in SNMP
+        if not octets or octets > 4:
+            raise ProtocolError('Unsupported length form %#x' % length)
+
+        if pos + octets > end:
+            raise ProtocolError('Short substrate at %d' % pos)
+
+        length = 0
+
+        for octet in data[pos:pos + octets]:
+            length = length << 8 | octet
+
+        pos += octets
+
+    if pos + length > end:
+        raise ProtocolError('Short substrate at %d' % pos)
+
+    return pos, pos + length
+
+
+def _readInteger(data, wholeMsg, pos, end, minValue=0, maxValue=_MAX_INTEGER):
+    start, pos = _readTlv(data, pos, end, 0x02)
+
+    if start == pos:
+        raise ProtocolError('Empty INTEGER at %d' % start)
+
+    value = from_bytes(wholeMsg[start:pos], signed=True)
+
+    if not minValue <= value <= maxValue:
+        raise ProtocolError('INTEGER %s out of range at %d' % (value, start))
+
+    return value, pos
+
+
+def _scanMessageVersion(data, wholeMsg):
+    msgStart, msgEnd = _readTlv(data, 0, len(data), 0x30)
+
+    version, pos = _readInteger(data, wholeMsg, msgStart, msgEnd)
+
+    return version, pos, msgEnd
+
+
+def decodeMessageHeader(wholeMsg):
+    """Scan SNMP message header without decoding the whole message.
+
+    Unlike generic BER decoder, header scanner does not build any
+    pyasn1 objects. It only handles definite-length, short-form tags
+    encodings SNMP entities normally produce.
+
+    Parameters
+    ----------
+    wholeMsg: :py:class:`bytes`
+        Serialized SNMP message, possibly followed by more messages
+
+    Returns
+    -------
+    : :py:class:`dict`
+        SNMP message header fields. Always present are `msgVersion`
+        and `msgEnd` (offset right past the message). For SNMPv3
+        message, `msgID`, `msgMaxSize`, `msgFlags` and
+        `msgSecurityModel` integers are reported as well as
+        `msgSecurityParameters` (OCTET STRING contents) and `msgData`
+        (whole TLV) :py:class:`slice` objects.
+
+    Raises
+    ------
+    ProtocolError
+        If message header can not be scanned
+    """
+    # bytes index to str on Python 2
+    data = isinstance(wholeMsg, bytes) and bytes is not str and wholeMsg or bytearray(wholeMsg)
+
+    msgVersion, pos, msgEnd = _scanMessageVersion(data, wholeMsg)
+
+    msgHeader = dict(msgVersion=msgVersion, msgEnd=msgEnd)
+
+    if msgVersion != 3:
+        return msgHeader
+
+    # msgGlobalData
+    pos, headerEnd = _readTlv(data, pos, msgEnd, 0x30)
+
+    msgHeader['msgID'], pos = _readInteger(data, wholeMsg, pos, headerEnd)
+
+    msgHeader['msgMaxSize'], pos = _readInteger(
+        data, wholeMsg, pos, headerEnd, minValue=484)
+
+    start, pos = _readTlv(data, pos, headerEnd, 0x04)
+
+    if pos - start != 1:
+        raise ProtocolError('Bad msgFlags size at %d' % start)
+
+    msgHeader['msgFlags'] = data[start]
+
+    msgHeader['msgSecurityModel'], pos = _readInteger(
+        data, wholeMsg, pos, headerEnd, minValue=3)
+
+    if pos != headerEnd:
+        raise ProtocolError('Trailing data in msgGlobalData at %d' % pos)
+
+    start, pos = _readTlv(data, pos, msgEnd, 0x04)
+
+    msgHeader['msgSecurityParameters'] = slice(start, pos)
+
+    if pos >= msgEnd or data[pos] not in (0x30, 0x04):
+        raise ProtocolError('Unexpected msgData at %d' % pos)
+
+    start, pos = pos, _readTlv(data, pos, msgEnd, data[pos])[1]
+
+    if pos != msgEnd:
+        raise ProtocolError('Trailing data in message at %d' % pos)
+
+    msgHeader['msgData'] = slice(start, pos)
+
+    return msgHeader
+
 
 def decodeMessageVersion(wholeMsg):
+    # bytes index to str on Python 2
+    data = isinstance(wholeMsg, bytes) and bytes is not str and wholeMsg or bytearray(wholeMsg)
+
+    try:
+        return univ.Integer(_scanMessageVersion(data, wholeMsg)[0])
+
+    except ProtocolError:
+        pass  # leave unusual encodings to pyasn1
+
     try:
         seq, wholeMsg = decoder.decode(
             wholeMsg, asn1Spec=univ.Sequence(),
@@ -4,15 +4,29 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+from heapq import heappop
+from heapq import heappush
+
 from pysnmp.proto import error
 
 
 class Cache(object):
     def __init__(self):
         self._cacheRepository = {}
+        # Entries expiration heap of (expireAt, index)
+        self._expirationQueue = []
+        self._expireAt = {}
 
-    def add(self, index, **kwargs):
+    def add(self, index, expireAt=None, **kwargs):
         self._cacheRepository[index] = kwargs
+
+        if expireAt is None:
+            self._expireAt.pop(index, None)
+
+        else:
+            self._expireAt[index] = expireAt
+            heappush(self._expirationQueue, (expireAt, index))
+
         return index
 
     def pop(self, index):
@@ -21,6 +35,7 @@ class Cache(object):
         else:
             return
         del self._cacheRepository[index]
+        self._expireAt.pop(index, None)
         return cachedParams
 
     def update(self, index, **kwargs):
@@ -30,9 +45,51 @@ class Cache(object):
             )
         self._cacheRepository[index].update(kwargs)
 
-    def expire(self, cbFun, cbCtx):
-        for index, cachedParams in list(self._cacheRepository.items()):
-            if cbFun:
-                if cbFun(index, cachedParams, cbCtx):
-                    if index in self._cacheRepository:
-                        del self._cacheRepository[index]
+    def expire(self, cbFun, cbCtx, timeNow=None):
+        """Offer entries due by `timeNow` to `cbFun` for expiration.
+
+        Only the entries whose expiration time has come are visited.
+        Entries that `cbFun` declines to expire are offered again on
+        the next call. If `timeNow` is not given, all entries are
+        offered to `cbFun`.
+        """
+        if timeNow is None:
+            for index, cachedParams in list(self._cacheRepository.items()):
+                if cbFun and cbFun(index, cachedParams, cbCtx):
+                    self.pop(index)
+
+            return
+
+        expirationQueue = self._expirationQueue
+
+        postponed = []
+
+        while expirationQueue and expirationQueue[0][0] <= timeNow:
+            expireAt, index = heappop(expirationQueue)
+
+            # skip entries popped or re-scheduled since
+            if self._expireAt.get(index) != expireAt:
+                continue
+
+            if cbFun and cbFun(index, self._cacheRepository[index], cbCtx):
+                self.pop(index)
+
+            elif index in self._cacheRepository:
+                postponed.append((expireAt, index))
+
+        for entry in postponed:
+            heappush(expirationQueue, entry)
+
+    def getNextExpiration(self):
+        """Return the earliest expiration time or `None`"""
+        expirationQueue = self._expirationQueue
+
+        while (expirationQueue and
+               self._expireAt.get(expirationQueue[0][1]) != expirationQueue[0][0]):
+            heappop(expirationQueue)
+
+        if expirationQueue:
+            return expirationQueue[0][0]
+
+    def __len__(self):
+        return len(self._cacheRepository)
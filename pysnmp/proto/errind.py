@@ -161,6 +161,14 @@ invalidMsg = InvalidMsg(
     'Invalid SNMP message header parameters encountered')
 
 
+class TransportBusy(ErrorIndication):
+    pass
+
+
+transportBusy = TransportBusy(
+    'Transport outbound queue is full')
+
+
 # SNMP security modules errors
 
 class UnknownCommunityName(ErrorIndication):
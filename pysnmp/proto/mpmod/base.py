@@ -44,4 +44,8 @@ class AbstractMessageProcessingModel(object):
             pass  # XXX maybe these should all follow some scheme?
 
     def receiveTimerTick(self, snmpEngine, timeNow):
-        self._cache.expireCaches()
+        """Deprecated, cached messages expire by `snmpEngine.scheduler`.
+
+        SNMP engine keeps calling this method on every timer tick for
+        subclasses which override it.
+        """
@@ -12,36 +12,33 @@ class Cache(object):
     __stateReference = nextid.Integer(0xffffff)
     __msgID = nextid.Integer(0xffffff)
 
+    # Pending messages lifetime (in timer ticks)
+    EXPIRATION_TIMEOUT = 600
+
     def __init__(self):
         self.__msgIdIndex = {}
         self.__stateReferenceIndex = {}
         self.__sendPduHandleIdx = {}
-        # Message expiration mechanics
-        self.__expirationQueue = {}
-        self.__expirationTimer = 0
 
     # Server mode cache handling
 
     def newStateReference(self):
         return self.__stateReference()
 
-    def pushByStateRef(self, stateReference, **msgInfo):
+    def pushByStateRef(self, stateReference, scheduler=None, **msgInfo):
         if stateReference in self.__stateReferenceIndex:
             raise error.ProtocolError(
                 'Cache dup for stateReference=%s at %s' % (stateReference, self))
 
-        expireAt = self.__expirationTimer + 600
-
-        self.__stateReferenceIndex[stateReference] = msgInfo, expireAt
-
         # Schedule to expire
-        if expireAt not in self.__expirationQueue:
-            self.__expirationQueue[expireAt] = {}
+        if scheduler is None:
+            timer = None
 
-        if 'stateReference' not in self.__expirationQueue[expireAt]:
-            self.__expirationQueue[expireAt]['stateReference'] = {}
+        else:
+            timer = scheduler.callLater(
+                self.EXPIRATION_TIMEOUT, self.__expireByStateRef, stateReference)
 
-        self.__expirationQueue[expireAt]['stateReference'][stateReference] = 1
+        self.__stateReferenceIndex[stateReference] = msgInfo, timer
 
     def popByStateRef(self, stateReference):
         if stateReference in self.__stateReferenceIndex:
@@ -54,36 +51,37 @@ class Cache(object):
 
         del self.__stateReferenceIndex[stateReference]
 
-        cacheEntry, expireAt = cacheInfo
+        cacheEntry, timer = cacheInfo
 
-        del self.__expirationQueue[expireAt]['stateReference'][stateReference]
+        if timer is not None:
+            timer.cancel()
 
         return cacheEntry
 
+    def __expireByStateRef(self, stateReference):
+        self.__stateReferenceIndex.pop(stateReference, None)
+
     # Client mode cache handling
 
     def newMsgID(self):
         return self.__msgID()
 
-    def pushByMsgId(self, msgId, **msgInfo):
+    def pushByMsgId(self, msgId, scheduler=None, **msgInfo):
         if msgId in self.__msgIdIndex:
             raise error.ProtocolError(
                 'Cache dup for msgId=%s at %s' % (msgId, self))
 
-        expireAt = self.__expirationTimer + 600
-
-        self.__msgIdIndex[msgId] = msgInfo, expireAt
-
-        self.__sendPduHandleIdx[msgInfo['sendPduHandle']] = msgId
-
         # Schedule to expire
-        if expireAt not in self.__expirationQueue:
-            self.__expirationQueue[expireAt] = {}
+        if scheduler is None:
+            timer = None
 
-        if 'msgId' not in self.__expirationQueue[expireAt]:
-            self.__expirationQueue[expireAt]['msgId'] = {}
+        else:
+            timer = scheduler.callLater(
+                self.EXPIRATION_TIMEOUT, self.__expireByMsgId, msgId)
+
+        self.__msgIdIndex[msgId] = msgInfo, timer
 
-        self.__expirationQueue[expireAt]['msgId'][msgId] = 1
+        self.__sendPduHandleIdx[msgInfo['sendPduHandle']] = msgId
 
     def popByMsgId(self, msgId):
         if msgId in self.__msgIdIndex:
@@ -93,34 +91,24 @@ class Cache(object):
             raise error.ProtocolError(
                 'Cache miss for msgId=%s at %s' % (msgId, self))
 
-        msgInfo, expireAt = cacheInfo
+        msgInfo, timer = cacheInfo
 
         del self.__sendPduHandleIdx[msgInfo['sendPduHandle']]
         del self.__msgIdIndex[msgId]
 
-        cacheEntry, expireAt = cacheInfo
-
-        del self.__expirationQueue[expireAt]['msgId'][msgId]
+        if timer is not None:
+            timer.cancel()
 
-        return cacheEntry
+        return msgInfo
 
     def popBySendPduHandle(self, sendPduHandle):
         if sendPduHandle in self.__sendPduHandleIdx:
             self.popByMsgId(self.__sendPduHandleIdx[sendPduHandle])
 
     def expireCaches(self):
-        # Uses internal clock to expire pending messages
-        if self.__expirationTimer in self.__expirationQueue:
-            cacheInfo = self.__expirationQueue[self.__expirationTimer]
-
-            if 'stateReference' in cacheInfo:
-                for stateReference in cacheInfo['stateReference']:
-                    del self.__stateReferenceIndex[stateReference]
-
-            if 'msgId' in cacheInfo:
-                for msgId in cacheInfo['msgId']:
-                    del self.__msgIdIndex[msgId]
-
-            del self.__expirationQueue[self.__expirationTimer]
+        """Deprecated, cached messages expire by SNMP engine scheduler"""
 
-        self.__expirationTimer += 1
+    def __expireByMsgId(self, msgId):
+        cacheInfo = self.__msgIdIndex.pop(msgId, None)
+        if cacheInfo is not None:
+            self.__sendPduHandleIdx.pop(cacheInfo[0]['sendPduHandle'], None)
@@ -13,6 +13,8 @@ from pysnmp import debug
 from pysnmp.proto import errind
 from pysnmp.proto import error
 from pysnmp.proto import rfc3411
+from pysnmp.proto.api import msgdec
+from pysnmp.proto.api import msgenc
 from pysnmp.proto.api import v1
 from pysnmp.proto.api import v2c
 from pysnmp.proto.mpmod.base import AbstractMessageProcessingModel
@@ -26,6 +28,9 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
     MESSAGE_PROCESSING_MODEL_ID = univ.Integer(0)  # SNMPv1
     SNMP_MSG_SPEC = v1.Message
 
+    # decode well-formed messages bypassing generic BER decoder
+    FAST_DECODING = True
+
     # rfc3412: 7.1
     def prepareOutgoingMessage(self, snmpEngine, transportDomain,
                                transportAddress, messageProcessingModel,
@@ -39,6 +44,13 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
             '__SNMP-FRAMEWORK-MIB', 'snmpEngineID')
         snmpEngineId = snmpEngineId.syntax
 
+        # pre-encoded PDU gets serialized by security model
+        if isinstance(pdu, msgenc.RequestTemplate):
+            template, pdu = pdu, pdu.pdu
+
+        else:
+            template = None
+
         # rfc3412: 7.1.1b
         if pdu.tagSet in rfc3411.CONFIRMED_CLASS_PDUS:
             # serve unique PDU request-id
@@ -64,7 +76,7 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
             '%r' % (contextEngineId, contextName))
 
         # rfc3412: 7.1.6
-        scopedPDU = contextEngineId, contextName, pdu
+        scopedPDU = contextEngineId, contextName, template or pdu
 
         msg = self._snmpMsgSpec
 
@@ -110,7 +122,8 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
         if pdu.tagSet in rfc3411.CONFIRMED_CLASS_PDUS:
             # XXX rfc bug? why stateReference should be created?
             self._cache.pushByMsgId(
-                int(msgID), sendPduHandle=sendPduHandle,
+                int(msgID), scheduler=snmpEngine.scheduler,
+                sendPduHandle=sendPduHandle,
                 reqID=reqID, snmpEngineId=snmpEngineId,
                 securityModel=securityModel,
                 securityName=securityName,
@@ -122,21 +135,22 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
 
         communityName = msg.getComponentByPosition(1)  # for observer
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc2576.prepareOutgoingMessage',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 wholeMsg=wholeMsg,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 communityName=communityName,
-                 pdu=pdu))
-
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc2576.prepareOutgoingMessage')
+        if snmpEngine.observer.isObserved('rfc2576.prepareOutgoingMessage'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc2576.prepareOutgoingMessage',
+                dict(transportDomain=transportDomain,
+                     transportAddress=transportAddress,
+                     wholeMsg=wholeMsg,
+                     securityModel=securityModel,
+                     securityName=securityName,
+                     securityLevel=securityLevel,
+                     contextEngineId=contextEngineId,
+                     contextName=contextName,
+                     communityName=communityName,
+                     pdu=pdu))
+
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc2576.prepareOutgoingMessage')
 
         return transportDomain, transportAddress, wholeMsg
 
@@ -232,21 +246,22 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
         # recover unique request-id right after PDU serialization
         pdu.setComponentByPosition(0, msgID)
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc2576.prepareResponseMessage',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 securityEngineId=snmpEngineId,
-                 communityName=msg.getComponentByPosition(1),
-                 pdu=pdu))
-
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc2576.prepareResponseMessage')
+        if snmpEngine.observer.isObserved('rfc2576.prepareResponseMessage'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc2576.prepareResponseMessage',
+                dict(transportDomain=transportDomain,
+                     transportAddress=transportAddress,
+                     securityModel=securityModel,
+                     securityName=securityName,
+                     securityLevel=securityLevel,
+                     contextEngineId=contextEngineId,
+                     contextName=contextName,
+                     securityEngineId=snmpEngineId,
+                     communityName=msg.getComponentByPosition(1),
+                     pdu=pdu))
+
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc2576.prepareResponseMessage')
 
         return transportDomain, transportAddress, wholeMsg
 
@@ -258,7 +273,14 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
         mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
         # rfc3412: 7.2.2
-        msg, restOfWholeMsg = decoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
+        if self.FAST_DECODING:
+            msg, restOfWholeMsg = msgdec.decodeMessage(
+                wholeMsg, self._snmpMsgSpec,
+                snmpEngine.msgAndPduDsp.getLazyPduTypes())
+
+        else:
+            msg, restOfWholeMsg = decoder.decode(
+                wholeMsg, asn1Spec=self._snmpMsgSpec)
 
         debug.logger & debug.FLAG_MP and debug.logger(
             'prepareDataElements: %s' % (msg.prettyPrint(),))
@@ -310,17 +332,18 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
         except error.StatusInformation as exc:
             statusInformation = exc
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:sm-failure',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityLevel=securityLevel,
-                     securityParameters=securityParameters,
-                     statusInformation=statusInformation))
+            if snmpEngine.observer.isObserved('rfc2576.prepareDataElements:sm-failure'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:sm-failure',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityLevel=securityLevel,
+                         securityParameters=securityParameters,
+                         statusInformation=statusInformation))
 
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:sm-failure')
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:sm-failure')
 
             raise
 
@@ -383,21 +406,22 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
 
             stateReference = None
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:response',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     communityName=communityName,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:response')
+            if snmpEngine.observer.isObserved('rfc2576.prepareDataElements:response'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:response',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         communityName=communityName,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:response')
 
             # rfc3412: 7.2.12c
             smHandler.releaseStateInformation(securityStateReference)
@@ -433,7 +457,8 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
             stateReference = self._cache.newStateReference()
 
             self._cache.pushByStateRef(
-                stateReference, msgVersion=messageProcessingModel,
+                stateReference, scheduler=snmpEngine.scheduler,
+                msgVersion=messageProcessingModel,
                 msgID=msgID, reqID=reqID, contextEngineId=contextEngineId,
                 contextName=contextName, securityModel=securityModel,
                 securityName=securityName, securityLevel=securityLevel,
@@ -444,21 +469,22 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
                 transportAddress=transportAddress
             )
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:confirmed',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     communityName=communityName,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:confirmed')
+            if snmpEngine.observer.isObserved('rfc2576.prepareDataElements:confirmed'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:confirmed',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         communityName=communityName,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:confirmed')
 
             debug.logger & debug.FLAG_MP and debug.logger(
                 'prepareDataElements: cached by new stateReference '
@@ -476,21 +502,22 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
             # Pass new stateReference to let app browse request details
             stateReference = self._cache.newStateReference()
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:unconfirmed',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     communityName=communityName,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc2576.prepareDataElements:unconfirmed')
+            if snmpEngine.observer.isObserved('rfc2576.prepareDataElements:unconfirmed'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:unconfirmed',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         communityName=communityName,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc2576.prepareDataElements:unconfirmed')
 
             # This is not specified explicitly in RFC
             smHandler.releaseStateInformation(securityStateReference)
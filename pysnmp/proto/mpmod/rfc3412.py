@@ -18,6 +18,9 @@ from pysnmp.proto import errind
 from pysnmp.proto import error
 from pysnmp.proto import rfc1905
 from pysnmp.proto import rfc3411
+from pysnmp.proto.api import msgdec
+from pysnmp.proto.api import msgenc
+from pysnmp.proto.api import verdec
 from pysnmp.proto.mpmod.base import AbstractMessageProcessingModel
 
 # API to rfc1905 protocol objects
@@ -83,6 +86,9 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
     MESSAGE_PROCESSING_MODEL_ID = univ.Integer(3)  # SNMPv3
     SNMP_MSG_SPEC = SNMPv3Message
 
+    # decode well-formed messages bypassing generic BER decoder
+    FAST_DECODING = True
+
     _emptyStr = univ.OctetString('')
     _msgFlags = {
         0: univ.OctetString('\x00'),
@@ -96,9 +102,8 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
     def __init__(self):
         AbstractMessageProcessingModel.__init__(self)
         self._scopedPDU = ScopedPDU()
+        self._scopedPduData = ScopedPduData()
         self._engineIdCache = {}
-        self._engineIdCacheExpQueue = {}
-        self._expirationTimer = 0
 
     def getPeerEngineInfo(self, transportDomain, transportAddress):
         k = transportDomain, transportAddress
@@ -121,6 +126,10 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
         snmpEngineID, = mibBuilder.importSymbols('__SNMP-FRAMEWORK-MIB', 'snmpEngineID')
         snmpEngineID = snmpEngineID.syntax
 
+        # USM serializes scoped PDU on its own
+        if isinstance(pdu, msgenc.RequestTemplate):
+            pdu = pdu.pdu
+
         # 7.1.1b
         msgID = self._cache.newMsgID()
 
@@ -262,7 +271,8 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
         if pdu.tagSet in rfc3411.CONFIRMED_CLASS_PDUS:
             # XXX rfc bug? why stateReference should be created?
             self._cache.pushByMsgId(
-                msgID, sendPduHandle=sendPduHandle,
+                msgID, scheduler=snmpEngine.scheduler,
+                sendPduHandle=sendPduHandle,
                 msgID=msgID, snmpEngineID=snmpEngineID,
                 securityModel=securityModel,
                 securityName=securityName,
@@ -272,21 +282,22 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
                 transportDomain=transportDomain,
                 transportAddress=transportAddress)
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc3412.prepareOutgoingMessage',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 wholeMsg=wholeMsg,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 pdu=pdu)
-        )
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc3412.prepareOutgoingMessage'
-        )
+        if snmpEngine.observer.isObserved('rfc3412.prepareOutgoingMessage'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc3412.prepareOutgoingMessage',
+                dict(transportDomain=transportDomain,
+                     transportAddress=transportAddress,
+                     wholeMsg=wholeMsg,
+                     securityModel=securityModel,
+                     securityName=securityName,
+                     securityLevel=securityLevel,
+                     contextEngineId=contextEngineId,
+                     contextName=contextName,
+                     pdu=pdu)
+            )
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc3412.prepareOutgoingMessage'
+            )
 
         return transportDomain, transportAddress, wholeMsg
 
@@ -482,30 +493,92 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
         if len(wholeMsg) > min(snmpEngineMaxMessageSize.syntax, maxMessageSize):
             raise error.StatusInformation(errorIndication=errind.tooBig)
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine,
-            'rfc3412.prepareResponseMessage',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 securityEngineId=snmpEngineID,
-                 pdu=pdu))
-
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc3412.prepareResponseMessage')
+        if snmpEngine.observer.isObserved('rfc3412.prepareResponseMessage'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine,
+                'rfc3412.prepareResponseMessage',
+                dict(transportDomain=transportDomain,
+                     transportAddress=transportAddress,
+                     securityModel=securityModel,
+                     securityName=securityName,
+                     securityLevel=securityLevel,
+                     contextEngineId=contextEngineId,
+                     contextName=contextName,
+                     securityEngineId=snmpEngineID,
+                     pdu=pdu))
+
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc3412.prepareResponseMessage')
 
         return transportDomain, transportAddress, wholeMsg
 
+    def _decodeMessage(self, wholeMsg, lazyPduTypes):
+        # only msgData goes through BER decoder, the rest of
+        # the message is built from scanned header
+        try:
+            msgHeader = verdec.decodeMessageHeader(wholeMsg)
+
+            if msgHeader['msgVersion'] != 3:
+                raise error.ProtocolError(
+                    'Unexpected SNMP version %s' % msgHeader['msgVersion'])
+
+        except error.ProtocolError as exc:
+            debug.logger & debug.FLAG_MP and debug.logger(
+                '_decodeMessage: header scan failed (%s), falling back '
+                'to pyasn1' % exc)
+
+            return decoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
+
+        msg = self.SNMP_MSG_SPEC()
+
+        msg.setComponentByPosition(
+            0, msgHeader['msgVersion'], verifyConstraints=False,
+            matchTags=False, matchConstraints=False)
+
+        headerData = msg.setComponentByPosition(1).getComponentByPosition(1)
+
+        headerData.setComponentByPosition(
+            0, msgHeader['msgID'], verifyConstraints=False,
+            matchTags=False, matchConstraints=False)
+
+        headerData.setComponentByPosition(
+            1, msgHeader['msgMaxSize'], verifyConstraints=False,
+            matchTags=False, matchConstraints=False)
+
+        headerData.setComponentByPosition(
+            2, (msgHeader['msgFlags'],), verifyConstraints=False,
+            matchTags=False, matchConstraints=False)
+
+        headerData.setComponentByPosition(
+            3, msgHeader['msgSecurityModel'], verifyConstraints=False,
+            matchTags=False, matchConstraints=False)
+
+        msg.setComponentByPosition(
+            2, wholeMsg[msgHeader['msgSecurityParameters']],
+            verifyConstraints=False, matchTags=False, matchConstraints=False)
+
+        scopedPduData = msgdec.decodeMessage(
+            wholeMsg[msgHeader['msgData']], self._scopedPduData,
+            lazyPduTypes)[0]
+
+        msg.setComponentByPosition(
+            3, scopedPduData, verifyConstraints=False, matchTags=False,
+            matchConstraints=False)
+
+        return msg, wholeMsg[msgHeader['msgEnd']:]
+
     # 7.2.1
 
     def prepareDataElements(self, snmpEngine, transportDomain,
                             transportAddress, wholeMsg):
         # 7.2.2
-        msg, restOfwholeMsg = decoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
+        if self.FAST_DECODING:
+            msg, restOfwholeMsg = self._decodeMessage(
+                wholeMsg, snmpEngine.msgAndPduDsp.getLazyPduTypes())
+
+        else:
+            msg, restOfwholeMsg = decoder.decode(
+                wholeMsg, asn1Spec=self._snmpMsgSpec)
 
         debug.logger & debug.FLAG_MP and debug.logger(
             'prepareDataElements: %s' % (msg.prettyPrint(),))
@@ -530,9 +603,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
 
         # 7.2.4
         if securityModel not in snmpEngine.securityModels:
-            snmpUnknownSecurityModels, = mibBuilder.importSymbols(
-                '__SNMP-MPD-MIB', 'snmpUnknownSecurityModels')
-            snmpUnknownSecurityModels.syntax += 1
+            snmpEngine.msgAndPduDsp.stats.snmpUnknownSecurityModels += 1
             raise error.StatusInformation(errorIndication=errind.unsupportedSecurityModel)
 
         # 7.2.5
@@ -546,9 +617,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
             securityLevel = 3
 
         else:
-            snmpInvalidMsgs, = mibBuilder.importSymbols(
-                '__SNMP-MPD-MIB', 'snmpInvalidMsgs')
-            snmpInvalidMsgs.syntax += 1
+            snmpEngine.msgAndPduDsp.stats.snmpInvalidMsgs += 1
             raise error.StatusInformation(errorIndication=errind.invalidMsg)
 
         if msgFlags & 0x04:
@@ -580,17 +649,18 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
                 'prepareDataElements: SM failed, statusInformation '
                 '%s' % statusInformation)
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:sm-failure',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityLevel=securityLevel,
-                     securityParameters=securityParameters,
-                     statusInformation=statusInformation))
+            if snmpEngine.observer.isObserved('rfc3412.prepareDataElements:sm-failure'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:sm-failure',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityLevel=securityLevel,
+                         securityParameters=securityParameters,
+                         statusInformation=statusInformation))
 
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:sm-failure')
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:sm-failure')
 
             if 'errorIndication' in statusInformation:
                 # 7.2.6a
@@ -614,7 +684,8 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
                     stateReference = self._cache.newStateReference()
 
                     self._cache.pushByStateRef(
-                        stateReference, msgVersion=messageProcessingModel,
+                        stateReference, scheduler=snmpEngine.scheduler,
+                        msgVersion=messageProcessingModel,
                         msgID=msgID, contextEngineId=contextEngineId,
                         contextName=contextName, securityModel=securityModel,
                         securityName=securityName, securityLevel=securityLevel,
@@ -673,12 +744,9 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
                     }
 
                     timerResolution = snmpEngine.transportDispatcher.getTimerResolution()
-                    expireAt = int(self._expirationTimer + 300 / timerResolution)
 
-                    if expireAt not in self._engineIdCacheExpQueue:
-                        self._engineIdCacheExpQueue[expireAt] = []
-
-                    self._engineIdCacheExpQueue[expireAt].append(k)
+                    snmpEngine.scheduler.callLater(
+                        int(300 / timerResolution), self._expireEnginesInfo, k)
 
                     debug.logger & debug.FLAG_MP and debug.logger(
                         'prepareDataElements: cache securityEngineId %r for %r %r' % (
@@ -742,20 +810,21 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
 
             # 7.2.11b (incomplete implementation)
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:internal',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:internal')
+            if snmpEngine.observer.isObserved('rfc3412.prepareDataElements:internal'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:internal',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:internal')
 
             # 7.2.11c
             smHandler.releaseStateInformation(securityStateReference)
@@ -784,20 +853,21 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
 
                 raise error.StatusInformation(errorIndication=errind.dataMismatch)
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:response',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:response')
+            if snmpEngine.observer.isObserved('rfc3412.prepareDataElements:response'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:response',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:response')
 
             # 7.2.12c
             smHandler.releaseStateInformation(securityStateReference)
@@ -822,7 +892,8 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
             stateReference = self._cache.newStateReference()
 
             self._cache.pushByStateRef(
-                stateReference, msgVersion=messageProcessingModel,
+                stateReference, scheduler=snmpEngine.scheduler,
+                msgVersion=messageProcessingModel,
                 msgID=msgID, contextEngineId=contextEngineId,
                 contextName=contextName, securityModel=securityModel,
                 securityName=securityName, securityLevel=securityLevel,
@@ -835,20 +906,21 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
             debug.logger & debug.FLAG_MP and debug.logger(
                 'prepareDataElements: new stateReference %s' % stateReference)
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:confirmed',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:confirmed')
+            if snmpEngine.observer.isObserved('rfc3412.prepareDataElements:confirmed'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:confirmed',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:confirmed')
 
             # 7.2.13c
             return (messageProcessingModel, securityModel, securityName,
@@ -863,20 +935,21 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
             # Pass new stateReference to let app browse request details
             stateReference = self._cache.newStateReference()
 
-            snmpEngine.observer.storeExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:unconfirmed',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     securityEngineId=securityEngineId,
-                     pdu=pdu))
-
-            snmpEngine.observer.clearExecutionContext(
-                snmpEngine, 'rfc3412.prepareDataElements:unconfirmed')
+            if snmpEngine.observer.isObserved('rfc3412.prepareDataElements:unconfirmed'):
+                snmpEngine.observer.storeExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:unconfirmed',
+                    dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         securityEngineId=securityEngineId,
+                         pdu=pdu))
+
+                snmpEngine.observer.clearExecutionContext(
+                    snmpEngine, 'rfc3412.prepareDataElements:unconfirmed')
 
             # This is not specified explicitly in RFC
             smHandler.releaseStateInformation(securityStateReference)
@@ -891,19 +964,9 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
 
         raise error.StatusInformation(errorIndication=errind.unsupportedPDUtype)
 
-    def _expireEnginesInfo(self):
-        if self._expirationTimer in self._engineIdCacheExpQueue:
-
-            for engineKey in self._engineIdCacheExpQueue[self._expirationTimer]:
-                del self._engineIdCache[engineKey]
-
-                debug.logger & debug.FLAG_MP and debug.logger(
-                    '__expireEnginesInfo: expiring %r' % (engineKey,))
+    def _expireEnginesInfo(self, engineKey):
+        if engineKey in self._engineIdCache:
+            del self._engineIdCache[engineKey]
 
-            del self._engineIdCacheExpQueue[self._expirationTimer]
-
-        self._expirationTimer += 1
-
-    def receiveTimerTick(self, snmpEngine, timeNow):
-        self._expireEnginesInfo()
-        AbstractMessageProcessingModel.receiveTimerTick(self, snmpEngine, timeNow)
+            debug.logger & debug.FLAG_MP and debug.logger(
+                '__expireEnginesInfo: expiring %r' % (engineKey,))
@@ -9,11 +9,14 @@ from pyasn1.error import PyAsn1Error
 
 from pysnmp import debug
 from pysnmp import nextid
+from pysnmp.carrier.error import TransportBusyError
 from pysnmp.error import PySnmpError
 from pysnmp.proto import cache
 from pysnmp.proto import errind
 from pysnmp.proto import error
+from pysnmp.proto.api import msgenc
 from pysnmp.proto.api import verdec  # XXX
+from pysnmp.proto.stats import EngineStats
 from pysnmp.smi import builder
 from pysnmp.smi import instrum
 
@@ -37,12 +40,21 @@ class MsgAndPduDispatcher(object):
             'SNMP-TARGET-MIB', 'SNMP-USER-BASED-SM-MIB'
         )
 
+        # SNMP engine counters
+        self.stats = EngineStats()
+        self.stats.bindMibInstances(self.mibInstrumController.mibBuilder)
+
         # Requests cache
         self._cache = cache.Cache()
+        self._expirationTimer = None
 
         # Registered context engine IDs
         self._appsRegistration = {}
 
+        # PDU types to leave var-bindings BER-encoded in
+        self._lazyVarBindsRegistration = {}
+        self._lazyPduTypes = frozenset()
+
         # Source of sendPduHandle and cache of requesting apps
         self._sendPduHandle = nextid.Integer(0xffffff)
 
@@ -98,6 +110,35 @@ class MsgAndPduDispatcher(object):
             'unregisterContextEngineId: contextEngineId %r pduTypes '
             '%s' % (contextEngineId, pduTypes))
 
+    def registerLazyVarBinds(self, pduTypes):
+        """Request on-demand var-bindings decoding for PDU types"""
+        for pduType in pduTypes:
+            self._lazyVarBindsRegistration[pduType] = (
+                self._lazyVarBindsRegistration.get(pduType, 0) + 1)
+
+        self._lazyPduTypes = frozenset(self._lazyVarBindsRegistration)
+
+        debug.logger & debug.FLAG_DSP and debug.logger(
+            'registerLazyVarBinds: pduTypes %s' % (pduTypes,))
+
+    def unregisterLazyVarBinds(self, pduTypes):
+        """Withdraw on-demand var-bindings decoding request"""
+        for pduType in pduTypes:
+            if pduType in self._lazyVarBindsRegistration:
+                self._lazyVarBindsRegistration[pduType] -= 1
+
+                if not self._lazyVarBindsRegistration[pduType]:
+                    del self._lazyVarBindsRegistration[pduType]
+
+        self._lazyPduTypes = frozenset(self._lazyVarBindsRegistration)
+
+        debug.logger & debug.FLAG_DSP and debug.logger(
+            'unregisterLazyVarBinds: pduTypes %s' % (pduTypes,))
+
+    def getLazyPduTypes(self):
+        """Return PDU types to leave var-bindings BER-encoded in"""
+        return self._lazyPduTypes
+
     def getRegisteredApp(self, contextEngineId, pduType):
         k = contextEngineId, pduType
         if k in self._appsRegistration:
@@ -127,23 +168,35 @@ class MsgAndPduDispatcher(object):
             raise error.StatusInformation(
                 errorIndication=errind.unsupportedMsgProcessingModel)
 
+        # pre-encoded request gets serialized by MP/SM
+        if isinstance(PDU, msgenc.RequestTemplate):
+            pdu = PDU.pdu
+
+        else:
+            pdu = PDU
+
         debug.logger & debug.FLAG_DSP and debug.logger(
             'sendPdu: securityName %s, PDU\n'
-            '%s' % (securityName, PDU.prettyPrint()))
+            '%s' % (securityName, pdu.prettyPrint()))
 
         # 4.1.1.3
         sendPduHandle = self._sendPduHandle()
 
         if expectResponse:
+            timeoutAt = timeout + snmpEngine.transportDispatcher.getTimerTicks()
+
             self._cache.add(
                 sendPduHandle,
+                expireAt=timeoutAt,
                 messageProcessingModel=messageProcessingModel,
                 sendPduHandle=sendPduHandle,
-                timeout=timeout + snmpEngine.transportDispatcher.getTimerTicks(),
+                timeout=timeoutAt,
                 cbFun=cbFun,
                 cbCtx=cbCtx
             )
 
+            self.__scheduleExpiration(snmpEngine, timeoutAt)
+
             debug.logger & debug.FLAG_DSP and debug.logger(
                 'sendPdu: current time %d ticks, one tick is %s '
                 'seconds' % (snmpEngine.transportDispatcher.getTimerTicks(),
@@ -186,22 +239,32 @@ class MsgAndPduDispatcher(object):
 
         snmpEngine.observer.storeExecutionContext(
             snmpEngine, 'rfc3412.sendPdu',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 outgoingMessage=outgoingMessage,
-                 messageProcessingModel=messageProcessingModel,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 pdu=PDU)
+            lambda: dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         outgoingMessage=outgoingMessage,
+                         messageProcessingModel=messageProcessingModel,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         pdu=pdu)
         )
 
         try:
             snmpEngine.transportDispatcher.sendMessage(
                 outgoingMessage, transportDomain, transportAddress)
 
+        except TransportBusyError:
+            if expectResponse:
+                self._cache.pop(sendPduHandle)
+                self.releaseStateInformation(snmpEngine, sendPduHandle, messageProcessingModel)
+
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc3412.sendPdu')
+
+            raise error.StatusInformation(errorIndication=errind.transportBusy)
+
         except PySnmpError:
             if expectResponse:
                 self._cache.pop(sendPduHandle)
@@ -275,30 +338,35 @@ class MsgAndPduDispatcher(object):
         if (snmpEngineMaxMessageSize.syntax and
                 len(outgoingMessage) > snmpEngineMaxMessageSize.syntax):
 
-            snmpSilentDrops, = mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpSilentDrops')
-            snmpSilentDrops.syntax += 1
+            self.stats.snmpSilentDrops += 1
 
             raise error.StatusInformation(errorIndication=errind.tooBig)
 
         snmpEngine.observer.storeExecutionContext(
             snmpEngine,
             'rfc3412.returnResponsePdu',
-            dict(transportDomain=transportDomain,
-                 transportAddress=transportAddress,
-                 outgoingMessage=outgoingMessage,
-                 messageProcessingModel=messageProcessingModel,
-                 securityModel=securityModel,
-                 securityName=securityName,
-                 securityLevel=securityLevel,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName,
-                 pdu=PDU)
+            lambda: dict(transportDomain=transportDomain,
+                         transportAddress=transportAddress,
+                         outgoingMessage=outgoingMessage,
+                         messageProcessingModel=messageProcessingModel,
+                         securityModel=securityModel,
+                         securityName=securityName,
+                         securityLevel=securityLevel,
+                         contextEngineId=contextEngineId,
+                         contextName=contextName,
+                         pdu=PDU)
         )
 
         # 4.1.2.4
-        snmpEngine.transportDispatcher.sendMessage(
-            outgoingMessage, transportDomain, transportAddress)
+        try:
+            snmpEngine.transportDispatcher.sendMessage(
+                outgoingMessage, transportDomain, transportAddress)
+
+        except TransportBusyError:
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc3412.returnResponsePdu')
+
+            raise error.StatusInformation(errorIndication=errind.transportBusy)
 
         snmpEngine.observer.clearExecutionContext(
             snmpEngine, 'rfc3412.returnResponsePdu')
@@ -307,12 +375,8 @@ class MsgAndPduDispatcher(object):
     def receiveMessage(self, snmpEngine, transportDomain,
                        transportAddress, wholeMsg):
         """Message dispatcher -- de-serialize message into PDU"""
-        mibBuilder = self.mibInstrumController.mibBuilder
-
         # 4.2.1.1
-        snmpInPkts, = mibBuilder.importSymbols(
-            '__SNMPv2-MIB', 'snmpInPkts')
-        snmpInPkts.syntax += 1
+        self.stats.snmpInPkts += 1
 
         restOfWholeMsg = null  # XXX fix decoder non-recursive return
 
@@ -321,9 +385,7 @@ class MsgAndPduDispatcher(object):
             msgVersion = verdec.decodeMessageVersion(wholeMsg)
 
         except error.ProtocolError:
-            snmpInASNParseErrs, = mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpInASNParseErrs')
-            snmpInASNParseErrs.syntax += 1
+            self.stats.snmpInASNParseErrs += 1
 
             return null  # n.b the whole buffer gets dropped
 
@@ -337,9 +399,7 @@ class MsgAndPduDispatcher(object):
                 int(messageProcessingModel)]
 
         except KeyError:
-            snmpInBadVersions, = mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpInBadVersions')
-            snmpInBadVersions.syntax += 1
+            self.stats.snmpInBadVersions += 1
 
             return restOfWholeMsg
 
@@ -386,9 +446,7 @@ class MsgAndPduDispatcher(object):
         except PyAsn1Error as exc:
             debug.logger & debug.FLAG_MP and debug.logger(
                 'receiveMessage: %s' % exc)
-            snmpInASNParseErrs, = mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpInASNParseErrs')
-            snmpInASNParseErrs.syntax += 1
+            self.stats.snmpInASNParseErrs += 1
 
             return restOfWholeMsg
 
@@ -408,15 +466,15 @@ class MsgAndPduDispatcher(object):
             # 4.2.2.1.2
             if processPdu is None:
                 # 4.2.2.1.2.a
-                snmpUnknownPDUHandlers, = importSymbols(
-                    '__SNMP-MPD-MIB', 'snmpUnknownPDUHandlers')
-                snmpUnknownPDUHandlers.syntax += 1
+                self.stats.snmpUnknownPDUHandlers += 1
+
+                oid, val = self.stats.getVarBind('snmpUnknownPDUHandlers')
 
                 # 4.2.2.1.2.b
                 statusInformation = {
                     'errorIndication': errind.unknownPDUHandler,
-                    'oid': snmpUnknownPDUHandlers.name,
-                    'val': snmpUnknownPDUHandlers.syntax
+                    'oid': oid,
+                    'val': val
                 }
 
                 debug.logger & debug.FLAG_DSP and debug.logger(
@@ -451,16 +509,16 @@ class MsgAndPduDispatcher(object):
             else:
                 snmpEngine.observer.storeExecutionContext(
                     snmpEngine, 'rfc3412.receiveMessage:request',
-                    dict(transportDomain=transportDomain,
-                         transportAddress=transportAddress,
-                         wholeMsg=wholeMsg,
-                         messageProcessingModel=messageProcessingModel,
-                         securityModel=securityModel,
-                         securityName=securityName,
-                         securityLevel=securityLevel,
-                         contextEngineId=contextEngineId,
-                         contextName=contextName,
-                         pdu=PDU))
+                    lambda: dict(transportDomain=transportDomain,
+                                 transportAddress=transportAddress,
+                                 wholeMsg=wholeMsg,
+                                 messageProcessingModel=messageProcessingModel,
+                                 securityModel=securityModel,
+                                 securityName=securityName,
+                                 securityLevel=securityLevel,
+                                 contextEngineId=contextEngineId,
+                                 contextName=contextName,
+                                 pdu=PDU))
 
                 # pass transport info to app (legacy)
                 if stateReference is not None:
@@ -494,9 +552,7 @@ class MsgAndPduDispatcher(object):
 
             # 4.2.2.2.2
             if cachedParams is None:
-                snmpUnknownPDUHandlers, = mibBuilder.importSymbols(
-                    '__SNMP-MPD-MIB', 'snmpUnknownPDUHandlers')
-                snmpUnknownPDUHandlers.syntax += 1
+                self.stats.snmpUnknownPDUHandlers += 1
 
                 return restOfWholeMsg
 
@@ -508,16 +564,16 @@ class MsgAndPduDispatcher(object):
 
             snmpEngine.observer.storeExecutionContext(
                 snmpEngine, 'rfc3412.receiveMessage:response',
-                dict(transportDomain=transportDomain,
-                     transportAddress=transportAddress,
-                     wholeMsg=wholeMsg,
-                     messageProcessingModel=messageProcessingModel,
-                     securityModel=securityModel,
-                     securityName=securityName,
-                     securityLevel=securityLevel,
-                     contextEngineId=contextEngineId,
-                     contextName=contextName,
-                     pdu=PDU))
+                lambda: dict(transportDomain=transportDomain,
+                             transportAddress=transportAddress,
+                             wholeMsg=wholeMsg,
+                             messageProcessingModel=messageProcessingModel,
+                             securityModel=securityModel,
+                             securityName=securityName,
+                             securityLevel=securityLevel,
+                             contextEngineId=contextEngineId,
+                             contextName=contextName,
+                             pdu=PDU))
 
             # 4.2.2.2.4
             processResponsePdu = cachedParams['cbFun']
@@ -549,16 +605,32 @@ class MsgAndPduDispatcher(object):
 
     # Cache expiration stuff
 
-    # noinspection PyUnusedLocal
-    def __expireRequest(self, cacheKey, cachedParams, snmpEngine,
-                        statusInformation=None):
+    def __scheduleExpiration(self, snmpEngine, expireAt):
+        # one engine timer serves the whole requests cache
+        timer = self._expirationTimer
+
+        if timer is not None and timer.isActive():
+            if timer.deadline <= expireAt:
+                return
 
+            timer.cancel()
+
+        self._expirationTimer = snmpEngine.scheduler.callAt(
+            expireAt, self.__expireRequests, snmpEngine)
+
+    def __expireRequests(self, snmpEngine):
         timeNow = snmpEngine.transportDispatcher.getTimerTicks()
 
-        timeoutAt = cachedParams['timeout']
+        self._cache.expire(self.__expireRequest, snmpEngine, timeNow)
+
+        expireAt = self._cache.getNextExpiration()
+
+        if expireAt is not None:
+            self.__scheduleExpiration(snmpEngine, max(expireAt, timeNow + 1))
 
-        if statusInformation is None and timeNow < timeoutAt:
-            return
+    # noinspection PyUnusedLocal
+    def __expireRequest(self, cacheKey, cachedParams, snmpEngine,
+                        statusInformation=None):
 
         processResponsePdu = cachedParams['cbFun']
 
@@ -583,4 +655,8 @@ class MsgAndPduDispatcher(object):
 
     # noinspection PyUnusedLocal
     def receiveTimerTick(self, snmpEngine, timeNow):
-        self._cache.expire(self.__expireRequest, snmpEngine)
+        """Deprecated, pending requests expire by `snmpEngine.scheduler`.
+
+        SNMP engine keeps calling this method on every timer tick for
+        subclasses which override it.
+        """
@@ -35,4 +35,8 @@ class AbstractSecurityModel(object):
         self._cache.pop(stateReference)
 
     def receiveTimerTick(self, snmpEngine, timeNow):
-        pass
+        """Deprecated, security model state expires by `snmpEngine.scheduler`.
+
+        SNMP engine keeps calling this method on every timer tick for
+        subclasses which override it.
+        """
@@ -5,10 +5,13 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 from pysnmp import debug
+from pysnmp.carrier.asyncio import stream
 from pysnmp.carrier.asyncore.dgram import udp
 from pysnmp.carrier.asyncore.dgram import udp6
+from pysnmp.carrier.asyncore.dgram import unix
 from pysnmp.proto import errind
 from pysnmp.proto import error
+from pysnmp.proto.api import msgenc
 from pysnmp.proto.secmod import base
 from pysnmp.smi.error import NoSuchInstanceError
 
@@ -182,6 +185,17 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
 
                     targetAddrTAddress = tuple(TransportAddressIPv6(targetAddrTAddress))
 
+                elif (targetAddrTDomain[:len(stream.SNMP_TCP_DOMAIN)] ==
+                        stream.SNMP_TCP_DOMAIN):
+                    TransportAddressIPv4, = mibBuilder.importSymbols(
+                        'TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+
+                    targetAddrTAddress = tuple(TransportAddressIPv4(targetAddrTAddress))
+
+                elif (targetAddrTDomain[:len(unix.SNMP_LOCAL_DOMAIN)] ==
+                        unix.SNMP_LOCAL_DOMAIN):
+                    targetAddrTAddress = str(targetAddrTAddress)
+
                 targetAddr = targetAddrTDomain, targetAddrTAddress
 
                 targetAddrTagList = snmpTargetAddrTagList.getNode(
@@ -393,6 +407,16 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
         securityParameters = communityName
 
         msg.setComponentByPosition(1, securityParameters)
+
+        # pre-encoded PDU
+        if isinstance(pdu, msgenc.RequestTemplate):
+            debug.logger & debug.FLAG_MP and debug.logger(
+                'generateRequestMsg: using %r' % (pdu,))
+
+            return securityParameters, pdu.encodeMessage(
+                pdu.pdu.getComponentByPosition(0),
+                msg.getComponentByPosition(0), communityName)
+
         msg.setComponentByPosition(2)
         msg.getComponentByPosition(2).setComponentByType(
             pdu.tagSet, pdu, verifyConstraints=False, matchTags=False,
@@ -458,13 +482,14 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
         scope = dict(communityName=communityName,
                      transportInformation=transportInformation)
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc2576.processIncomingMsg:writable', scope
-        )
+        if snmpEngine.observer.isObserved('rfc2576.processIncomingMsg:writable'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc2576.processIncomingMsg:writable', scope
+            )
 
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc2576.processIncomingMsg:writable'
-        )
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc2576.processIncomingMsg:writable'
+            )
 
         try:
             securityName, contextEngineId, contextName = self._com2sec(
@@ -473,9 +498,7 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
             )
 
         except error.StatusInformation:
-            snmpInBadCommunityNames, = mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpInBadCommunityNames')
-            snmpInBadCommunityNames.syntax += 1
+            snmpEngine.msgAndPduDsp.stats.snmpInBadCommunityNames += 1
 
             raise error.StatusInformation(
                 errorIndication=errind.unknownCommunityName,
@@ -487,19 +510,20 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
 
         securityEngineID = snmpEngineID.syntax
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc2576.processIncomingMsg',
-            dict(transportInformation=transportInformation,
-                 securityEngineId=securityEngineID,
-                 securityName=securityName,
-                 communityName=communityName,
-                 contextEngineId=contextEngineId,
-                 contextName=contextName)
-        )
-
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc2576.processIncomingMsg'
-        )
+        if snmpEngine.observer.isObserved('rfc2576.processIncomingMsg'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc2576.processIncomingMsg',
+                dict(transportInformation=transportInformation,
+                     securityEngineId=securityEngineID,
+                     securityName=securityName,
+                     communityName=communityName,
+                     contextEngineId=contextEngineId,
+                     contextName=contextName)
+            )
+
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc2576.processIncomingMsg'
+            )
 
         debug.logger & debug.FLAG_SM and debug.logger(
             'processIncomingMsg: looked up securityName %r securityModel %r '
@@ -4,15 +4,84 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+import threading
 from hashlib import md5
 from hashlib import sha1
 
 from pyasn1.type import univ
 
+from pysnmp import cache
+from pysnmp.proto import error
+
+# Hashing passphrase takes a megabyte worth of digest operations, yet
+# many USM users often share the same passphrase and each user key gets
+# localized to every SNMP engine it talks to. Computed keys are kept
+# here, keyed by hash function, passphrase (or key) and SNMP engine ID.
+# The caches are shared by all SNMP engines in the process, possibly
+# running in different threads, so they are only accessed under the lock.
+_hashedKeys = cache.Cache(maxSize=1024)
+_localizedKeys = cache.Cache(maxSize=16384)
+_keysLock = threading.Lock()
+
+
+def setKeyCacheSize(hashedKeys=1024, localizedKeys=16384):
+    """Resize hashed and localized keys caches.
+
+    Cached keys are dropped.
+
+    Parameters
+    ----------
+    hashedKeys: :py:class:`int`
+        Maximum number of hashed passphrases to keep, zero disables
+        caching
+    localizedKeys: :py:class:`int`
+        Maximum number of localized keys to keep, zero disables caching
+    """
+    global _hashedKeys, _localizedKeys
+
+    if hashedKeys < 0 or localizedKeys < 0:
+        raise error.ProtocolError('Negative key cache size')
+
+    with _keysLock:
+        _hashedKeys = cache.Cache(maxSize=hashedKeys)
+        _localizedKeys = cache.Cache(maxSize=localizedKeys)
+
+
+def getKeyCacheStats():
+    """Return hashed and localized keys caches effectiveness counters.
+
+    Returns
+    -------
+    : :py:class:`dict`
+        `hashedKeys` and `localizedKeys` caches statistics as reported
+        by :py:meth:`pysnmp.cache.Cache.getStats`
+    """
+    with _keysLock:
+        return {
+            'hashedKeys': _hashedKeys.getStats(),
+            'localizedKeys': _localizedKeys.getStats()
+        }
+
 
 def hashPassphrase(passphrase, hashFunc):
     passphrase = univ.OctetString(passphrase).asOctets()
 
+    with _keysLock:
+        try:
+            return _hashedKeys[(hashFunc, passphrase)]
+
+        except KeyError:
+            pass
+
+    digest = _hashPassphrase(passphrase, hashFunc)
+
+    with _keysLock:
+        _hashedKeys[(hashFunc, passphrase)] = digest
+
+    return digest
+
+
+def _hashPassphrase(passphrase, hashFunc):
     hasher = hashFunc()
 
     ringBuffer = passphrase * (64 // len(passphrase) + 1)
@@ -47,10 +116,24 @@ def passwordToKey(passphrase, snmpEngineId, hashFunc):
 
 def localizeKey(passKey, snmpEngineId, hashFunc):
     passKey = univ.OctetString(passKey).asOctets()
+    snmpEngineId = snmpEngineId.asOctets()
+
+    with _keysLock:
+        try:
+            return _localizedKeys[(hashFunc, passKey, snmpEngineId)]
+
+        except KeyError:
+            pass
 
     # noinspection PyDeprecation,PyCallingNonCallable
-    digest = hashFunc(passKey + snmpEngineId.asOctets() + passKey).digest()
-    return univ.OctetString(digest)
+    digest = hashFunc(passKey + snmpEngineId + passKey).digest()
+
+    localKey = univ.OctetString(digest)
+
+    with _keysLock:
+        _localizedKeys[(hashFunc, passKey, snmpEngineId)] = localKey
+
+    return localKey
 
 
 # RFC3414: A.2.1
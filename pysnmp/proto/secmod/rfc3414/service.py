@@ -102,8 +102,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
         AbstractSecurityModel.__init__(self)
         self._securityParametersSpec = UsmSecurityParameters()
         self._timeline = {}
-        self._timelineExpQueue = {}
-        self._expirationTimer = 0
+        self._timelineExpiry = {}
         self._paramsBranchId = -1
 
     def _sec2usr(self, snmpEngine, securityName, securityEngineID=None):
@@ -463,9 +462,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 debug.logger & debug.FLAG_SM and debug.logger(
                     '__generateRequestOrResponseMsg: %s' % exc)
 
-                snmpInGenErrs, = mibBuilder.importSymbols(
-                    '__SNMPv2-MIB', 'snmpInGenErrs')
-                snmpInGenErrs.syntax += 1
+                snmpEngine.msgAndPduDsp.stats.snmpInGenErrs += 1
 
                 raise error.StatusInformation(errorIndication=errind.invalidMsg)
 
@@ -832,9 +829,8 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 debug.logger & debug.FLAG_SM and debug.logger(
                     'processIncomingMsg: peer requested snmpEngineID discovery')
 
-                usmStatsUnknownEngineIDs, = mibBuilder.importSymbols(
-                    '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownEngineIDs')
-                usmStatsUnknownEngineIDs.syntax += 1
+                engineStats = snmpEngine.msgAndPduDsp.stats
+                engineStats.usmStatsUnknownEngineIDs += 1
 
                 debug.logger & debug.FLAG_SM and debug.logger(
                     'processIncomingMsg: null or malformed msgAuthoritativeEngineId')
@@ -860,10 +856,12 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     contextEngineId = scopedPdu.getComponentByPosition(0)
                     contextName = scopedPdu.getComponentByPosition(1)
 
+                    oid, val = engineStats.getVarBind('usmStatsUnknownEngineIDs')
+
                     raise error.StatusInformation(
                         errorIndication=errind.unknownEngineID,
-                        oid=usmStatsUnknownEngineIDs.name,
-                        val=usmStatsUnknownEngineIDs.syntax,
+                        oid=oid,
+                        val=val,
                         securityStateReference=securityStateReference,
                         securityLevel=securityLevel,
                         contextEngineId=contextEngineId,
@@ -924,14 +922,15 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                         '%r msgUserName %r' % (msgAuthoritativeEngineId,
                                                msgUserName))
 
-                    usmStatsUnknownUserNames, = mibBuilder.importSymbols(
-                        '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownUserNames')
-                    usmStatsUnknownUserNames.syntax += 1
+                    engineStats = snmpEngine.msgAndPduDsp.stats
+                    engineStats.usmStatsUnknownUserNames += 1
+
+                    oid, val = engineStats.getVarBind('usmStatsUnknownUserNames')
 
                     raise error.StatusInformation(
                         errorIndication=errind.unknownSecurityName,
-                        oid=usmStatsUnknownUserNames.name,
-                        val=usmStatsUnknownUserNames.syntax,
+                        oid=oid,
+                        val=val,
                         securityStateReference=securityStateReference,
                         securityLevel=securityLevel,
                         contextEngineId=contextEngineId,
@@ -944,9 +943,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 debug.logger & debug.FLAG_SM and debug.logger(
                     'processIncomingMsg: %s' % exc)
 
-                snmpInGenErrs, = mibBuilder.importSymbols(
-                    '__SNMPv2-MIB', 'snmpInGenErrs')
-                snmpInGenErrs.syntax += 1
+                snmpEngine.msgAndPduDsp.stats.snmpInGenErrs += 1
 
                 raise error.StatusInformation(errorIndication=errind.invalidMsg)
 
@@ -978,20 +975,21 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
         msgAuthoritativeEngineBoots = securityParameters.getComponentByPosition(1)
         msgAuthoritativeEngineTime = securityParameters.getComponentByPosition(2)
 
-        snmpEngine.observer.storeExecutionContext(
-            snmpEngine, 'rfc3414.processIncomingMsg',
-            dict(securityEngineId=msgAuthoritativeEngineId,
-                 snmpEngineBoots=msgAuthoritativeEngineBoots,
-                 snmpEngineTime=msgAuthoritativeEngineTime,
-                 userName=usmUserName,
-                 securityName=usmUserSecurityName,
-                 authProtocol=usmUserAuthProtocol,
-                 authKey=usmUserAuthKeyLocalized,
-                 privProtocol=usmUserPrivProtocol,
-                 privKey=usmUserPrivKeyLocalized)
-        )
-        snmpEngine.observer.clearExecutionContext(
-            snmpEngine, 'rfc3414.processIncomingMsg')
+        if snmpEngine.observer.isObserved('rfc3414.processIncomingMsg'):
+            snmpEngine.observer.storeExecutionContext(
+                snmpEngine, 'rfc3414.processIncomingMsg',
+                dict(securityEngineId=msgAuthoritativeEngineId,
+                     snmpEngineBoots=msgAuthoritativeEngineBoots,
+                     snmpEngineTime=msgAuthoritativeEngineTime,
+                     userName=usmUserName,
+                     securityName=usmUserSecurityName,
+                     authProtocol=usmUserAuthProtocol,
+                     authKey=usmUserAuthKeyLocalized,
+                     privProtocol=usmUserPrivProtocol,
+                     privKey=usmUserPrivKeyLocalized)
+            )
+            snmpEngine.observer.clearExecutionContext(
+                snmpEngine, 'rfc3414.processIncomingMsg')
 
         # 3.2.5
         if msgAuthoritativeEngineId == snmpEngineID:
@@ -1022,10 +1020,10 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     badSecIndication = 'noAuthNoPriv wanted while priv expected'
 
             if badSecIndication:
-                usmStatsUnsupportedSecLevels, = mibBuilder.importSymbols(
-                    '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnsupportedSecLevels')
+                engineStats = snmpEngine.msgAndPduDsp.stats
+                engineStats.usmStatsUnsupportedSecLevels += 1
 
-                usmStatsUnsupportedSecLevels.syntax += 1
+                oid, val = engineStats.getVarBind('usmStatsUnsupportedSecLevels')
 
                 debug.logger & debug.FLAG_SM and debug.logger(
                     'processIncomingMsg: reporting inappropriate security '
@@ -1033,8 +1031,8 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
 
                 raise error.StatusInformation(
                     errorIndication=errind.unsupportedSecurityLevel,
-                    oid=usmStatsUnsupportedSecLevels.name,
-                    val=usmStatsUnsupportedSecLevels.syntax,
+                    oid=oid,
+                    val=val,
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -1059,15 +1057,15 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     wholeMsg)
 
             except error.StatusInformation:
-                usmStatsWrongDigests, = mibBuilder.importSymbols(
-                    '__SNMP-USER-BASED-SM-MIB', 'usmStatsWrongDigests')
+                engineStats = snmpEngine.msgAndPduDsp.stats
+                engineStats.usmStatsWrongDigests += 1
 
-                usmStatsWrongDigests.syntax += 1
+                oid, val = engineStats.getVarBind('usmStatsWrongDigests')
 
                 raise error.StatusInformation(
                     errorIndication=errind.authenticationFailure,
-                    oid=usmStatsWrongDigests.name,
-                    val=usmStatsWrongDigests.syntax,
+                    oid=oid,
+                    val=val,
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -1087,15 +1085,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 int(time.time())
             )
 
-            timerResolution = (snmpEngine.transportDispatcher is None and 1.0 or
-                               snmpEngine.transportDispatcher.getTimerResolution())
-
-            expireAt = int(self._expirationTimer + 300 / timerResolution)
-
-            if expireAt not in self._timelineExpQueue:
-                self._timelineExpQueue[expireAt] = []
-
-            self._timelineExpQueue[expireAt].append(msgAuthoritativeEngineId)
+            self._scheduleTimelineExpiry(snmpEngine, msgAuthoritativeEngineId)
 
             debug.logger & debug.FLAG_SM and debug.logger(
                 'processIncomingMsg: store timeline for securityEngineID '
@@ -1147,14 +1137,15 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                         (abs(idleTime + int(snmpEngineTime)
                              - int(msgAuthoritativeEngineTime))) > 150):
 
-                    usmStatsNotInTimeWindows, = mibBuilder.importSymbols(
-                        '__SNMP-USER-BASED-SM-MIB', 'usmStatsNotInTimeWindows')
-                    usmStatsNotInTimeWindows.syntax += 1
+                    engineStats = snmpEngine.msgAndPduDsp.stats
+                    engineStats.usmStatsNotInTimeWindows += 1
+
+                    oid, val = engineStats.getVarBind('usmStatsNotInTimeWindows')
 
                     raise error.StatusInformation(
                         errorIndication=errind.notInTimeWindow,
-                        oid=usmStatsNotInTimeWindows.name,
-                        val=usmStatsNotInTimeWindows.syntax,
+                        oid=oid,
+                        val=val,
                         securityStateReference=securityStateReference,
                         securityLevel=2,
                         contextEngineId=contextEngineId,
@@ -1177,16 +1168,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                         int(time.time())
                     )
 
-                    timerResolution = (
-                            snmpEngine.transportDispatcher is None and 1.0 or
-                           snmpEngine.transportDispatcher.getTimerResolution())
-
-                    expireAt = int(self._expirationTimer + 300 / timerResolution)
-
-                    if expireAt not in self._timelineExpQueue:
-                        self._timelineExpQueue[expireAt] = []
-
-                    self._timelineExpQueue[expireAt].append(msgAuthoritativeEngineId)
+                    self._scheduleTimelineExpiry(snmpEngine, msgAuthoritativeEngineId)
 
                     debug.logger & debug.FLAG_SM and debug.logger(
                         'processIncomingMsg: stored timeline '
@@ -1238,14 +1220,15 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     '%s' % debug.hexdump(decryptedData))
 
             except error.StatusInformation:
-                usmStatsDecryptionErrors, = mibBuilder.importSymbols(
-                    '__SNMP-USER-BASED-SM-MIB', 'usmStatsDecryptionErrors')
-                usmStatsDecryptionErrors.syntax += 1
+                engineStats = snmpEngine.msgAndPduDsp.stats
+                engineStats.usmStatsDecryptionErrors += 1
+
+                oid, val = engineStats.getVarBind('usmStatsDecryptionErrors')
 
                 raise error.StatusInformation(
                     errorIndication=errind.decryptionError,
-                    oid=usmStatsDecryptionErrors.name,
-                    val=usmStatsDecryptionErrors.syntax,
+                    oid=oid,
+                    val=val,
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -1256,8 +1239,16 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
             scopedPduSpec = scopedPduData.setComponentByPosition(
                 0).getComponentByPosition(0)
 
+            lazyPduTypes = snmpEngine.msgAndPduDsp.getLazyPduTypes()
+
             try:
-                scopedPDU, rest = decoder.decode(decryptedData, asn1Spec=scopedPduSpec)
+                if lazyPduTypes:
+                    scopedPDU, rest = api.decodeMessage(
+                        decryptedData, scopedPduSpec, lazyPduTypes)
+
+                else:
+                    scopedPDU, rest = decoder.decode(
+                        decryptedData, asn1Spec=scopedPduSpec)
 
             except PyAsn1Error as exc:
                 debug.logger & debug.FLAG_SM and debug.logger(
@@ -1293,14 +1284,15 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
 
         # Delayed to include details
         if not msgUserName and not msgAuthoritativeEngineId:
-            usmStatsUnknownUserNames, = mibBuilder.importSymbols(
-                '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownUserNames')
-            usmStatsUnknownUserNames.syntax += 1
+            engineStats = snmpEngine.msgAndPduDsp.stats
+            engineStats.usmStatsUnknownUserNames += 1
+
+            oid, val = engineStats.getVarBind('usmStatsUnknownUserNames')
 
             raise error.StatusInformation(
                 errorIndication=errind.unknownSecurityName,
-                oid=usmStatsUnknownUserNames.name,
-                val=usmStatsUnknownUserNames.syntax,
+                oid=oid,
+                val=val,
                 securityStateReference=securityStateReference,
                 securityEngineID=msgAuthoritativeEngineId,
                 securityLevel=securityLevel,
@@ -1315,18 +1307,20 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
         return (msgAuthoritativeEngineId, securityName, scopedPDU,
                 maxSizeResponseScopedPDU, securityStateReference)
 
-    def _expireTimelineInfo(self):
-        if self._expirationTimer in self._timelineExpQueue:
+    def _scheduleTimelineExpiry(self, snmpEngine, engineIdKey):
+        if engineIdKey in self._timelineExpiry:
+            return
 
-            for engineIdKey in self._timelineExpQueue[self._expirationTimer]:
-                if engineIdKey in self._timeline:
-                    del self._timeline[engineIdKey]
-                    debug.logger & debug.FLAG_SM and debug.logger(
-                        '__expireTimelineInfo: expiring %r' % (engineIdKey,))
+        timerResolution = (snmpEngine.transportDispatcher is None and 1.0 or
+                           snmpEngine.transportDispatcher.getTimerResolution())
 
-            del self._timelineExpQueue[self._expirationTimer]
+        self._timelineExpiry[engineIdKey] = snmpEngine.scheduler.callLater(
+            int(300 / timerResolution), self._expireTimelineInfo, engineIdKey)
 
-        self._expirationTimer += 1
+    def _expireTimelineInfo(self, engineIdKey):
+        del self._timelineExpiry[engineIdKey]
 
-    def receiveTimerTick(self, snmpEngine, timeNow):
-        self._expireTimelineInfo()
+        if engineIdKey in self._timeline:
+            del self._timeline[engineIdKey]
+            debug.logger & debug.FLAG_SM and debug.logger(
+                '__expireTimelineInfo: expiring %r' % (engineIdKey,))
@@ -0,0 +1,132 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# SNMP engine statistics counters.
+#
+# SNMP engine bumps some of its counters on every message. Rather than
+# importing MIB objects and cloning their values each time, counters
+# live here as plain integers. Counter MIB object instances read them
+# back whenever the counter is queried over SNMP.
+#
+from pysnmp import debug
+
+__all__ = ['EngineStats']
+
+
+class EngineStats(object):
+    """SNMP engine statistics counters.
+
+    Each counter is a plain integer attribute named after its MIB object
+    e.g. `snmpInPkts`. Once bound to MIB, counter MIB object instances
+    report these integers as their values.
+    """
+    COUNTERS = (
+        ('__SNMPv2-MIB', 'snmpInPkts'),
+        ('__SNMPv2-MIB', 'snmpOutPkts'),
+        ('__SNMPv2-MIB', 'snmpInBadVersions'),
+        ('__SNMPv2-MIB', 'snmpInBadCommunityNames'),
+        ('__SNMPv2-MIB', 'snmpInBadCommunityUses'),
+        ('__SNMPv2-MIB', 'snmpInASNParseErrs'),
+        ('__SNMPv2-MIB', 'snmpInTooBigs'),
+        ('__SNMPv2-MIB', 'snmpInNoSuchNames'),
+        ('__SNMPv2-MIB', 'snmpInBadValues'),
+        ('__SNMPv2-MIB', 'snmpInReadOnlys'),
+        ('__SNMPv2-MIB', 'snmpInGenErrs'),
+        ('__SNMPv2-MIB', 'snmpInTotalReqVars'),
+        ('__SNMPv2-MIB', 'snmpInTotalSetVars'),
+        ('__SNMPv2-MIB', 'snmpInGetRequests'),
+        ('__SNMPv2-MIB', 'snmpInGetNexts'),
+        ('__SNMPv2-MIB', 'snmpInSetRequests'),
+        ('__SNMPv2-MIB', 'snmpInGetResponses'),
+        ('__SNMPv2-MIB', 'snmpInTraps'),
+        ('__SNMPv2-MIB', 'snmpOutTooBigs'),
+        ('__SNMPv2-MIB', 'snmpOutNoSuchNames'),
+        ('__SNMPv2-MIB', 'snmpOutBadValues'),
+        ('__SNMPv2-MIB', 'snmpOutGenErrs'),
+        ('__SNMPv2-MIB', 'snmpOutSetRequests'),
+        ('__SNMPv2-MIB', 'snmpOutGetResponses'),
+        ('__SNMPv2-MIB', 'snmpOutTraps'),
+        ('__SNMPv2-MIB', 'snmpSilentDrops'),
+        ('__SNMPv2-MIB', 'snmpProxyDrops'),
+        ('__SNMP-MPD-MIB', 'snmpUnknownSecurityModels'),
+        ('__SNMP-MPD-MIB', 'snmpInvalidMsgs'),
+        ('__SNMP-MPD-MIB', 'snmpUnknownPDUHandlers'),
+        ('__SNMP-TARGET-MIB', 'snmpUnavailableContexts'),
+        ('__SNMP-TARGET-MIB', 'snmpUnknownContexts'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsUnsupportedSecLevels'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsNotInTimeWindows'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownUserNames'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownEngineIDs'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsWrongDigests'),
+        ('__SNMP-USER-BASED-SM-MIB', 'usmStatsDecryptionErrors'),
+    )
+
+    __slots__ = tuple([symName for modName, symName in COUNTERS]) + ('_mibNodes',)
+
+    def __init__(self):
+        for modName, symName in self.COUNTERS:
+            setattr(self, symName, 0)
+
+        self._mibNodes = {}
+
+    def __repr__(self):
+        return '%s(%s)' % (
+            self.__class__.__name__,
+            ', '.join(['%s=%s' % (symName, getattr(self, symName))
+                       for modName, symName in self.COUNTERS]))
+
+    def bindMibInstances(self, mibBuilder):
+        """Make counter MIB object instances report these counters.
+
+        Counter values already held by MIB object instances carry over.
+
+        Parameters
+        ----------
+        mibBuilder: :py:class:`~pysnmp.smi.builder.MibBuilder`
+            MIB builder having SNMP engine MIB instances
+        """
+        for modName, symName in self.COUNTERS:
+            mibNode, = mibBuilder.importSymbols(modName, symName)
+
+            if hasattr(mibNode, 'bindStats'):
+                mibNode.bindStats(self, symName)
+
+            else:
+                debug.logger & debug.FLAG_INS and debug.logger(
+                    'bindMibInstances: %s::%s is not a counter '
+                    'instance, not bound' % (modName, symName))
+
+            self._mibNodes[symName] = mibNode
+
+    def getVarBind(self, statName):
+        """Return counter MIB object instance ID and value.
+
+        Parameters
+        ----------
+        statName: :py:class:`str`
+            Counter name e.g. `usmStatsWrongDigests`
+
+        Returns
+        -------
+        : :py:class:`tuple`
+            :py:class:`~pysnmp.proto.rfc1902.ObjectName` and
+            :py:class:`~pysnmp.proto.rfc1902.Counter32` pair
+        """
+        mibNode = self._mibNodes[statName]
+
+        return mibNode.name, mibNode.syntax.clone(
+            getattr(self, statName) & 0xffffffff)
+
+    def getStats(self):
+        """Return a snapshot of SNMP engine counters.
+
+        Returns
+        -------
+        : :py:class:`dict`
+            Counter name to :py:class:`int` value mapping
+        """
+        return dict([(symName, getattr(self, symName))
+                     for modName, symName in self.COUNTERS])
@@ -0,0 +1,124 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Deadline scheduler for timed call backs
+#
+from heapq import heapify
+from heapq import heappop
+from heapq import heappush
+
+
+class Timer(object):
+    """Scheduled call back handle returned by :py:class:`Scheduler`"""
+    __slots__ = ('deadline', '_cbFun', '_args', '_scheduler')
+
+    def __init__(self, scheduler, deadline, cbFun, args):
+        self.deadline = deadline
+        self._cbFun = cbFun
+        self._args = args
+        self._scheduler = scheduler
+
+    def __call__(self):
+        cbFun, args = self._cbFun, self._args
+        self._cbFun = self._args = None
+        self._scheduler._pending -= 1
+        cbFun(*args)
+
+    def cancel(self):
+        """Cancel call back unless it has already been called"""
+        if self._cbFun is not None:
+            self._cbFun = self._args = None
+            self._scheduler._pending -= 1
+
+    def isActive(self):
+        return self._cbFun is not None
+
+
+class Scheduler(object):
+    """Call back functions at given deadlines.
+
+    Deadlines are kept in a binary heap, so scheduling costs O(log n)
+    and checking for due call backs costs O(1) when nothing is due.
+    Cancelled timers are left in the heap and skipped once they come
+    up, unless they start to dominate the heap.
+
+    Unless `timeFun` is given (and returns other than `None`), the
+    scheduler has no clock of its own and time advances whenever the
+    owner calls :py:meth:`runDue`. For
+    :py:class:`SnmpEngine`, time is measured in transport dispatcher
+    timer ticks.
+    """
+    def __init__(self, timeFun=None):
+        self._queue = []
+        self._seq = 0
+        self._pending = 0
+        self._timeNow = 0
+        self._timeFun = timeFun
+
+    def __len__(self):
+        return self._pending
+
+    def callAt(self, deadline, cbFun, *args):
+        """Schedule `cbFun(*args)` call at or after `deadline`.
+
+        Returns
+        -------
+        : :py:class:`Timer`
+            Handle to cancel the call back with
+        """
+        timer = Timer(self, deadline, cbFun, args)
+
+        self._seq += 1
+
+        heappush(self._queue, (deadline, self._seq, timer))
+
+        self._pending += 1
+
+        if len(self._queue) > 64 and len(self._queue) > self._pending * 2:
+            self._queue[:] = [x for x in self._queue if x[2].isActive()]
+            heapify(self._queue)
+
+        return timer
+
+    def callLater(self, delay, cbFun, *args):
+        """Schedule `cbFun(*args)` call `delay` time units from now"""
+        return self.callAt(self.getTimeNow() + delay, cbFun, *args)
+
+    def getTimeNow(self):
+        if self._timeFun is not None:
+            timeNow = self._timeFun()
+            if timeNow is not None:
+                return timeNow
+
+        return self._timeNow
+
+    def getNextDeadline(self):
+        """Return the earliest pending deadline or `None`"""
+        queue = self._queue
+
+        while queue and not queue[0][2].isActive():
+            heappop(queue)
+
+        if queue:
+            return queue[0][0]
+
+    def runDue(self, timeNow):
+        """Advance time to `timeNow` and call back everything that is due"""
+        self._timeNow = timeNow
+
+        queue = self._queue
+
+        while queue and queue[0][0] <= timeNow:
+            timer = heappop(queue)[2]
+
+            if timer.isActive():
+                timer()
+
+    def clear(self):
+        for deadline, seq, timer in self._queue:
+            timer.cancel()
+
+        del self._queue[:]
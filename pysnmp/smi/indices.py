@@ -4,18 +4,28 @@
 # Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-from bisect import bisect
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
 
 
 class OrderedDict(dict):
-    """Ordered dictionary used for indices"""
+    """Ordered dictionary used for indices
+
+    Keys are kept sorted in a list of bounded-size sorted chunks. That
+    makes key insertion, removal and successor lookup cost a couple of
+    binary searches plus a memory move within a single chunk, no matter
+    how large the dictionary grows.
+    """
+    CHUNK_SIZE = 512
 
     def __init__(self, *args, **kwargs):
         super(OrderedDict, self).__init__()
 
-        self._keys = []
-        self._dirty = True
-        self._keysLens = []
+        self._chunks = []
+        self._maxes = []
+        self._keysLensCount = {}
+        self._keysLens = None
 
         if args:
             self.update(*args)
@@ -24,37 +34,52 @@ class OrderedDict(dict):
             self.update(**kwargs)
 
     def __setitem__(self, key, value):
+        if key not in self:
+            self._insertKey(self._sortKey(key))
+
         super(OrderedDict, self).__setitem__(key, value)
-        if key not in self._keys:
-            self._keys.append(key)
-            self._dirty = True
 
     def __delitem__(self, key):
         super(OrderedDict, self).__delitem__(key)
-        if key in self._keys:
-            self._keys.remove(key)
-            self._dirty = True
+        self._removeKey(self._sortKey(key))
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+
+        return super(OrderedDict, self).pop(key, *default)
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+
+        key = self.lastKey()
+
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+
+        return self[key]
 
     def clear(self):
         super(OrderedDict, self).clear()
-        self._keys = []
-        self._dirty = True
+        self._chunks = []
+        self._maxes = []
+        self._keysLensCount.clear()
+        self._keysLens = None
 
     def keys(self):
-        if self._dirty:
-            self._order()
-        return list(self._keys)
+        return [self._origKey(k) for chunk in self._chunks for k in chunk]
 
     def values(self):
-        if self._dirty:
-            self._order()
-        return [self[k] for k in self._keys]
+        return [self[k] for k in self.keys()]
 
     def items(self):
-        if self._dirty:
-            self._order()
-
-        return [(k, self[k]) for k in self._keys]
+        return [(k, self[k]) for k in self.keys()]
 
     def update(self, *args, **kwargs):
         if args:
@@ -71,38 +96,106 @@ class OrderedDict(dict):
             for k in kwargs:
                 self[k] = kwargs[k]
 
-    def sortingFun(self, keys):
-        keys.sort()
+    def _sortKey(self, key):
+        return key
 
-    def _order(self):
-        self.sortingFun(self._keys)
+    def _origKey(self, sortKey):
+        return sortKey
 
-        self._keysLens = sorted(
-            set(len(k) for k in self._keys), reverse=True)
+    def _insertKey(self, sortKey):
+        chunks = self._chunks
+        maxes = self._maxes
 
-        self._dirty = False
+        if not maxes:
+            chunks.append([sortKey])
+            maxes.append(sortKey)
 
-    def nextKey(self, key):
-        if self._dirty:
-            self._order()
+        else:
+            pos = bisect_left(maxes, sortKey)
 
-        keys = self._keys
+            if pos == len(maxes):
+                pos -= 1
+                chunks[pos].append(sortKey)
+                maxes[pos] = sortKey
 
-        if key in keys:
-            nextIdx = keys.index(key) + 1
+            else:
+                insort(chunks[pos], sortKey)
+
+            chunk = chunks[pos]
+
+            if len(chunk) > self.CHUNK_SIZE * 2:
+                half = chunk[self.CHUNK_SIZE:]
+                del chunk[self.CHUNK_SIZE:]
+                maxes[pos] = chunk[-1]
+                chunks.insert(pos + 1, half)
+                maxes.insert(pos + 1, half[-1])
+
+        keyLen = len(sortKey)
+
+        if keyLen in self._keysLensCount:
+            self._keysLensCount[keyLen] += 1
 
         else:
-            nextIdx = bisect(keys, key)
+            self._keysLensCount[keyLen] = 1
+            self._keysLens = None
+
+    def _removeKey(self, sortKey):
+        chunks = self._chunks
+        maxes = self._maxes
 
-        if nextIdx < len(keys):
-            return keys[nextIdx]
+        pos = bisect_left(maxes, sortKey)
+        if pos == len(maxes):
+            return
+
+        chunk = chunks[pos]
+
+        idx = bisect_left(chunk, sortKey)
+        if idx == len(chunk) or chunk[idx] != sortKey:
+            return
+
+        del chunk[idx]
+
+        if chunk:
+            maxes[pos] = chunk[-1]
 
         else:
+            del chunks[pos]
+            del maxes[pos]
+
+        keyLen = len(sortKey)
+
+        self._keysLensCount[keyLen] -= 1
+
+        if not self._keysLensCount[keyLen]:
+            del self._keysLensCount[keyLen]
+            self._keysLens = None
+
+    def nextKey(self, key):
+        sortKey = self._sortKey(key)
+
+        pos = bisect_right(self._maxes, sortKey)
+        if pos == len(self._maxes):
             raise KeyError(key)
 
+        chunk = self._chunks[pos]
+
+        return self._origKey(chunk[bisect_right(chunk, sortKey)])
+
+    def firstKey(self):
+        if not self._chunks:
+            raise KeyError('firstKey(): dictionary is empty')
+
+        return self._origKey(self._chunks[0][0])
+
+    def lastKey(self):
+        if not self._chunks:
+            raise KeyError('lastKey(): dictionary is empty')
+
+        return self._origKey(self._chunks[-1][-1])
+
     def getKeysLens(self):
-        if self._dirty:
-            self._order()
+        if self._keysLens is None:
+            self._keysLens = sorted(self._keysLensCount, reverse=True)
 
         return self._keysLens
 
@@ -111,25 +204,35 @@ class OidOrderedDict(OrderedDict):
     """OID-ordered dictionary used for indices"""
 
     def __init__(self, *args, **kwargs):
-        OrderedDict.__init__(self, *args, **kwargs)
-
         self._keysCache = {}
 
+        OrderedDict.__init__(self, *args, **kwargs)
+
     def __setitem__(self, key, value):
         OrderedDict.__setitem__(self, key, value)
 
-        if key not in self._keysCache:
-            if isinstance(key, tuple):
-                self._keysCache[key] = key
-
-            else:
-                self._keysCache[key] = [int(x) for x in key.split('.') if x]
+        if hasattr(key, 'split'):
+            self._keysCache[self._sortKey(key)] = key
 
     def __delitem__(self, key):
         OrderedDict.__delitem__(self, key)
 
-        if key in self._keysCache:
-            del self._keysCache[key]
+        if hasattr(key, 'split'):
+            del self._keysCache[self._sortKey(key)]
+
+    def clear(self):
+        OrderedDict.clear(self)
+        self._keysCache.clear()
+
+    def _sortKey(self, key):
+        # dotted-string OIDs are ordered by their numeric sub-identifiers
+        if hasattr(key, 'split'):
+            return tuple([int(x) for x in key.split('.') if x])
+
+        return key
+
+    def _origKey(self, sortKey):
+        if self._keysCache:
+            return self._keysCache.get(sortKey, sortKey)
 
-    def sortingFun(self, keys):
-        keys.sort(key=lambda k, d=self._keysCache: d[k])
+        return sortKey
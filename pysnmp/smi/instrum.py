@@ -71,6 +71,9 @@ class MibInstrumController(AbstractMibInstrumController):
         (STATE_ANY, STATUS_ERROR): STATE_STOP
     }
 
+    # index MIB tree nodes for single-pass OID lookup
+    COMPILE_MIB_TREE = True
+
     def __init__(self, mibBuilder):
         self.mibBuilder = mibBuilder
         self.lastBuildId = -1
@@ -208,6 +211,12 @@ class MibInstrumController(AbstractMibInstrumController):
             mibTree.registerSubtrees(scalar)
             lastBuildSyms[scalar.name] = mibTree.name
 
+        if self.COMPILE_MIB_TREE:
+            mibTree.compileBranches()
+
+            for node in list(rows.values()) + list(scalars.values()):
+                node.compileBranches()
+
         self.lastBuildSyms = lastBuildSyms
 
         self.lastBuildId = self.mibBuilder.lastBuildId
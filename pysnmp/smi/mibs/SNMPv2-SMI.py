@@ -415,6 +415,8 @@ class ManagedMibObject(ObjectType):
     branchVersionId = 0  # changes on tree structure change
     maxAccess = 'not-accessible'
 
+    _branchTrie = None  # optional compiled children index
+
     ST_CREATE = 'create'
     ST_DESTROY = 'destroy'
 
@@ -426,6 +428,7 @@ class ManagedMibObject(ObjectType):
 
     def registerSubtrees(self, *subTrees):
         self.branchVersionId += 1
+        self._branchTrie = None
         for subTree in subTrees:
             if subTree.name in self._vars:
                 raise error.SmiError(
@@ -435,6 +438,7 @@ class ManagedMibObject(ObjectType):
 
     def unregisterSubtrees(self, *names):
         self.branchVersionId += 1
+        self._branchTrie = None
         for name in names:
             # This may fail if you fill a table by exporting MibScalarInstances
             # but later drop them through SNMP.
@@ -452,8 +456,52 @@ class ManagedMibObject(ObjectType):
     # NoSuchInstanceError exception.
     #
 
+    def compileBranches(self):
+        """Build OID trie over the children of this MIB tree node.
+
+        With the trie in place, the child owning the OID is found in a
+        single descent over OID sub-identifiers rather than by probing
+        OID prefixes of every distinct children OID length.
+
+        The trie is dropped whenever children are registered or
+        unregistered.
+        """
+        trie = {}
+
+        for subName, subTree in self._vars.items():
+            if not subName:
+                continue
+
+            children = trie
+
+            for subId in subName[:-1]:
+                children = children.setdefault(subId, [None, {}])[1]
+
+            children.setdefault(subName[-1], [None, {}])[0] = subTree
+
+        self._branchTrie = trie
+
     def getBranch(self, name, **context):
         """Return a branch of this tree where the 'name' OID may reside"""
+        if self._branchTrie is not None:
+            branch = None
+            children = self._branchTrie
+
+            for subId in name:
+                try:
+                    subTree, children = children[subId]
+
+                except KeyError:
+                    break
+
+                if subTree is not None:
+                    branch = subTree
+
+            if branch is not None:
+                return branch
+
+            raise error.NoSuchObjectError(name=name, idx=context.get('idx'))
+
         for keyLen in self._vars.getKeysLens():
             subName = name[:keyLen]
             if subName in self._vars:
@@ -462,18 +510,16 @@ class ManagedMibObject(ObjectType):
         raise error.NoSuchObjectError(name=name, idx=context.get('idx'))
 
     def getNextBranch(self, name, **context):
-        # Start from the beginning
-        if self._vars:
-            first = list(self._vars.keys())[0]
-        else:
-            first = ()
-        if self._vars and name < first:
-            return self._vars[first]
-        else:
-            try:
-                return self._vars[self._vars.nextKey(name)]
-            except KeyError:
-                raise error.NoSuchObjectError(name=name, idx=context.get('idx'))
+        try:
+            # Start from the beginning
+            first = self._vars.firstKey()
+            if name < first:
+                return self._vars[first]
+
+            return self._vars[self._vars.nextKey(name)]
+
+        except KeyError:
+            raise error.NoSuchObjectError(name=name, idx=context.get('idx'))
 
     def getNode(self, name, **context):
         """Return tree node found by name"""
@@ -2138,6 +2184,44 @@ class MibScalarInstance(ManagedMibObject):
         cbFun((self.name, self.syntax), **context)
 
 
+class MibCounterInstance(MibScalarInstance):
+    """Managed scalar instance of SNMP engine statistics counter.
+
+    Once bound to engine statistics object, counter value is kept there
+    as a plain integer attribute and only turned into MIB object value
+    when the instance is read. Unbound counter instance behaves like
+    :class:`MibScalarInstance`.
+
+    Counter value wraps around at 2^32 as SMI Counter32 does.
+    """
+    _stats = None
+    _statName = None
+
+    @property
+    def syntax(self):
+        if self._stats is not None:
+            value = getattr(self._stats, self._statName) & 0xffffffff
+
+            if self._syntax != value:
+                self._syntax = self._syntax.clone(value)
+
+        return self._syntax
+
+    @syntax.setter
+    def syntax(self, value):
+        self._syntax = value
+
+        if self._stats is not None:
+            setattr(self._stats, self._statName, int(value))
+
+    def bindStats(self, stats, statName):
+        """Keep counter value in `statName` attribute of `stats` object"""
+        setattr(stats, statName, int(self._syntax))
+
+        self._stats = stats
+        self._statName = statName
+
+
 # Conceptual table classes
 
 class MibTableColumn(MibScalar, ObjectType):
@@ -3277,8 +3361,10 @@ class MibTableRow(ManagedMibObject):
 
     def getIndicesFromInstId(self, instId):
         """Return index values for instance identification"""
-        if instId in self._idToIdxCache:
+        try:
             return self._idToIdxCache[instId]
+        except KeyError:
+            pass
 
         indices = []
         for impliedFlag, modName, symName in self._indexNames:
@@ -3408,6 +3494,7 @@ mibBuilder.exportSymbols(
        "NotificationType": NotificationType,
        "MibScalar": MibScalar,
        "MibScalarInstance": MibScalarInstance,
+       "MibCounterInstance": MibCounterInstance,
        "MibIdentifier": MibIdentifier,
        "MibTree": MibTree,
        "MibTableColumn": MibTableColumn,
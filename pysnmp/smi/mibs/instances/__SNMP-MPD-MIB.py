@@ -13,9 +13,9 @@ if 'mibBuilder' not in globals():
     sys.stderr.write(__doc__)
     sys.exit(1)
 
-MibScalarInstance, = mibBuilder.importSymbols(
+MibCounterInstance, = mibBuilder.importSymbols(
     'SNMPv2-SMI',
-    'MibScalarInstance'
+    'MibCounterInstance'
 )
 
 (snmpUnknownSecurityModels,
@@ -27,15 +27,15 @@ MibScalarInstance, = mibBuilder.importSymbols(
     'snmpUnknownPDUHandlers',
 )
 
-_snmpUnknownSecurityModels = MibScalarInstance(
+_snmpUnknownSecurityModels = MibCounterInstance(
     snmpUnknownSecurityModels.name, (0,),
     snmpUnknownSecurityModels.syntax.clone(0)
 )
-_snmpInvalidMsgs = MibScalarInstance(
+_snmpInvalidMsgs = MibCounterInstance(
     snmpInvalidMsgs.name, (0,),
     snmpInvalidMsgs.syntax.clone(0)
 )
-_snmpUnknownPDUHandlers = MibScalarInstance(
+_snmpUnknownPDUHandlers = MibCounterInstance(
     snmpUnknownPDUHandlers.name, (0,),
     snmpUnknownPDUHandlers.syntax.clone(0)
 )
@@ -13,9 +13,11 @@ if 'mibBuilder' not in globals():
     sys.stderr.write(__doc__)
     sys.exit(1)
 
-MibScalarInstance, = mibBuilder.importSymbols(
+(MibScalarInstance,
+ MibCounterInstance) = mibBuilder.importSymbols(
     'SNMPv2-SMI',
-    'MibScalarInstance'
+    'MibScalarInstance',
+    'MibCounterInstance'
 )
 
 (snmpTargetSpinLock,
@@ -31,11 +33,11 @@ _snmpTargetSpinLock = MibScalarInstance(
     snmpTargetSpinLock.name, (0,),
     snmpTargetSpinLock.syntax.clone(0)
 )
-_snmpUnavailableContexts = MibScalarInstance(
+_snmpUnavailableContexts = MibCounterInstance(
     snmpUnavailableContexts.name, (0,),
     snmpUnavailableContexts.syntax.clone(0)
 )
-_snmpUnknownContexts = MibScalarInstance(
+_snmpUnknownContexts = MibCounterInstance(
     snmpUnknownContexts.name, (0,),
     snmpUnknownContexts.syntax.clone(0)
 )
@@ -13,7 +13,12 @@ if 'mibBuilder' not in globals():
     sys.stderr.write(__doc__)
     sys.exit(1)
 
-MibScalarInstance, = mibBuilder.importSymbols('SNMPv2-SMI', 'MibScalarInstance')
+(MibScalarInstance,
+ MibCounterInstance) = mibBuilder.importSymbols(
+    'SNMPv2-SMI',
+    'MibScalarInstance',
+    'MibCounterInstance'
+)
 
 (usmStatsUnsupportedSecLevels,
  usmStatsNotInTimeWindows,
@@ -32,27 +37,27 @@ MibScalarInstance, = mibBuilder.importSymbols('SNMPv2-SMI', 'MibScalarInstance')
     'usmUserSpinLock'
 )
 
-_usmStatsUnsupportedSecLevels = MibScalarInstance(
+_usmStatsUnsupportedSecLevels = MibCounterInstance(
     usmStatsUnsupportedSecLevels.name, (0,),
     usmStatsUnsupportedSecLevels.syntax.clone(0)
 )
-_usmStatsNotInTimeWindows = MibScalarInstance(
+_usmStatsNotInTimeWindows = MibCounterInstance(
     usmStatsNotInTimeWindows.name, (0,),
     usmStatsNotInTimeWindows.syntax.clone(0)
 )
-_usmStatsUnknownUserNames = MibScalarInstance(
+_usmStatsUnknownUserNames = MibCounterInstance(
     usmStatsUnknownUserNames.name, (0,),
     usmStatsUnknownUserNames.syntax.clone(0)
 )
-_usmStatsUnknownEngineIDs = MibScalarInstance(
+_usmStatsUnknownEngineIDs = MibCounterInstance(
     usmStatsUnknownEngineIDs.name, (0,),
     usmStatsUnknownEngineIDs.syntax.clone(0)
 )
-_usmStatsWrongDigests = MibScalarInstance(
+_usmStatsWrongDigests = MibCounterInstance(
     usmStatsWrongDigests.name, (0,),
     usmStatsWrongDigests.syntax.clone(0)
 )
-_usmStatsDecryptionErrors = MibScalarInstance(
+_usmStatsDecryptionErrors = MibCounterInstance(
     usmStatsDecryptionErrors.name, (0,),
     usmStatsDecryptionErrors.syntax.clone(0)
 )
@@ -18,9 +18,11 @@ if 'mibBuilder' not in globals():
     sys.exit(1)
 
 (MibScalarInstance,
+ MibCounterInstance,
  TimeTicks) = mibBuilder.importSymbols(
     'SNMPv2-SMI',
     'MibScalarInstance',
+    'MibCounterInstance',
     'TimeTicks'
 )
 
@@ -150,103 +152,103 @@ _sysORLastChange = MibScalarInstance(
     sysORLastChange.name, (0,),
     sysORLastChange.syntax.clone(0)
 )
-_snmpInPkts = MibScalarInstance(
+_snmpInPkts = MibCounterInstance(
     snmpInPkts.name, (0,),
     snmpInPkts.syntax.clone(0)
 )
-_snmpOutPkts = MibScalarInstance(
+_snmpOutPkts = MibCounterInstance(
     snmpOutPkts.name, (0,),
     snmpOutPkts.syntax.clone(0)
 )
-_snmpInBadVersions = MibScalarInstance(
+_snmpInBadVersions = MibCounterInstance(
     snmpInBadVersions.name, (0,),
     snmpInBadVersions.syntax.clone(0)
 )
-_snmpInBadCommunityNames = MibScalarInstance(
+_snmpInBadCommunityNames = MibCounterInstance(
     snmpInBadCommunityNames.name, (0,),
     snmpInBadCommunityNames.syntax.clone(0)
 )
-_snmpInBadCommunityUses = MibScalarInstance(
+_snmpInBadCommunityUses = MibCounterInstance(
     snmpInBadCommunityUses.name, (0,),
     snmpInBadCommunityUses.syntax.clone(0)
 )
-_snmpInASNParseErrs = MibScalarInstance(
+_snmpInASNParseErrs = MibCounterInstance(
     snmpInASNParseErrs.name, (0,),
     snmpInASNParseErrs.syntax.clone(0)
 )
-_snmpInTooBigs = MibScalarInstance(
+_snmpInTooBigs = MibCounterInstance(
     snmpInTooBigs.name, (0,),
     snmpInTooBigs.syntax.clone(0)
 )
-_snmpInNoSuchNames = MibScalarInstance(
+_snmpInNoSuchNames = MibCounterInstance(
     snmpInNoSuchNames.name, (0,),
     snmpInNoSuchNames.syntax.clone(0)
 )
-_snmpInBadValues = MibScalarInstance(
+_snmpInBadValues = MibCounterInstance(
     snmpInBadValues.name, (0,),
     snmpInBadValues.syntax.clone(0)
 )
-_snmpInReadOnlys = MibScalarInstance(
+_snmpInReadOnlys = MibCounterInstance(
     snmpInReadOnlys.name, (0,),
     snmpInReadOnlys.syntax.clone(0)
 )
-_snmpInGenErrs = MibScalarInstance(
+_snmpInGenErrs = MibCounterInstance(
     snmpInGenErrs.name, (0,),
     snmpInGenErrs.syntax.clone(0)
 )
-_snmpInTotalReqVars = MibScalarInstance(
+_snmpInTotalReqVars = MibCounterInstance(
     snmpInTotalReqVars.name, (0,),
     snmpInTotalReqVars.syntax.clone(0)
 )
-_snmpInTotalSetVars = MibScalarInstance(
+_snmpInTotalSetVars = MibCounterInstance(
     snmpInTotalSetVars.name, (0,),
     snmpInTotalSetVars.syntax.clone(0)
 )
-_snmpInGetRequests = MibScalarInstance(
+_snmpInGetRequests = MibCounterInstance(
     snmpInGetRequests.name, (0,),
     snmpInGetRequests.syntax.clone(0)
 )
-_snmpInGetNexts = MibScalarInstance(
+_snmpInGetNexts = MibCounterInstance(
     snmpInGetNexts.name, (0,),
     snmpInGetNexts.syntax.clone(0)
 )
-_snmpInSetRequests = MibScalarInstance(
+_snmpInSetRequests = MibCounterInstance(
     snmpInSetRequests.name, (0,),
     snmpInSetRequests.syntax.clone(0)
 )
-_snmpInGetResponses = MibScalarInstance(
+_snmpInGetResponses = MibCounterInstance(
     snmpInGetResponses.name, (0,),
     snmpInGetResponses.syntax.clone(0)
 )
-_snmpInTraps = MibScalarInstance(
+_snmpInTraps = MibCounterInstance(
     snmpInTraps.name, (0,),
     snmpInTraps.syntax.clone(0)
 )
-_snmpOutTooBigs = MibScalarInstance(
+_snmpOutTooBigs = MibCounterInstance(
     snmpOutTooBigs.name, (0,),
     snmpOutTooBigs.syntax.clone(0)
 )
-_snmpOutNoSuchNames = MibScalarInstance(
+_snmpOutNoSuchNames = MibCounterInstance(
     snmpOutNoSuchNames.name, (0,),
     snmpOutNoSuchNames.syntax.clone(0)
 )
-_snmpOutBadValues = MibScalarInstance(
+_snmpOutBadValues = MibCounterInstance(
     snmpOutBadValues.name, (0,),
     snmpOutBadValues.syntax.clone(0)
 )
-_snmpOutGenErrs = MibScalarInstance(
+_snmpOutGenErrs = MibCounterInstance(
     snmpOutGenErrs.name, (0,),
     snmpOutGenErrs.syntax.clone(0)
 )
-_snmpOutSetRequests = MibScalarInstance(
+_snmpOutSetRequests = MibCounterInstance(
     snmpOutSetRequests.name, (0,),
     snmpOutSetRequests.syntax.clone(0)
 )
-_snmpOutGetResponses = MibScalarInstance(
+_snmpOutGetResponses = MibCounterInstance(
     snmpOutGetResponses.name, (0,),
     snmpOutGetResponses.syntax.clone(0)
 )
-_snmpOutTraps = MibScalarInstance(
+_snmpOutTraps = MibCounterInstance(
     snmpOutTraps.name, (0,),
     snmpOutTraps.syntax.clone(0)
 )
@@ -254,11 +256,11 @@ _snmpEnableAuthenTraps = MibScalarInstance(
     snmpEnableAuthenTraps.name, (0,),
     snmpEnableAuthenTraps.syntax.clone(1)
 )
-_snmpSilentDrops = MibScalarInstance(
+_snmpSilentDrops = MibCounterInstance(
     snmpSilentDrops.name, (0,),
     snmpSilentDrops.syntax.clone(0)
 )
-_snmpProxyDrops = MibScalarInstance(
+_snmpProxyDrops = MibCounterInstance(
     snmpProxyDrops.name, (0,),
     snmpProxyDrops.syntax.clone(0)
 )
@@ -4,6 +4,8 @@ set -e
 
 PYTHON=${1:-python}
 
+$PYTHON tests/msgdec-differential.py
+
 for x in examples/hlapi/v3arch/asyncore/sync/manager/cmdgen/*.py \
          examples/hlapi/v3arch/asyncore/sync/agent/ntforg/*.py \
          examples/hlapi/v3arch/asyncore/manager/cmdgen/*.py \
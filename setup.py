@@ -147,6 +147,7 @@ params.update({
                  'pysnmp.carrier.twisted.dgram',
                  'pysnmp.carrier.asyncio',
                  'pysnmp.carrier.asyncio.dgram',
+                 'pysnmp.carrier.asyncio.stream',
                  'pysnmp.entity',
                  'pysnmp.entity.rfc3413',
                  'pysnmp.hlapi',
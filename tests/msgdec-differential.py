@@ -0,0 +1,235 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2019, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Randomised differential check of the fast path SNMPv1/v2c message
+# decoder against pyasn1 BER decoder.
+#
+# Random v1/v2c messages of every PDU and value type are decoded by
+# both decoders which must produce identical objects. Each message is
+# then damaged (octet changed, message truncated or octet inserted)
+# and both decoders must again agree on the result or on the type of
+# exception raised.
+#
+# Usage: msgdec-differential.py [seed [messages]]
+#
+import random
+import sys
+
+from pyasn1.codec.ber import decoder
+from pyasn1.codec.ber import encoder
+from pyasn1.compat.octets import ints2octs
+from pyasn1.type import univ
+
+from pysnmp.proto.api import msgdec
+from pysnmp.proto.api import v1
+from pysnmp.proto.api import v2c
+
+MUTATIONS = 5
+
+
+class Mismatch(Exception):
+    pass
+
+
+def randomOctets(rnd, maxSize):
+    return ints2octs([rnd.randrange(256)
+                      for _ in range(rnd.randint(0, maxSize))])
+
+
+def randomOid(rnd):
+    return (1, 3, 6) + tuple(
+        [rnd.choice((rnd.randint(0, 127), rnd.randint(0, 0xffffffff)))
+         for _ in range(rnd.randint(1, 15))])
+
+
+def randomValue(rnd, pMod):
+    factories = [
+        lambda: pMod.Integer(rnd.randint(-0x80000000, 0x7fffffff)),
+        lambda: pMod.OctetString(randomOctets(rnd, 300)),
+        lambda: pMod.ObjectIdentifier(
+            (1, 3) + tuple([rnd.randint(0, 0xffffffff)
+                            for _ in range(rnd.randint(0, 20))])),
+        lambda: pMod.Null(''),
+        lambda: pMod.IpAddress(
+            '.'.join([str(rnd.randrange(256)) for _ in range(4)])),
+        lambda: pMod.TimeTicks(rnd.randint(0, 0xffffffff)),
+        lambda: pMod.Opaque(randomOctets(rnd, 20))
+    ]
+
+    if pMod is v1:
+        factories.extend([
+            lambda: v1.Counter(rnd.randint(0, 0xffffffff)),
+            lambda: v1.Gauge(rnd.randint(0, 0xffffffff))
+        ])
+
+    else:
+        factories.extend([
+            lambda: v2c.Counter32(rnd.randint(0, 0xffffffff)),
+            lambda: v2c.Gauge32(rnd.randint(0, 0xffffffff)),
+            lambda: v2c.Counter64(rnd.randint(0, 0xffffffffffffffff)),
+            lambda: v2c.NoSuchObject(''),
+            lambda: v2c.NoSuchInstance(''),
+            lambda: v2c.EndOfMibView('')
+        ])
+
+    return rnd.choice(factories)()
+
+
+def randomMessage(rnd):
+    pMod = rnd.choice((v1, v2c))
+
+    if pMod is v1:
+        pduType = rnd.choice(
+            (v1.GetRequestPDU, v1.GetNextRequestPDU, v1.GetResponsePDU,
+             v1.SetRequestPDU, v1.TrapPDU))
+
+    else:
+        pduType = rnd.choice(
+            (v2c.GetRequestPDU, v2c.GetNextRequestPDU, v2c.ResponsePDU,
+             v2c.SetRequestPDU, v2c.GetBulkRequestPDU,
+             v2c.InformRequestPDU, v2c.SNMPv2TrapPDU, v2c.ReportPDU))
+
+    pdu = pduType()
+
+    if pduType is v1.TrapPDU:
+        pduApi = v1.apiTrapPDU
+        pduApi.setDefaults(pdu)
+        pduApi.setEnterprise(pdu, randomOid(rnd))
+        pduApi.setGenericTrap(pdu, rnd.randint(0, 6))
+        pduApi.setSpecificTrap(pdu, rnd.randint(0, 1000))
+        pduApi.setTimeStamp(pdu, rnd.randint(0, 0xffffffff))
+
+    elif pduType is v2c.GetBulkRequestPDU:
+        pduApi = v2c.apiBulkPDU
+        pduApi.setDefaults(pdu)
+        pduApi.setRequestID(pdu, rnd.randint(-0x80000000, 0x7fffffff))
+        pduApi.setNonRepeaters(pdu, rnd.randint(0, 10))
+        pduApi.setMaxRepetitions(pdu, rnd.randint(0, 100))
+
+    else:
+        pduApi = pMod.apiPDU
+        pduApi.setDefaults(pdu)
+        pduApi.setRequestID(pdu, rnd.randint(-0x80000000, 0x7fffffff))
+        pduApi.setErrorStatus(pdu, rnd.randint(0, 5))
+        pduApi.setErrorIndex(pdu, rnd.randint(0, 10))
+
+    pduApi.setVarBinds(
+        pdu, [(randomOid(rnd), randomValue(rnd, pMod))
+              for _ in range(rnd.randint(0, 30))])
+
+    msg = pMod.Message()
+    pMod.apiMessage.setDefaults(msg)
+    pMod.apiMessage.setCommunity(msg, randomOctets(rnd, 40))
+    pMod.apiMessage.setPDU(msg, pdu)
+
+    return pMod, encoder.encode(msg)
+
+
+def mutate(rnd, wholeMsg):
+    octets = bytearray(wholeMsg)
+    pos = rnd.randrange(len(octets))
+    how = rnd.choice(('change', 'truncate', 'insert'))
+
+    if how == 'change':
+        octets[pos] = rnd.randrange(256)
+
+    elif how == 'truncate':
+        del octets[pos:]
+
+    else:
+        octets.insert(pos, rnd.randrange(256))
+
+    return bytes(octets)
+
+
+def compare(obj1, obj2, path='Message'):
+    if type(obj1) is not type(obj2):
+        raise Mismatch('%s: type %s vs %s' % (path, type(obj1), type(obj2)))
+
+    if obj1.tagSet != obj2.tagSet:
+        raise Mismatch('%s: tagSet %r vs %r' % (path, obj1.tagSet, obj2.tagSet))
+
+    if obj1.isValue != obj2.isValue:
+        raise Mismatch('%s: isValue %s vs %s' % (path, obj1.isValue, obj2.isValue))
+
+    if isinstance(obj1, univ.Choice):
+        if obj1.getName() != obj2.getName():
+            raise Mismatch('%s: choice %s vs %s' % (
+                path, obj1.getName(), obj2.getName()))
+
+        compare(obj1.getComponent(), obj2.getComponent(),
+                '%s.%s' % (path, obj1.getName()))
+
+    elif isinstance(obj1, (univ.Sequence, univ.SequenceOf)):
+        if len(obj1) != len(obj2):
+            raise Mismatch('%s: length %d vs %d' % (path, len(obj1), len(obj2)))
+
+        for idx in range(len(obj1)):
+            compare(obj1[idx], obj2[idx], '%s[%d]' % (path, idx))
+
+    elif obj1 != obj2 or obj1.subtypeSpec != obj2.subtypeSpec:
+        raise Mismatch('%s: value %r vs %r' % (path, obj1, obj2))
+
+
+def decodeBoth(wholeMsg, pMod):
+    results = []
+
+    for decodeFun in (msgdec.decodeMessage, decoder.decode):
+        try:
+            results.append(
+                (None, decodeFun(wholeMsg, asn1Spec=pMod.Message())))
+
+        except Exception:
+            results.append((sys.exc_info()[0], None))
+
+    (exc1, decoded1), (exc2, decoded2) = results
+
+    if exc1 is not exc2:
+        raise Mismatch('exception %s vs %s' % (exc1, exc2))
+
+    if exc1 is None:
+        compare(decoded1[0], decoded2[0])
+
+        if decoded1[1] != decoded2[1]:
+            raise Mismatch('remainder %r vs %r' % (decoded1[1], decoded2[1]))
+
+    return decoded1
+
+
+def main(seed=1, count=300):
+    rnd = random.Random(seed)
+
+    for idx in range(count):
+        pMod, wholeMsg = randomMessage(rnd)
+
+        damagedMsg = None
+
+        try:
+            msg, rest = decodeBoth(wholeMsg, pMod)
+
+            if rest or encoder.encode(msg) != wholeMsg:
+                raise Mismatch('message does not re-encode')
+
+            decodeBoth(wholeMsg + ints2octs((1, 2, 3)), pMod)
+
+            for _ in range(MUTATIONS):
+                damagedMsg = mutate(rnd, wholeMsg)
+                decodeBoth(damagedMsg, pMod)
+
+        except Mismatch:
+            sys.stderr.write(
+                'seed %s, message #%d: %s\nmessage: %r\ndamaged: %r\n' % (
+                    seed, idx, sys.exc_info()[1], wholeMsg, damagedMsg))
+            return 1
+
+    print('%d messages, %d damaged variants: fast and pyasn1 '
+          'decoders agree' % (count, count * MUTATIONS))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(x) for x in sys.argv[1:3]]))